@@ -2,25 +2,35 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from flask_login import login_required, current_user
 from datetime import datetime, timedelta
 from database import get_supabase_client
+import logging
 import os
 import sys
 from functools import wraps
 
+logger = logging.getLogger(__name__)
+
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+def is_admin(user):
+    """Whether a (logged in) user has admin privileges"""
+    if not getattr(user, 'is_authenticated', False):
+        return False
+    # Check if user is admin (you can customize this logic)
+    if getattr(user, 'is_admin', False):
+        return True
+    # For now, check if user email is in admin list
+    admin_emails = os.environ.get('ADMIN_EMAILS', '').split(',')
+    admin_emails = [email.strip() for email in admin_emails]  # Remove whitespace
+    return getattr(user, 'email', None) in admin_emails
+
 # Admin authorization decorator
 def admin_required(f):
     @wraps(f)
     @login_required
     def decorated_function(*args, **kwargs):
-        # Check if user is admin (you can customize this logic)
-        if not hasattr(current_user, 'is_admin') or not current_user.is_admin:
-            # For now, check if user email is in admin list
-            admin_emails = os.environ.get('ADMIN_EMAILS', '').split(',')
-            admin_emails = [email.strip() for email in admin_emails]  # Remove whitespace
-            if current_user.email not in admin_emails:
-                flash('Access denied. Admin privileges required.', 'error')
-                return redirect(url_for('main.dashboard'))
+        if not is_admin(current_user):
+            flash('Access denied. Admin privileges required.', 'error')
+            return redirect(url_for('main.dashboard'))
         return f(*args, **kwargs)
     return decorated_function
 
@@ -85,7 +95,7 @@ def dashboard():
         return render_template('admin/dashboard.html', stats=stats)
         
     except Exception as e:
-        print(f"Admin dashboard error: {e}")
+        logger.error("Admin dashboard error: %s", e)
         flash('Error loading admin dashboard', 'error')
         return redirect(url_for('main.dashboard'))
 
@@ -111,7 +121,7 @@ def users():
         return render_template('admin/users.html', users=users_data)
         
     except Exception as e:
-        print(f"Admin users error: {e}")
+        logger.error("Admin users error: %s", e)
         flash('Error loading users', 'error')
         return redirect(url_for('admin.dashboard'))
 
@@ -176,7 +186,7 @@ def analytics():
         return render_template('admin/analytics.html', analytics=analytics_data)
         
     except Exception as e:
-        print(f"Admin analytics error: {e}")
+        logger.error("Admin analytics error: %s", e)
         flash('Error loading analytics', 'error')
         return redirect(url_for('admin.dashboard'))
 
@@ -193,13 +203,14 @@ def reset_password(user_id):
         
         # Use Supabase Admin API to reset password
         from supabase import create_client
+        from instrumentation import instrument_supabase
         supabase_url = os.environ.get('SUPABASE_URL')
         service_key = os.environ.get('SUPABASE_SERVICE_ROLE_KEY')
         
         if not supabase_url or not service_key:
             return jsonify({'error': 'Admin credentials not configured'}), 500
             
-        admin_supabase = create_client(supabase_url, service_key)
+        admin_supabase = instrument_supabase(create_client(supabase_url, service_key))
         
         # Update user password using admin privileges
         response = admin_supabase.auth.admin.update_user_by_id(
@@ -213,7 +224,7 @@ def reset_password(user_id):
             return jsonify({'error': 'Failed to reset password'}), 500
             
     except Exception as e:
-        print(f"Password reset error: {e}")
+        logger.error("Password reset error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @admin_bp.route('/system_info')
@@ -235,13 +246,29 @@ def system_info():
             'replit_domain': os.environ.get('REPLIT_DOMAINS', 'Not set')
         }
         
-        return render_template('admin/system.html', system_info=system_info)
+        from profiling import profiler
+        return render_template('admin/system.html', system_info=system_info,
+                               profiles=profiler.store.list())
         
     except Exception as e:
-        print(f"System info error: {e}")
+        logger.error("System info error: %s", e)
         flash('Error loading system information', 'error')
         return redirect(url_for('admin.dashboard'))
 
+@admin_bp.route('/profiles/<profile_id>.<fmt>')
+@admin_required
+def download_profile(profile_id, fmt):
+    """Download a stored request profile (folded stacks, .prof or text summary)"""
+    from flask import abort, send_file
+    from profiling import profiler
+
+    path = profiler.store.path(profile_id, fmt)
+    if path is None:
+        abort(404)
+    mimetype = 'application/octet-stream' if fmt == 'prof' else 'text/plain'
+    return send_file(path, mimetype=mimetype, as_attachment=True,
+                     download_name=os.path.basename(path))
+
 @admin_bp.route('/export_data/<data_type>')
 @admin_required 
 def export_data(data_type):
@@ -268,5 +295,5 @@ def export_data(data_type):
         })
         
     except Exception as e:
-        print(f"Export data error: {e}")
+        logger.error("Export data error: %s", e)
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
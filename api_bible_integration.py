@@ -3,11 +3,12 @@ API.Bible Integration for NIV 2011 and Additional Translations
 This provides access to properly licensed Bible translations including NIV 2011
 """
 
-import requests
 import os
 from typing import Dict, List, Optional
 import logging
 
+from upstream import ProviderSession
+
 logger = logging.getLogger(__name__)
 
 class ApiBibleClient:
@@ -36,7 +37,7 @@ class ApiBibleClient:
         if not self.api_key:
             logger.warning("No API.Bible API key provided. Some translations may not be available.")
         
-        self.session = requests.Session()
+        self.session = ProviderSession('api.bible')
         if self.api_key:
             self.session.headers.update({
                 'api-key': self.api_key,
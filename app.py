@@ -1,75 +1,136 @@
 import os
 import logging
+import time
 from flask import Flask
 from flask_jwt_extended import JWTManager
 from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_login import LoginManager
-from supabase import create_client, Client
 
-# Configure logging - set app-level DEBUG but silence verbose HTTP libraries
-logging.basicConfig(level=logging.INFO)
+# Leveled logging configured from LOG_LEVEL / LOG_LEVELS / LOG_FORMAT (see
+# logging_config.py); verbose HTTP libraries are silenced there
+from logging_config import configure_logging
+configure_logging()
 
-# Set app logger to DEBUG for your application logs
 app_logger = logging.getLogger(__name__)
-app_logger.setLevel(logging.DEBUG)
 
-# Silence verbose HTTP libraries
-logging.getLogger('httpx').setLevel(logging.WARNING)
-logging.getLogger('httpcore').setLevel(logging.WARNING)
-logging.getLogger('hpack').setLevel(logging.WARNING)
+# Startup check modes (STARTUP_CHECKS environment variable):
+#   skip       - never probe Supabase on startup
+#   concurrent - every app instance probes all tables in parallel while booting
+#   preload    - probes run once, before workers are forked, from the gunicorn
+#                on_starting hook in gunicorn.conf.py (or from main.py when
+#                running the development server); workers boot without I/O
+STARTUP_MODES = ('skip', 'concurrent', 'preload')
+DEFAULT_STARTUP_MODE = 'preload'
 
-# Create the app
-app = Flask(__name__)
-app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key-change-in-production")
-app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
-
-# Configure JWT
-app.config['JWT_SECRET_KEY'] = os.environ.get('SUPABASE_JWT_SECRET')
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = False
-jwt = JWTManager(app)
-
-# Initialize Supabase client
-supabase_url = os.environ.get('SUPABASE_URL')
-supabase_key = os.environ.get('SUPABASE_KEY')
-supabase: Client = create_client(supabase_url, supabase_key)
-
-# Initialize Flask-Login for session management
+jwt = JWTManager()
 login_manager = LoginManager()
-login_manager.init_app(app)
 login_manager.login_view = 'auth.login'
 login_manager.login_message = 'Please log in to access this page.'
 
+
 @login_manager.user_loader
 def load_user(user_id):
     from models import User
     return User.get_by_id(user_id)
 
-# Import and register blueprints
-from auth import auth_bp
-from auth_api import auth_api_bp
-from routes import main_bp
-from admin import admin_bp
-
-app.register_blueprint(auth_bp)
-app.register_blueprint(auth_api_bp)
-app.register_blueprint(main_bp)
-app.register_blueprint(admin_bp)
-
-# Initialize database tables and verify connection
-from database import initialize_database, verify_all_tables
-initialize_database()
-
-# Check table status on startup
-existing_tables, missing_tables = verify_all_tables()
-if missing_tables:
-    print(f"\n⚠️  Missing tables: {', '.join(missing_tables)}")
-    print("Please create them using the SQL scripts in SUPABASE_SETUP.md")
-else:
-    print("\n✅ All required tables exist in Supabase")
-    
-    # Initialize sample psalm data if tables exist but are empty
-    from psalm_data import initialize_psalms
-    from models import Psalm
-    if Psalm.get_count() == 0:
-        print("🎵 Initializing sample Psalm data...")
-        initialize_psalms()
+
+def get_startup_mode():
+    """Get the configured startup check mode"""
+    mode = os.environ.get('STARTUP_CHECKS', DEFAULT_STARTUP_MODE).strip().lower()
+    if mode not in STARTUP_MODES:
+        app_logger.warning(f"Unknown STARTUP_CHECKS value '{mode}', using '{DEFAULT_STARTUP_MODE}'")
+        return DEFAULT_STARTUP_MODE
+    return mode
+
+
+def run_startup_checks():
+    """Verify Supabase tables (all probes in parallel) and seed psalms if empty"""
+    from database import initialize_database, verify_all_tables
+
+    started = time.perf_counter()
+    initialize_database()
+
+    # Check table status on startup
+    existing_tables, missing_tables = verify_all_tables(concurrent=True)
+    if missing_tables:
+        print(f"\n⚠️  Missing tables: {', '.join(missing_tables)}")
+        print("Please create them using the SQL scripts in SUPABASE_SETUP.md")
+    else:
+        print("\n✅ All required tables exist in Supabase")
+
+        # Initialize sample psalm data if tables exist but are empty
+        from psalm_data import initialize_psalms
+        from models import Psalm
+        if Psalm.get_count() == 0:
+            print("🎵 Initializing sample Psalm data...")
+            initialize_psalms()
+
+    app_logger.info(f"Startup checks finished in {(time.perf_counter() - started) * 1000:.0f}ms")
+    return existing_tables, missing_tables
+
+
+def create_app(startup_mode=None):
+    """
+    Application factory
+    Builds and configures the Flask app. Network checks only run here when the
+    startup mode is 'concurrent'; see STARTUP_MODES.
+    """
+    startup_mode = startup_mode or get_startup_mode()
+
+    # Create the app
+    app = Flask(__name__)
+    app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key-change-in-production")
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
+
+    # Serialize jsonify() responses with orjson (falls back to the stdlib encoder)
+    from json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+
+    # Configure JWT
+    app.config['JWT_SECRET_KEY'] = os.environ.get('SUPABASE_JWT_SECRET')
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = False
+    jwt.init_app(app)
+
+    # Per-request Supabase/upstream accounting; registered first so its
+    # after_request handler runs last and the timing covers the others
+    from instrumentation import instrumentation
+    instrumentation.init_app(app)
+
+    # Prometheus /metrics (request latency, providers, caches, autosaves)
+    from metrics import prometheus
+    prometheus.init_app(app)
+
+    # Initialize Flask-Login for session management
+    login_manager.init_app(app)
+
+    # Admin-only request profiling (X-Profile header or ?_profile=1)
+    from profiling import profiler
+    profiler.init_app(app)
+
+    # Import and register blueprints
+    from auth import auth_bp
+    from auth_api import auth_api_bp
+    from routes import main_bp
+    from admin import admin_bp
+
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(auth_api_bp)
+    app.register_blueprint(main_bp)
+    app.register_blueprint(admin_bp)
+
+    # Negotiated gzip/brotli compression for HTML and JSON responses
+    from compression import compress
+    compress.init_app(app)
+
+    # Fingerprinted static assets (built by build_assets.py) with immutable caching
+    from assets import assets
+    assets.init_app(app)
+
+    app.config['STARTUP_CHECKS'] = startup_mode
+    if startup_mode == 'concurrent':
+        run_startup_checks()
+
+    return app
+
+
+app = create_app()
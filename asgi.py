@@ -0,0 +1,11 @@
+"""
+ASGI entry point: the read-only scripture API is served async (see
+scripture_asgi.py) and every other request by the Flask app
+    pip install ".[asgi]"
+    gunicorn -k uvicorn.workers.UvicornWorker -c gunicorn.conf.py asgi:app
+"""
+
+from app import app as flask_app
+from scripture_asgi import ScriptureASGI, WSGIBridge
+
+app = ScriptureASGI(fallback=WSGIBridge(flask_app), config=flask_app.config)
@@ -0,0 +1,94 @@
+"""
+Static asset manifest for Pray150
+Resolves logical asset names (bundles and source files under static/) to the
+fingerprinted files produced by build_assets.py, and serves those files with
+far-future immutable caching. When no manifest has been built (local
+development) the original source files are served instead.
+"""
+
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Output directory (relative to static/) and manifest written by build_assets.py
+DIST_DIR = 'dist'
+MANIFEST_FILENAME = 'manifest.json'
+
+# One year - fingerprinted files never change under the same name
+IMMUTABLE_MAX_AGE = 31536000
+
+# Logical bundle name -> source files (relative to static/), in load order
+BUNDLES = {
+    'js/app.js': ['js/main.js'],
+    'js/psalm.js': ['js/custom-editor.js', 'js/script.js', 'js/psalm-page.js'],
+    'js/listen.js': ['js/listen-page.js'],
+    'css/app.css': ['css/style.css'],
+}
+
+
+class AssetManifest:
+    """Maps logical asset names to fingerprinted paths under static/dist"""
+
+    def __init__(self, app=None):
+        self.manifest = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.load(os.path.join(app.static_folder, DIST_DIR, MANIFEST_FILENAME))
+        app.jinja_env.globals.update(asset_url=self.asset_url, asset_urls=self.asset_urls)
+        app.after_request(self.add_cache_headers)
+
+    def load(self, path):
+        """Load the manifest written by the build step, if present"""
+        try:
+            with open(path) as f:
+                self.manifest = json.load(f)
+            logger.info(f"Loaded asset manifest with {len(self.manifest)} entries")
+        except FileNotFoundError:
+            self.manifest = {}
+            logger.info("No asset manifest found - serving unbundled source assets")
+
+    def resolve(self, filename):
+        """Get the static/-relative path to serve for a logical asset name"""
+        return self.manifest.get(filename, filename)
+
+    def asset_url(self, endpoint='static', filename=None, **values):
+        """
+        url_for-compatible helper: asset_url('static', filename='js/main.js')
+        or simply asset_url('js/main.js')
+        """
+        from flask import url_for
+
+        if filename is None:
+            endpoint, filename = 'static', endpoint
+        return url_for(endpoint, filename=self.resolve(filename), **values)
+
+    def asset_urls(self, name):
+        """
+        URLs to include for a bundle - the single built bundle, or its source
+        files in order when the manifest has not been built
+        """
+        from flask import url_for
+
+        if name in self.manifest or name not in BUNDLES:
+            return [url_for('static', filename=self.resolve(name))]
+        return [url_for('static', filename=source) for source in BUNDLES[name]]
+
+    def add_cache_headers(self, response):
+        from flask import request
+
+        if request.endpoint == 'static' and response.status_code == 200:
+            filename = (request.view_args or {}).get('filename', '')
+            if filename.startswith(DIST_DIR + '/'):
+                response.cache_control.no_cache = None
+                response.cache_control.public = True
+                response.cache_control.max_age = IMMUTABLE_MAX_AGE
+                response.cache_control.immutable = True
+        return response
+
+
+# Global manifest instance, initialised in app.py
+assets = AssetManifest()
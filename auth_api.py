@@ -308,6 +308,9 @@ def save_journal_entry():
         
         if result.data:
             entry_id = result.data[0]['id']
+            if prompt_responses.get('emotion'):
+                from emotion_analytics import emotion_analytics
+                emotion_analytics.record_entry(current_user_id, result.data[0].get('created_at') or journal_entry['created_at'])
             return jsonify({
                 "message": "Journal entry saved",
                 "entry_id": str(entry_id)
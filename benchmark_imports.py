@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for Pray150
+Profiles `python -X importtime` for the web app and the maintenance scripts,
+reports cumulative import time per module, and fails when a target exceeds
+its budget or pulls in a dependency that should only load on first use.
+
+Usage:
+    python benchmark_imports.py [--runs 3] [--top 15] [--no-budget]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Target module -> cumulative import budget in milliseconds
+BUDGETS_MS = {
+    'app': 300,
+    'routes': 250,
+    'models': 200,
+    'database': 25,
+    'check_tables': 25,
+    'verify_supabase': 200,
+    'seed_psalms': 200,
+    'set_admin': 10,
+}
+
+# Heavy dependencies that must be loaded lazily (on first client/request)
+LAZY_MODULES = ('supabase', 'requests', 'httpx', 'bolls_bible_api')
+
+
+def profile_import(module):
+    """Import module in a fresh interpreter; return {module: cumulative microseconds}"""
+    env = dict(os.environ, STARTUP_CHECKS='skip')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def main():
+    runs = 3
+    top = 15
+    if '--runs' in sys.argv:
+        runs = int(sys.argv[sys.argv.index('--runs') + 1])
+    if '--top' in sys.argv:
+        top = int(sys.argv[sys.argv.index('--top') + 1])
+    check_budget = '--no-budget' not in sys.argv
+
+    failures = []
+
+    print("Import-time benchmark (median of fresh interpreters)")
+    print("=" * 60)
+    print(f"{'Target':20} {'Import time':>12} {'Budget':>10}")
+    print("-" * 60)
+
+    profiles = {}
+    for target, budget in BUDGETS_MS.items():
+        samples = [profile_import(target) for _ in range(runs)]
+        profiles[target] = samples[-1]
+        elapsed = statistics.median(sample[target] for sample in samples) / 1000
+        status = '✓' if elapsed <= budget else '❌'
+        print(f"{target:20} {elapsed:>10.1f}ms {budget:>8}ms {status}")
+        if elapsed > budget:
+            failures.append(f"{target} imports in {elapsed:.1f}ms (budget {budget}ms)")
+
+        eager = [name for name in LAZY_MODULES if name in samples[-1]]
+        if eager:
+            failures.append(f"{target} eagerly imports {', '.join(eager)}")
+
+    print("=" * 60)
+    print(f"\nHeaviest modules imported by app (cumulative):")
+    heaviest = sorted(profiles['app'].items(), key=lambda item: item[1], reverse=True)
+    for name, cumulative in heaviest[1:top + 1]:
+        print(f"   {cumulative / 1000:>8.1f}ms  {name}")
+
+    if failures:
+        print("\n❌ Import regressions:")
+        for failure in failures:
+            print(f"   - {failure}")
+        if check_budget:
+            sys.exit(1)
+    else:
+        print("\n✓ All targets within budget with heavy dependencies loaded lazily")
+
+
+if __name__ == '__main__':
+    main()
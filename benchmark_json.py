@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+JSON serialization benchmark for Pray150
+Compares Flask's stdlib-backed provider with FastJSONProvider on payloads
+shaped like the app's real responses:
+
+  - Psalm 119 (176 verses) in every available translation
+  - A 10,000-row admin journal export
+  - The /api/psalms-with-music playlist
+  - A psalm's markup list
+
+Usage:
+    python benchmark_json.py [--seconds 1.0]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from bible_api import BibleAPI
+from json_provider import FastJSONProvider, orjson
+from psalm_music_config import MUSIC_CATALOG
+
+VERSE_TEXT = ("Blessed are those whose ways are blameless, who walk according "
+              "to the law of the LORD. Blessed are those who keep his statutes")
+
+
+def psalm_119_all_translations():
+    """get_psalm_multiple_translations(119, <all translations>) payload"""
+    data = {}
+    for code, name in BibleAPI.AVAILABLE_TRANSLATIONS.items():
+        data[code] = {
+            'psalm_number': 119,
+            'translation': code,
+            'translation_name': name,
+            'verse_count': 176,
+            'verses': [
+                {'verse_number': v, 'text': f"{VERSE_TEXT} ({code} {v})", 'verse_id': 19119000 + v}
+                for v in range(1, 177)
+            ],
+            'superscript': None
+        }
+    return {'success': True, 'data': data, 'psalm_number': 119, 'translations_count': len(data)}
+
+
+def admin_journal_export(rows=10000):
+    """admin.export_data('journals') payload"""
+    start = datetime(2025, 1, 1)
+    entries = []
+    for i in range(rows):
+        entries.append({
+            'id': i + 1,
+            'user_id': f"3ed2fad9-9ad1-4c7c-ba42-{i % 500:012d}",
+            'psalm_id': (i % 150) + 1,
+            'prompt_responses': {
+                '1': 'I am learning to delight in the law of the Lord each morning.',
+                '2': 'Like a tree planted by streams of water, I want to stay rooted.',
+                '3': 'Meditating on scripture during my commute.',
+                '4': 'Lord, show me where I have walked with the wicked.',
+                'emotion': ['terrible', 'bad', 'okay', 'good', 'great'][i % 5],
+                'completed': True
+            },
+            'created_at': (start + timedelta(minutes=17 * i)).isoformat() + '+00:00'
+        })
+    return {'success': True, 'data_type': 'journals', 'count': len(entries), 'data': entries}
+
+
+def playlist():
+    """/api/psalms-with-music payload"""
+    entries = [dict(entry) for entry in MUSIC_CATALOG.playlist]
+    return {'success': True, 'psalms': entries, 'total': len(entries)}
+
+
+def markup_list():
+    """/get_markups/<psalm_id> payload"""
+    markups = []
+    for i in range(200):
+        markups.append({
+            'id': i + 1,
+            'user_id': '3ed2fad9-9ad1-4c7c-ba42-d137afdd6283',
+            'psalm_id': 119,
+            'markup-data': {
+                'markup_type': 'highlight' if i % 2 else 'note',
+                'text': VERSE_TEXT[:60],
+                'translation': 'NIV',
+                'color': 'yellow',
+                'note_text': 'Your word is a lamp to my feet'
+            },
+            'created_at': datetime(2025, 8, 1, 12, 0) + timedelta(hours=i)
+        })
+    return {'markups': markups, 'translation': 'NIV'}
+
+
+PAYLOADS = [
+    ('Psalm 119, all translations', psalm_119_all_translations),
+    ('Admin export, 10k journal rows', admin_journal_export),
+    ('Music playlist', playlist),
+    ('Markup list (200)', markup_list),
+]
+
+
+def measure(app, provider, payload, seconds):
+    """Return (responses per second, body size) for provider.response(payload)"""
+    with app.app_context():
+        body = provider.response(payload).get_data()
+        iterations = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < seconds:
+            provider.response(payload)
+            iterations += 1
+            elapsed = time.perf_counter() - start
+    return iterations / elapsed, len(body)
+
+
+def main():
+    seconds = 1.0
+    if '--seconds' in sys.argv:
+        seconds = float(sys.argv[sys.argv.index('--seconds') + 1])
+
+    app = Flask(__name__)
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    print("JSON serialization benchmark")
+    print(f"orjson: {'available (' + orjson.__version__ + ')' if orjson else 'NOT installed - fast provider uses stdlib'}")
+    print("=" * 78)
+    print(f"{'Payload':34} {'Size':>10} {'stdlib/s':>10} {'fast/s':>10} {'Speedup':>9}")
+    print("-" * 78)
+
+    for name, build in PAYLOADS:
+        payload = build()
+        with app.app_context():
+            assert fast.loads(fast.response(payload).get_data()) == stdlib.loads(stdlib.response(payload).get_data())
+        stdlib_rate, size = measure(app, stdlib, payload, seconds)
+        fast_rate, _ = measure(app, fast, payload, seconds)
+        print(f"{name:34} {size / 1024:>8.1f}KB {stdlib_rate:>10.1f} {fast_rate:>10.1f} {fast_rate / stdlib_rate:>8.1f}x")
+
+    print("=" * 78)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Offline load test for Pray150
+Runs the app on a local port against the fake Supabase server in
+fake_supabase.py and the Bible API fixtures in bible_fixtures.py, then drives
+concurrent user journeys over HTTP:
+
+    login -> dashboard -> psalm -> autosave x N -> complete -> journal history
+
+and reports p50/p95/p99 latency, throughput and Supabase queries (from the
+Server-Timing header) per route. Nothing leaves the machine.
+
+--backend memory swaps the HTTP fake for the in-process MemoryClient
+(SUPABASE_BACKEND=memory), taking network and client overhead out of the
+numbers; --seed adds synthetic users and journal entries to query against.
+
+Usage:
+    python benchmark_load.py [--users 20] [--concurrency 8] [--autosaves 5] [--journeys 2]
+                             [--backend http|memory] [--seed users=10000,entries=200000]
+"""
+
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_supabase import (FAKE_ANON_KEY, FakeSupabaseServer, MemoryDatabase, memory_database, parse_seed,
+                           seed_synthetic_data)
+from bible_fixtures import BOLLS_PREFIX, FIXTURE_ROUTES, RKEPLIN_PREFIX
+
+PASSWORD = 'benchmark-password'
+_SUPABASE_TIMING_RE = re.compile(r'supabase;desc="[^"]*\((\d+)\)"')
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class Results:
+    """Latency, status and query count of every request, per route"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)   # route -> [(ms, status, queries)]
+        self._lock = threading.Lock()
+
+    def add(self, route, ms, status, queries):
+        with self._lock:
+            self.samples[route].append((ms, status, queries))
+
+    def total(self):
+        return sum(len(samples) for samples in self.samples.values())
+
+    def errors(self):
+        return sum(1 for samples in self.samples.values() for _, status, _ in samples if status >= 400)
+
+
+def start_backends(users, backend='http', seed=None):
+    """Fake Supabase (+ Bible fixtures) with seeded psalms and users"""
+    # The memory backend reads the same tables in-process; the server still
+    # serves the Bible fixtures
+    os.environ.pop('SUPABASE_MEMORY_SEED', None)
+    db = memory_database() if backend == 'memory' else MemoryDatabase()
+    server = FakeSupabaseServer(db, extra_routes=FIXTURE_ROUTES).start()
+    seed_synthetic_data(server.db, **dict({'users': 0, 'entries': 0}, **parse_seed(seed)))
+    emails = [f"user{index}@bench.pray150.local" for index in range(users)]
+    for index, email in enumerate(emails):
+        server.db.add_user(email, PASSWORD, first_name=f"User{index}", last_name='Bench')
+    return server, emails
+
+
+def start_app(server, backend='http'):
+    """Build the app against the fake backends and serve it on a local port"""
+    os.environ.update({
+        'SUPABASE_BACKEND': backend,
+        'SUPABASE_URL': server.url,
+        'SUPABASE_KEY': FAKE_ANON_KEY,
+        'STARTUP_CHECKS': 'skip',
+        'LOG_LEVEL': os.environ.get('LOG_LEVEL', 'WARNING'),
+    })
+    os.environ.pop('SUPABASE_SERVICE_ROLE_KEY', None)
+    os.environ.pop('METRICS_DIR', None)
+
+    from bible_api import BibleAPI
+    from bolls_bible_api import BollsBibleAPI
+    BibleAPI.BASE_URL = server.url + RKEPLIN_PREFIX
+    BollsBibleAPI.BASE_URL = server.url + BOLLS_PREFIX
+
+    from werkzeug.serving import make_server
+    from fake_supabase import _QuietRequestHandler
+    from app import create_app
+
+    app_server = make_server('127.0.0.1', 0, create_app(startup_mode='skip'), threaded=True,
+                             request_handler=_QuietRequestHandler)
+    threading.Thread(target=app_server.serve_forever, name='app', daemon=True).start()
+    return app_server, f"http://127.0.0.1:{app_server.port}"
+
+
+def timed(results, session, route, method, url, **kwargs):
+    started = time.perf_counter()
+    response = session.request(method, url, allow_redirects=False, timeout=60, **kwargs)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    match = _SUPABASE_TIMING_RE.search(response.headers.get('Server-Timing', ''))
+    results.add(route, elapsed_ms, response.status_code, int(match.group(1)) if match else 0)
+    return response
+
+
+def run_journey(base_url, email, psalm_number, autosaves, results):
+    """One user's devotional session"""
+    import requests
+
+    with requests.Session() as session:
+        timed(results, session, 'auth.login', 'POST', f"{base_url}/login",
+              data={'email': email, 'password': PASSWORD})
+        timed(results, session, 'main.dashboard', 'GET', f"{base_url}/dashboard")
+        timed(results, session, 'main.psalm', 'GET', f"{base_url}/psalm/{psalm_number}")
+        for number in range(autosaves):
+            prompt = str(number % 4 + 1)
+            timed(results, session, 'main.save_journal', 'POST', f"{base_url}/save_journal",
+                  json={'psalm_id': psalm_number, prompt: f"Reflection {number} on psalm {psalm_number}"})
+        timed(results, session, 'main.save_journal', 'POST', f"{base_url}/save_journal",
+              json={'psalm_id': psalm_number, 'completed': True})
+        timed(results, session, 'main.complete_psalm', 'POST', f"{base_url}/complete_psalm",
+              data={'psalm_number': psalm_number})
+        timed(results, session, 'main.journal_history', 'GET', f"{base_url}/journal-history")
+
+
+def report(results, elapsed):
+    print(f"{'Route':24} {'reqs':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8} {'errors':>7}")
+    print("-" * 78)
+    for route, samples in sorted(results.samples.items()):
+        latencies = [ms for ms, _, _ in samples]
+        queries = statistics.mean(q for _, _, q in samples)
+        errors = sum(1 for _, status, _ in samples if status >= 400)
+        print(f"{route:24} {len(samples):>6} {percentile(latencies, 0.50):>7.1f}ms "
+              f"{percentile(latencies, 0.95):>7.1f}ms {percentile(latencies, 0.99):>7.1f}ms "
+              f"{queries:>8.1f} {errors:>7}")
+    print("-" * 78)
+    print(f"{results.total()} requests in {elapsed:.2f}s - {results.total() / elapsed:.1f} req/s")
+
+
+def main():
+    users = 20
+    concurrency = 8
+    autosaves = 5
+    journeys = 2
+    backend = 'http'
+    seed = None
+    if '--users' in sys.argv:
+        users = int(sys.argv[sys.argv.index('--users') + 1])
+    if '--concurrency' in sys.argv:
+        concurrency = int(sys.argv[sys.argv.index('--concurrency') + 1])
+    if '--autosaves' in sys.argv:
+        autosaves = int(sys.argv[sys.argv.index('--autosaves') + 1])
+    if '--journeys' in sys.argv:
+        journeys = int(sys.argv[sys.argv.index('--journeys') + 1])
+    if '--backend' in sys.argv:
+        backend = sys.argv[sys.argv.index('--backend') + 1]
+    if '--seed' in sys.argv:
+        seed = sys.argv[sys.argv.index('--seed') + 1]
+
+    server, emails = start_backends(users, backend, seed)
+    app_server, base_url = start_app(server, backend)
+
+    print(f"Load test (local fake Supabase over {backend} + Bible API fixtures)")
+    if seed:
+        print(f"Synthetic data: {seed}")
+    print(f"{users} users x {journeys} journeys, {autosaves} autosaves each, concurrency {concurrency}")
+    print("=" * 78)
+
+    results = Results()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(run_journey, base_url, email, (index * 7 + round_) % 150 + 1,
+                                   autosaves, results)
+                   for round_ in range(journeys) for index, email in enumerate(emails)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    report(results, elapsed)
+    app_server.shutdown()
+    server.stop()
+
+    print("=" * 78)
+    if results.errors():
+        print(f"❌ {results.errors()} requests failed")
+        sys.exit(1)
+    print("✓ All journeys completed without errors")
+
+
+if __name__ == "__main__":
+    main()
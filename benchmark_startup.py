@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for Pray150
+Measures how long a fresh interpreter takes to import app.py and build the
+application (what every gunicorn worker pays on boot) under each
+STARTUP_CHECKS mode, and fails if worker boot exceeds the budget.
+
+Usage:
+    python benchmark_startup.py [--runs 5] [--budget-ms 300]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Runs in a fresh interpreter; prints the boot time in milliseconds
+BOOT_SCRIPT = """
+import time
+started = time.perf_counter()
+import app
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def boot_time_ms(mode):
+    env = dict(os.environ, STARTUP_CHECKS=mode)
+    result = subprocess.run([sys.executable, '-c', BOOT_SCRIPT], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=300)
+    if result.returncode != 0:
+        raise RuntimeError(f"App failed to boot in '{mode}' mode:\n{result.stderr}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    runs = 5
+    budget_ms = 300.0
+    if '--runs' in sys.argv:
+        runs = int(sys.argv[sys.argv.index('--runs') + 1])
+    if '--budget-ms' in sys.argv:
+        budget_ms = float(sys.argv[sys.argv.index('--budget-ms') + 1])
+
+    print("Startup benchmark (fresh interpreter: import app + create_app)")
+    print("=" * 60)
+    print(f"{'Mode':12} {'min':>10} {'median':>10} {'max':>10}")
+    print("-" * 60)
+
+    medians = {}
+    for mode in ('skip', 'preload', 'concurrent'):
+        timings = [boot_time_ms(mode) for _ in range(runs)]
+        medians[mode] = statistics.median(timings)
+        print(f"{mode:12} {min(timings):>8.0f}ms {medians[mode]:>8.0f}ms {max(timings):>8.0f}ms")
+
+    print("=" * 60)
+    worker_boot = medians['preload']
+    if worker_boot > budget_ms:
+        print(f"❌ Worker boot {worker_boot:.0f}ms exceeds the {budget_ms:.0f}ms budget")
+        sys.exit(1)
+    print(f"✓ Worker boot {worker_boot:.0f}ms is within the {budget_ms:.0f}ms budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,14 +4,16 @@ Uses Rob Keplin's Bible API to fetch all 150 Psalms with multiple translations
 Includes psalm superscripts/inscriptions for complete biblical context
 """
 
-import requests
+import contextvars
 import logging
 import os
-from typing import List, Dict, Optional
-from functools import lru_cache
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+from functools import partial
+from provider_router import ProviderRouter
 from psalm_superscripts import get_psalm_superscript
-from bolls_bible_api import bolls_api
+from scripture_cache import ScriptureCache
+from singleflight import scripture_flight
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -41,22 +43,42 @@ class BibleAPI:
         'LXX': 'Greek (Septuagint)'
     }
     
+    # Translations rkeplin does not serve (API.Bible and bolls.life do)
+    NOT_ON_RKEPLIN = ('CSB', 'NASB', 'WLC', 'LXX')
+    
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Pray150-DevotionalApp/1.0',
-            'Accept': 'application/json'
-        })
+        self._session = None
+        self.cache = ScriptureCache.from_env(maxsize=1000)
+        self.flight = scripture_flight
+        # Translations with several sources are fetched from the fastest,
+        # hedging to the next when it is slow (see provider_router.py). An
+        # API.Bible psalm costs one call per verse plus one, so it is only a
+        # fallback when rkeplin fails, never a hedge.
+        self.router = ProviderRouter({
+            'rkeplin': self._get_rkeplin_psalm,
+            'api.bible': lambda psalm_number, translation: self._get_api_bible_psalm(translation, psalm_number),
+        }, self.psalm_sources, is_good=lambda psalm_data: bool(psalm_data and psalm_data.get('verses')),
+            fallback_only=('api.bible',))
+    
+    @property
+    def session(self):
+        """HTTP session, created on first request"""
+        if self._session is None:
+            from upstream import ProviderSession
+            self._session = ProviderSession('rkeplin')
+        return self._session
     
     def get_available_translations(self) -> Dict[str, str]:
         """Get all available Bible translations"""
         return self.AVAILABLE_TRANSLATIONS.copy()
     
-    @lru_cache(maxsize=1000)
     def get_psalm(self, psalm_number: int, translation: str = 'NIV') -> Optional[Dict]:
         """
         Fetch a specific Psalm with verses
         
+        Served from the scripture cache: stale psalms are returned immediately
+        and refreshed in the background (see scripture_cache.py).
+        
         Args:
             psalm_number: Psalm number (1-150)
             translation: Bible translation code (ESV, NIV, etc.)
@@ -72,16 +94,42 @@ class BibleAPI:
             logger.warning(f"Unknown translation: {translation}. Using NIV as fallback.")
             translation = 'NIV'
         
+        return self.cache.get((psalm_number, translation), translation,
+                              partial(self._load_psalm, psalm_number, translation),
+                              partial(self._load_psalm, psalm_number, translation, refresh=True))
+    
+    def _load_psalm(self, psalm_number: int, translation: str, refresh: bool = False) -> Optional[Dict]:
+        """Fetch and index a psalm (cache misses and, with refresh, background refreshes)"""
+        # Concurrent cache misses for the same psalm share one upstream fetch;
+        # refreshes bypass the shared tier so they revalidate with the provider
+        psalm_data = self.flight.do(f"psalm:{translation}:{psalm_number}",
+                                    self._fetch_psalm, psalm_number, translation, refresh=refresh)
+        return self._index_psalm(psalm_data)
+    
+    def psalm_sources(self, translation: str) -> List[str]:
+        """Providers serving a translation, in order of preference"""
+        from api_bible_integration import ApiBibleClient
+        
+        sources = []
+        if translation not in self.NOT_ON_RKEPLIN:
+            sources.append('rkeplin')
+        if translation in ApiBibleClient.BIBLE_IDS and os.environ.get('API_BIBLE_KEY'):
+            sources.append('api.bible')
+        return sources
+    
+    def _fetch_psalm(self, psalm_number: int, translation: str) -> Optional[Dict]:
+        """Fetch a psalm from the providers serving its translation"""
         # Check if this is a Hebrew or Greek translation
         if translation in ['WLC', 'LXX']:
             return self._get_original_language_psalm(translation, psalm_number)
         
         # RapidAPI NIV service removed - was providing NIV 1984 text, not NIV 2011
         
-        # Check if this is a translation that requires API.Bible access
-        if translation in ['CSB', 'NASB']:
-            return self._get_api_bible_psalm(translation, psalm_number)
-        
+        return self.router.fetch(psalm_number, translation)
+    
+    def _get_rkeplin_psalm(self, psalm_number: int, translation: str) -> Optional[Dict]:
+        """Fetch a psalm from Rob Keplin's Bible API"""
+        import requests  # exception types; imported lazily like the session
         try:
             url = f"{self.BASE_URL}/books/{self.PSALMS_BOOK_ID}/chapters/{psalm_number}"
             params = {'translation': translation}
@@ -91,34 +139,7 @@ class BibleAPI:
             response = self.session.get(url, params=params, timeout=self.TIMEOUT)
             response.raise_for_status()
             
-            verses_data = response.json()
-            
-            if not verses_data:
-                logger.warning(f"No verses found for Psalm {psalm_number} in {translation}")
-                return None
-            
-            # Add superscript/inscription if available
-            superscript = get_psalm_superscript(psalm_number)
-            
-            # Format the response
-            psalm_data = {
-                'psalm_number': psalm_number,
-                'translation': translation,
-                'translation_name': self.AVAILABLE_TRANSLATIONS.get(translation, translation),
-                'verse_count': len(verses_data),
-                'verses': [],
-                'superscript': superscript
-            }
-            
-            for verse in verses_data:
-                psalm_data['verses'].append({
-                    'verse_number': verse['verseId'],
-                    'text': verse['verse'].strip(),
-                    'verse_id': verse['id']
-                })
-            
-            logger.info(f"Successfully fetched Psalm {psalm_number} ({translation}) with {len(verses_data)} verses")
-            return psalm_data
+            return self._format_rkeplin_psalm(psalm_number, translation, response.json())
             
         except requests.exceptions.Timeout:
             logger.error(f"Timeout fetching Psalm {psalm_number} ({translation})")
@@ -130,6 +151,42 @@ class BibleAPI:
             logger.error(f"Unexpected error fetching Psalm {psalm_number} ({translation}): {e}")
             return None
     
+    def _format_rkeplin_psalm(self, psalm_number: int, translation: str, verses_data: List[Dict]) -> Optional[Dict]:
+        """Psalm data from the verses of an rkeplin chapter response"""
+        if not verses_data:
+            logger.warning(f"No verses found for Psalm {psalm_number} in {translation}")
+            return None
+        
+        # Add superscript/inscription if available
+        superscript = get_psalm_superscript(psalm_number)
+        
+        # Format the response
+        psalm_data = {
+            'psalm_number': psalm_number,
+            'translation': translation,
+            'translation_name': self.AVAILABLE_TRANSLATIONS.get(translation, translation),
+            'verse_count': len(verses_data),
+            'verses': [],
+            'superscript': superscript
+        }
+        
+        for verse in verses_data:
+            psalm_data['verses'].append({
+                'verse_number': verse['verseId'],
+                'text': verse['verse'].strip(),
+                'verse_id': verse['id']
+            })
+        
+        logger.info(f"Successfully fetched Psalm {psalm_number} ({translation}) with {len(verses_data)} verses")
+        return psalm_data
+    
+    def _index_psalm(self, psalm_data: Optional[Dict]) -> Optional[Dict]:
+        """Add fetched psalm text to the local search index"""
+        if psalm_data:
+            from psalm_search import psalm_index
+            psalm_index.add_psalm(psalm_data)
+        return psalm_data
+    
     def _get_api_bible_psalm(self, translation: str, psalm_number: int) -> Optional[Dict]:
         """
         Get psalm from API.Bible for licensed translations like NIV 2011
@@ -182,6 +239,7 @@ class BibleAPI:
         Returns:
             Psalm data or None if not available
         """
+        import requests  # exception types; imported lazily like the session
         try:
             rapidapi_key = os.environ.get('RAPIDAPI_NIV_KEY')
             if not rapidapi_key:
@@ -311,6 +369,8 @@ class BibleAPI:
         Returns:
             Dictionary with psalm data from Bolls API
         """
+        from bolls_bible_api import bolls_api
+
         try:
             if translation == 'WLC':
                 psalm_data = bolls_api.get_psalm_hebrew(psalm_number)
@@ -374,85 +434,130 @@ class BibleAPI:
         logger.info(f"Day {day_of_year} corresponds to Psalm {psalm_number}")
         return self.get_psalm(psalm_number, translation)
     
-    def search_psalms(self, query: str, limit: int = 10) -> List[Dict]:
+    def search_psalms(self, query: str, limit: int = 10, translation: Optional[str] = None) -> List[Dict]:
         """
         Search for verses in Psalms containing specific text
         
+        Served from the local search index (see psalm_search.py) once it holds
+        all 150 psalms of the translation; until then the upstream search
+        endpoint is used.
+        
         Args:
-            query: Search term
+            query: Search terms, "quoted phrases" and prefix* terms
             limit: Maximum number of results
+            translation: Translation code, or None to search all translations
             
         Returns:
-            List of matching verses
+            List of matching verses, best matches first
         """
+        from psalm_search import psalm_index
+        
+        if psalm_index.is_complete(translation):
+            return psalm_index.search(query, translation=translation, limit=limit)
+        
+        logger.info("Local psalm index is incomplete - falling back to upstream search")
+        return self._search_psalms_upstream(query, limit, translation)
+    
+    def _search_params(self, query: str, limit: int, translation: Optional[str]) -> Optional[Dict]:
+        """Query for the rkeplin /search endpoint, or None when it does not cover the translation"""
+        if translation in self.NOT_ON_RKEPLIN:
+            logger.info(f"Upstream search does not cover {translation}")
+            return None
+        params = {
+            'query': f"psalms {query}",
+            'limit': limit
+        }
+        if translation:
+            params['translation'] = translation
+        return params
+    
+    def _search_psalms_upstream(self, query: str, limit: int = 10, translation: Optional[str] = None) -> List[Dict]:
+        """Search via the rkeplin /search endpoint, keeping only Psalms results"""
+        params = self._search_params(query, limit, translation)
+        if params is None:
+            return []
         try:
             url = f"{self.BASE_URL}/search"
-            params = {
-                'query': f"psalms {query}",
-                'limit': limit
-            }
             
             logger.info(f"Searching Psalms for: '{query}'")
             
             response = self.session.get(url, params=params, timeout=self.TIMEOUT)
             response.raise_for_status()
             
-            search_results = response.json()
-            
-            # Filter results to only include Psalms (book id 19)
-            psalm_results = []
-            for result in search_results:
-                # Handle both dict and object responses
-                if isinstance(result, dict):
-                    book_info = result.get('book', {})
-                    book_id = book_info.get('id') if isinstance(book_info, dict) else getattr(book_info, 'id', None)
-                else:
-                    book_id = getattr(getattr(result, 'book', None), 'id', None)
-                
-                if book_id == self.PSALMS_BOOK_ID:
-                    psalm_results.append({
-                        'psalm_number': getattr(result, 'chapterId', result.get('chapterId')) if hasattr(result, 'chapterId') else result.get('chapterId'),
-                        'verse_number': getattr(result, 'verseId', result.get('verseId')) if hasattr(result, 'verseId') else result.get('verseId'),
-                        'text': ((getattr(result, 'verse', result.get('verse')) if hasattr(result, 'verse') else result.get('verse', '')) or '').strip(),
-                        'verse_id': getattr(result, 'id', result.get('id')) if hasattr(result, 'id') else result.get('id')
-                    })
-            
-            logger.info(f"Found {len(psalm_results)} matching verses in Psalms")
-            return psalm_results
+            return self._psalm_search_results(response.json(), translation)
             
         except Exception as e:
             logger.error(f"Error searching Psalms: {e}")
             return []
     
+    def _psalm_search_results(self, search_results: List, translation: Optional[str] = None) -> List[Dict]:
+        """Verses from an rkeplin search response that are in Psalms, tagged with the translation searched"""
+        # Filter results to only include Psalms (book id 19)
+        psalm_results = []
+        for result in search_results:
+            # Handle both dict and object responses
+            if isinstance(result, dict):
+                book_info = result.get('book', {})
+                book_id = book_info.get('id') if isinstance(book_info, dict) else getattr(book_info, 'id', None)
+            else:
+                book_id = getattr(getattr(result, 'book', None), 'id', None)
+            
+            if book_id == self.PSALMS_BOOK_ID:
+                psalm_results.append({
+                    'psalm_number': getattr(result, 'chapterId', result.get('chapterId')) if hasattr(result, 'chapterId') else result.get('chapterId'),
+                    'verse_number': getattr(result, 'verseId', result.get('verseId')) if hasattr(result, 'verseId') else result.get('verseId'),
+                    'text': ((getattr(result, 'verse', result.get('verse')) if hasattr(result, 'verse') else result.get('verse', '')) or '').strip(),
+                    'verse_id': getattr(result, 'id', result.get('id')) if hasattr(result, 'id') else result.get('id')
+                })
+                if translation:
+                    psalm_results[-1]['translation'] = translation
+        
+        logger.info(f"Found {len(psalm_results)} matching verses in Psalms")
+        return psalm_results
+    
     def validate_psalm_number(self, psalm_number: int) -> bool:
         """Validate if psalm number is within valid range"""
         return 1 <= psalm_number <= 150
     
-    def get_psalm_range(self, start_psalm: int, end_psalm: int, translation: str = 'ESV') -> Dict[int, Dict]:
+    def get_psalm_range(self, start_psalm: int, end_psalm: int, translation: str = 'ESV',
+                        workers: Optional[int] = None) -> Iterator[Tuple[int, Dict]]:
         """
-        Fetch multiple consecutive Psalms
+        Fetch multiple consecutive Psalms concurrently
+        
+        Psalms are fetched by a bounded pool of worker threads, with provider
+        calls paced by the per-provider rate limits (see upstream.py).
         
         Args:
             start_psalm: Starting Psalm number
             end_psalm: Ending Psalm number (inclusive)
             translation: Bible translation code
+            workers: Concurrent fetches (default PSALM_RANGE_WORKERS, 4)
             
-        Returns:
-            Dictionary with psalm numbers as keys and psalm data as values
+        Yields:
+            (psalm number, psalm data) pairs in the order they complete -
+            dict(...) of them gives the psalms by number
         """
         if not (1 <= start_psalm <= end_psalm <= 150):
             logger.error(f"Invalid psalm range: {start_psalm}-{end_psalm}")
-            return {}
+            return
         
-        results = {}
-        for psalm_num in range(start_psalm, end_psalm + 1):
-            psalm_data = self.get_psalm(psalm_num, translation)
-            if psalm_data:
-                results[psalm_num] = psalm_data
-            # Add small delay to be respectful to the API
-            time.sleep(0.1)
+        from upstream import rate_limited
         
-        return results
+        workers = workers or int(os.environ.get('PSALM_RANGE_WORKERS', '4'))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='psalm-range')
+        try:
+            # Copy the context so provider calls count towards the request (instrumentation.py)
+            futures = {
+                executor.submit(contextvars.copy_context().run, rate_limited, self.get_psalm, psalm_num, translation): psalm_num
+                for psalm_num in range(start_psalm, end_psalm + 1)
+            }
+            for future in as_completed(futures):
+                psalm_data = future.result()
+                if psalm_data:
+                    yield futures[future], psalm_data
+        finally:
+            # A consumer that stops early does not wait for the remaining psalms
+            executor.shutdown(wait=False, cancel_futures=True)
 
 
 # Global Bible API instance for use across the application
@@ -475,6 +580,6 @@ def get_available_translations() -> Dict[str, str]:
     return bible_api.get_available_translations()
 
 
-def search_psalms(query: str, limit: int = 10) -> List[Dict]:
+def search_psalms(query: str, limit: int = 10, translation: Optional[str] = None) -> List[Dict]:
     """Search Psalms for specific text"""
-    return bible_api.search_psalms(query, limit)
\ No newline at end of file
+    return bible_api.search_psalms(query, limit, translation)
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Offline Bible API fixtures for Pray150 benchmarks
+Deterministic stand-in chapters in the response formats of Rob Keplin's
+Bible API (rkeplin) and bolls.life, with the real verse count of every
+psalm, plus a handler that serves them from the fake Supabase server
+(fake_supabase.FakeSupabaseServer extra_routes) under /bible/rkeplin/v1 and
+/bible/bolls.
+"""
+
+import json
+import random
+import re
+from typing import Dict, List
+
+from werkzeug.wrappers import Response
+
+from psalm_facets import VERSE_COUNTS
+
+RKEPLIN_PREFIX = '/bible/rkeplin/v1'
+BOLLS_PREFIX = '/bible/bolls'
+
+_WORDS = ('the', 'LORD', 'is', 'my', 'shepherd', 'I', 'shall', 'not', 'want', 'he', 'makes', 'me',
+          'lie', 'down', 'in', 'green', 'pastures', 'leads', 'beside', 'still', 'waters', 'restores',
+          'soul', 'praise', 'his', 'name', 'mercy', 'endures', 'forever', 'refuge', 'strength',
+          'help', 'trouble', 'sing', 'new', 'song', 'righteous', 'heart', 'trust', 'salvation')
+
+_RKEPLIN_RE = re.compile(r'^/books/19/chapters/(\d+)$')
+_BOLLS_RE = re.compile(r'^/get-text/(\w+)/19/(\d+)/?$')
+
+
+def verse_texts(psalm_number: int, translation: str) -> List[str]:
+    """Same words for the same psalm and translation on every run"""
+    rng = random.Random(f"{translation}:{psalm_number}")
+    return [' '.join(rng.choice(_WORDS) for _ in range(rng.randint(8, 22))).capitalize() + '.'
+            for _ in range(VERSE_COUNTS[psalm_number - 1])]
+
+
+def rkeplin_chapter(psalm_number: int, translation: str) -> List[Dict]:
+    """GET /v1/books/19/chapters/<n>?translation=<t> response body"""
+    return [{
+        'id': 19000000 + psalm_number * 1000 + number,
+        'book': {'id': 19, 'name': 'Psalms'},
+        'chapterId': psalm_number,
+        'verseId': number,
+        'verse': text,
+    } for number, text in enumerate(verse_texts(psalm_number, translation), 1)]
+
+
+def bolls_chapter(psalm_number: int, translation: str) -> List[Dict]:
+    """GET /get-text/<t>/19/<n>/ response body"""
+    return [{'pk': psalm_number * 1000 + number, 'verse': number, 'text': text}
+            for number, text in enumerate(verse_texts(psalm_number, translation), 1)]
+
+
+def serve_fixture(request) -> Response:
+    """Route handler for the fake Supabase server's /bible/ prefix"""
+    body = None
+    if request.path.startswith(RKEPLIN_PREFIX):
+        match = _RKEPLIN_RE.match(request.path[len(RKEPLIN_PREFIX):])
+        if match and 1 <= int(match.group(1)) <= 150:
+            body = rkeplin_chapter(int(match.group(1)), request.args.get('translation', 'NIV'))
+    elif request.path.startswith(BOLLS_PREFIX):
+        match = _BOLLS_RE.match(request.path[len(BOLLS_PREFIX):])
+        if match and 1 <= int(match.group(2)) <= 150:
+            body = bolls_chapter(int(match.group(2)), match.group(1))
+    if body is None:
+        return Response('{"detail": "Not found."}', status=404, mimetype='application/json')
+    return Response(json.dumps(body), mimetype='application/json')
+
+
+# extra_routes for fake_supabase.FakeSupabaseServer
+FIXTURE_ROUTES = {'/bible/': serve_fixture}
@@ -3,11 +3,12 @@ Bolls Bible API Integration for Hebrew and Greek Texts
 Provides access to Westminster Leningrad Codex (Hebrew) and Septuagint (Greek)
 """
 
-import requests
 import logging
 from typing import List, Dict, Optional
-from functools import lru_cache
+from functools import partial
 import time
+from scripture_cache import ScriptureCache
+from singleflight import scripture_flight
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,17 +28,21 @@ class BollsBibleAPI:
     }
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Pray150-DevotionalApp/1.0',
-            'Accept': 'application/json'
-        })
+        self._session = None
+        self.cache = ScriptureCache.from_env(maxsize=300)
+    
+    @property
+    def session(self):
+        """HTTP session, created on first request"""
+        if self._session is None:
+            from upstream import ProviderSession
+            self._session = ProviderSession('bolls')
+        return self._session
     
     def get_available_translations(self) -> Dict[str, str]:
         """Get all available original language translations"""
         return self.ORIGINAL_LANGUAGE_TRANSLATIONS.copy()
     
-    @lru_cache(maxsize=300)
     def get_psalm_hebrew(self, psalm_number: int) -> Optional[Dict]:
         """
         Fetch a specific Psalm in Hebrew (Westminster Leningrad Codex)
@@ -48,9 +53,8 @@ class BollsBibleAPI:
         Returns:
             Dictionary with psalm data and verses in Hebrew
         """
-        return self._get_psalm('WLC', psalm_number)
+        return self._cached_psalm('WLC', psalm_number)
     
-    @lru_cache(maxsize=300) 
     def get_psalm_greek(self, psalm_number: int) -> Optional[Dict]:
         """
         Fetch a specific Psalm in Greek (Septuagint)
@@ -63,7 +67,13 @@ class BollsBibleAPI:
         """
         # Note: Septuagint psalm numbering can differ from Hebrew
         # Some psalms are combined or split differently
-        return self._get_psalm('LXX', psalm_number)
+        return self._cached_psalm('LXX', psalm_number)
+    
+    def _cached_psalm(self, translation: str, psalm_number: int) -> Optional[Dict]:
+        """Psalm from the scripture cache; concurrent misses share one fetch"""
+        fetch = partial(scripture_flight.do, f"bolls:{translation}:{psalm_number}",
+                        self._get_psalm, translation, psalm_number)
+        return self.cache.get((translation, psalm_number), translation, fetch, partial(fetch, refresh=True))
     
     def _get_psalm(self, translation: str, psalm_number: int) -> Optional[Dict]:
         """
@@ -84,6 +94,7 @@ class BollsBibleAPI:
             logger.error(f"Unknown translation: {translation}. Available: {list(self.ORIGINAL_LANGUAGE_TRANSLATIONS.keys())}")
             return None
         
+        import requests  # exception types; imported lazily like the session
         try:
             url = f"{self.BASE_URL}/get-text/{translation}/{self.PSALMS_BOOK_ID}/{psalm_number}/"
             
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Static asset build step for Pray150
+Minifies, bundles and content-hashes the files under static/js and static/css
+into static/dist, and writes static/dist/manifest.json for the asset_url helper.
+
+Usage:
+    python build_assets.py            # build bundles and manifest
+    python build_assets.py --clean    # remove static/dist first
+
+rjsmin / rcssmin are used when installed; otherwise a conservative built-in
+minifier (comments and redundant whitespace only) is applied.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+
+from assets import BUNDLES, DIST_DIR, MANIFEST_FILENAME
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+# Keywords after which a "/" starts a regular expression rather than a division
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new',
+                   'delete', 'void', 'throw', 'yield', 'await', 'instanceof'}
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+
+
+def _collapse_whitespace(code):
+    """Trim each line, collapse runs of blanks and drop empty lines"""
+    lines = []
+    for line in code.split('\n'):
+        line = re.sub(r'[ \t]+', ' ', line).strip()
+        if line:
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def minify_js(source):
+    """
+    Remove comments and redundant whitespace from JavaScript
+    Newlines are kept so automatic semicolon insertion is unaffected; string,
+    template and regex literals are copied through untouched.
+    """
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+
+    out = []          # output pieces; literals are wrapped so whitespace survives
+    code = []         # pending code to be whitespace-collapsed
+    i = 0
+    n = len(source)
+    last_significant = ''
+    last_word = ''
+    template_depth = []  # brace depth stack for ${ ... } inside template literals
+
+    def flush_code():
+        if code:
+            out.append(('code', ''.join(code)))
+            code.clear()
+
+    def read_quoted(start, quote):
+        j = start + 1
+        while j < n:
+            if source[j] == '\\':
+                j += 2
+                continue
+            if source[j] == quote or (quote != '`' and source[j] == '\n'):
+                return j + 1
+            if quote == '`' and source.startswith('${', j):
+                return j + 2
+            j += 1
+        return n
+
+    while i < n:
+        ch = source[i]
+        nxt = source[i + 1] if i + 1 < n else ''
+
+        if ch == '/' and nxt == '/':
+            end = source.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        if ch == '/' and nxt == '*':
+            end = source.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            code.append('\n' if '\n' in source[i:end] else ' ')
+            i = end
+            continue
+
+        if ch in '\'"`' or (ch == '}' and template_depth and template_depth[-1] == 0):
+            if ch == '}':
+                template_depth.pop()
+                quote = '`'
+            else:
+                quote = ch
+            end = read_quoted(i, quote)
+            literal = source[i:end]
+            flush_code()
+            out.append(('literal', literal))
+            if quote == '`' and literal.endswith('${'):
+                template_depth.append(0)
+            i = end
+            last_significant = quote
+            last_word = ''
+            continue
+
+        if ch == '/' and (not last_significant or last_significant in _REGEX_PRECEDERS
+                          or last_word in _REGEX_KEYWORDS):
+            j = i + 1
+            in_class = False
+            while j < n and source[j] != '\n':
+                c = source[j]
+                if c == '\\':
+                    j += 2
+                    continue
+                if c == '[':
+                    in_class = True
+                elif c == ']':
+                    in_class = False
+                elif c == '/' and not in_class:
+                    j += 1
+                    break
+                j += 1
+            while j < n and (source[j].isalnum() or source[j] == '_'):
+                j += 1  # flags
+            flush_code()
+            out.append(('literal', source[i:j]))
+            i = j
+            last_significant = '/'
+            last_word = ''
+            continue
+
+        if template_depth:
+            if ch == '{':
+                template_depth[-1] += 1
+            elif ch == '}':
+                template_depth[-1] -= 1
+
+        code.append(ch)
+        if not ch.isspace():
+            if ch.isalnum() or ch in '_$':
+                prev = source[i - 1] if i else ''
+                last_word = (last_word + ch) if (prev.isalnum() or prev in '_$') else ch
+            else:
+                last_word = ''
+            last_significant = ch
+        i += 1
+
+    flush_code()
+
+    # Collapse whitespace in code segments only, then stitch literals back in
+    placeholder = '\x00{}\x00'
+    literals = []
+    pieces = []
+    for kind, text in out:
+        if kind == 'literal':
+            pieces.append(placeholder.format(len(literals)))
+            literals.append(text)
+        else:
+            pieces.append(text)
+    collapsed = _collapse_whitespace(''.join(pieces))
+    return re.sub('\x00(\\d+)\x00', lambda m: literals[int(m.group(1))], collapsed)
+
+
+def minify_css(source):
+    """Remove comments and redundant whitespace from CSS"""
+    if rcssmin is not None:
+        return rcssmin.cssmin(source)
+
+    css = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+def minify(filename, source):
+    if filename.endswith('.js'):
+        return minify_js(source)
+    if filename.endswith('.css'):
+        return minify_css(source)
+    return source
+
+
+def fingerprint(filename, content):
+    """Insert a short content hash before the extension: js/app.js -> js/app.1a2b3c4d.js"""
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]
+    root, ext = os.path.splitext(filename)
+    return f"{root}.{digest}{ext}"
+
+
+def write_asset(dist_root, filename, content):
+    hashed = fingerprint(filename, content)
+    path = os.path.join(dist_root, hashed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return f"{DIST_DIR}/{hashed}"
+
+
+def read_source(filename):
+    with open(os.path.join(STATIC_DIR, filename), encoding='utf-8') as f:
+        return f.read()
+
+
+def build(clean=False):
+    """Build all bundles and individual sources, returning the manifest"""
+    dist_root = os.path.join(STATIC_DIR, DIST_DIR)
+    if clean and os.path.isdir(dist_root):
+        shutil.rmtree(dist_root)
+
+    manifest = {}
+    minified = {}
+
+    for sources in BUNDLES.values():
+        for source in sources:
+            if source not in minified:
+                minified[source] = minify(source, read_source(source))
+                manifest[source] = write_asset(dist_root, source, minified[source])
+
+    for bundle, sources in BUNDLES.items():
+        separator = ';\n' if bundle.endswith('.js') else '\n'
+        content = separator.join(minified[source] for source in sources) + '\n'
+        manifest[bundle] = write_asset(dist_root, bundle, content)
+
+    os.makedirs(dist_root, exist_ok=True)
+    with open(os.path.join(dist_root, MANIFEST_FILENAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return manifest
+
+
+def main():
+    manifest = build(clean='--clean' in sys.argv)
+    print(f"✓ Built {len(manifest)} assets into static/{DIST_DIR}")
+    for name, path in sorted(manifest.items()):
+        size = os.path.getsize(os.path.join(STATIC_DIR, path))
+        print(f"   {name} -> {path} ({size:,} bytes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Response compression for Pray150
+Negotiates gzip/brotli with the client and compresses dynamic HTML and JSON
+responses. Streamed responses are compressed chunk by chunk, and cacheable
+(Cache-Control: public) bodies such as scripture JSON are compressed once and
+reused from a small in-process variant cache.
+"""
+
+import hashlib
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional
+
+try:
+    import brotli
+except ImportError:  # declared in pyproject.toml; without it only gzip is offered
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIMETYPES = {
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/xml',
+    'application/json',
+    'application/javascript',
+    'image/svg+xml',
+}
+
+
+def _gzip_compressor(level: int):
+    # wbits=31 writes a gzip header with mtime 0, so output is deterministic
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def compress_bytes(data: bytes, encoding: str, level: int = 6) -> bytes:
+    """Compress a complete body with the given content-coding"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    compressor = _gzip_compressor(level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str, level: int = 6) -> Iterator[bytes]:
+    """
+    Compress an iterable of body chunks, flushing after every chunk so the
+    client receives data as soon as the application yields it
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        for chunk in chunks:
+            if chunk:
+                out = compressor.process(chunk) + compressor.flush()
+                if out:
+                    yield out
+        yield compressor.finish()
+    else:
+        compressor = _gzip_compressor(level)
+        for chunk in chunks:
+            if chunk:
+                out = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                if out:
+                    yield out
+        yield compressor.flush()
+
+
+class VariantCache:
+    """Bounded LRU of precompressed bodies keyed by (body digest, encoding)"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compress(self, data: bytes, encoding: str, level: int) -> bytes:
+        key = (hashlib.sha1(data).digest(), encoding)
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compressed
+            self.misses += 1
+
+        compressed = compress_bytes(data, encoding, level)
+
+        with self._lock:
+            self._entries[key] = compressed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compressed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class Compress:
+    """Flask extension that compresses responses according to Accept-Encoding"""
+
+    def __init__(self, app=None):
+        self.variants = VariantCache()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_ENABLED', True)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+        app.config.setdefault('COMPRESS_LEVEL', 6)
+        app.config.setdefault('COMPRESS_BR_LEVEL', 4)
+        app.config.setdefault('COMPRESS_MIMETYPES', DEFAULT_MIMETYPES)
+        app.config.setdefault('COMPRESS_CACHE_SIZE', 256)
+
+        self.variants.max_entries = app.config['COMPRESS_CACHE_SIZE']
+        app.after_request(self.after_request)
+
+    def available_encodings(self):
+        """Encodings we can produce, in server preference order"""
+        return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+    def negotiate(self, request) -> Optional[str]:
+        """Pick the best encoding the client accepts (q-values respected)"""
+        return request.accept_encodings.best_match(self.available_encodings())
+
+    def _should_compress(self, response, config) -> bool:
+        if not config['COMPRESS_ENABLED']:
+            return False
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if 'Content-Encoding' in response.headers:
+            return False
+        # send_file responses (static assets) are served as-is
+        if response.direct_passthrough:
+            return False
+        return response.mimetype in config['COMPRESS_MIMETYPES']
+
+    def after_request(self, response):
+        from flask import current_app, request
+
+        config = current_app.config
+        if not self._should_compress(response, config):
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        encoding = self.negotiate(request)
+        if not encoding:
+            return response
+
+        level = config['COMPRESS_BR_LEVEL'] if encoding == 'br' else config['COMPRESS_LEVEL']
+
+        if response.is_streamed:
+            response.response = compress_stream(response.iter_encoded(), encoding, level)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < config['COMPRESS_MIN_SIZE']:
+                return response
+            if response.cache_control.public:
+                compressed = self.variants.get_or_compress(data, encoding, level)
+            else:
+                compressed = compress_bytes(data, encoding, level)
+            response.set_data(compressed)
+
+        response.headers['Content-Encoding'] = encoding
+
+        etag, weak = response.get_etag()
+        if etag:
+            # Each encoding is a distinct representation with its own ETag;
+            # revalidation against that ETag can only be answered here
+            response.set_etag(f"{etag}-{encoding}", weak)
+            if request.if_none_match:
+                response.make_conditional(request)
+
+        return response
+
+
+# Global extension instance, initialised in app.py
+compress = Compress()
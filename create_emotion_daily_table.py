@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Script to add per-user daily emotion aggregates to Supabase
+Creates the emotion_daily table read by the Heart Tracker's long-range charts
+(see emotion_analytics.py) and backfills it from existing journal entries.
+The app keeps it current by recounting a day whenever an entry's emotion
+changes.
+"""
+
+EMOTION_DAILY_SQL = """
+-- One row per user per UTC day with emotion check-ins
+CREATE TABLE IF NOT EXISTS public.emotion_daily (
+    user_id TEXT NOT NULL,
+    day DATE NOT NULL,
+    terrible INTEGER NOT NULL DEFAULT 0,
+    bad INTEGER NOT NULL DEFAULT 0,
+    okay INTEGER NOT NULL DEFAULT 0,
+    good INTEGER NOT NULL DEFAULT 0,
+    great INTEGER NOT NULL DEFAULT 0,
+    entries INTEGER NOT NULL DEFAULT 0,
+    value_sum INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, day)
+);
+
+ALTER TABLE public.emotion_daily ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can manage their own emotion aggregates" ON public.emotion_daily;
+CREATE POLICY "Users can manage their own emotion aggregates" ON public.emotion_daily
+FOR ALL USING (user_id = current_setting('request.jwt.claims', true)::json->>'sub');
+
+-- Backfill from the entries saved so far (safe to re-run)
+INSERT INTO public.emotion_daily (user_id, day, terrible, bad, okay, good, great, entries, value_sum)
+SELECT user_id,
+       (created_at AT TIME ZONE 'UTC')::DATE,
+       count(*) FILTER (WHERE prompt_responses->>'emotion' = 'terrible'),
+       count(*) FILTER (WHERE prompt_responses->>'emotion' = 'bad'),
+       count(*) FILTER (WHERE prompt_responses->>'emotion' = 'okay'),
+       count(*) FILTER (WHERE prompt_responses->>'emotion' = 'good'),
+       count(*) FILTER (WHERE prompt_responses->>'emotion' = 'great'),
+       count(*),
+       sum(CASE prompt_responses->>'emotion'
+               WHEN 'terrible' THEN 1 WHEN 'bad' THEN 2 WHEN 'okay' THEN 3
+               WHEN 'good' THEN 4 WHEN 'great' THEN 5 END)
+FROM public.journal_entries
+WHERE prompt_responses->>'emotion' IN ('terrible', 'bad', 'okay', 'good', 'great')
+GROUP BY 1, 2
+ON CONFLICT (user_id, day) DO UPDATE SET
+    terrible = EXCLUDED.terrible,
+    bad = EXCLUDED.bad,
+    okay = EXCLUDED.okay,
+    good = EXCLUDED.good,
+    great = EXCLUDED.great,
+    entries = EXCLUDED.entries,
+    value_sum = EXCLUDED.value_sum,
+    updated_at = NOW();
+"""
+
+
+def create_emotion_daily_table():
+    """Print the emotion aggregate SQL for the Supabase SQL editor"""
+    print("Adding daily emotion aggregates...")
+    print("SQL to execute:")
+    print(EMOTION_DAILY_SQL)
+
+    print("\nTo install the aggregates:")
+    print("1. Go to your Supabase dashboard")
+    print("2. Navigate to SQL Editor")
+    print("3. Run the above SQL")
+    print("Until it is installed, long-range Heart Tracker charts are computed from journal entries.")
+    return True
+
+
+if __name__ == "__main__":
+    create_emotion_daily_table()
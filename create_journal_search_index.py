@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Script to add full-text search to the journal_entries table in Supabase
+Adds a generated tsvector column over the prompt responses, a GIN index on it,
+and the search_journal_entries() function used by JournalEntry.search.
+"""
+
+JOURNAL_SEARCH_SQL = """
+-- Searchable text of an entry: the four prompt responses with HTML tags removed
+CREATE OR REPLACE FUNCTION public.journal_entry_text(responses JSONB)
+RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT regexp_replace(
+        concat_ws(' ', responses->>'1', responses->>'2', responses->>'3', responses->>'4'),
+        '<[^>]*>', ' ', 'g'
+    )
+$$;
+
+-- Whether an entry counts as completed, with the same truthiness the app applies
+-- to prompt_responses['completed'] (older entries store the strings "True" and
+-- "False", both of which count as completed there)
+CREATE OR REPLACE FUNCTION public.journal_entry_completed(responses JSONB)
+RETURNS BOOLEAN
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT CASE jsonb_typeof(responses->'completed')
+        WHEN 'boolean' THEN (responses->>'completed')::BOOLEAN
+        WHEN 'string' THEN responses->>'completed' <> ''
+        WHEN 'number' THEN (responses->>'completed')::NUMERIC <> 0
+        WHEN 'array' THEN jsonb_array_length(responses->'completed') > 0
+        WHEN 'object' THEN responses->'completed' <> '{}'::JSONB
+        ELSE FALSE
+    END
+$$;
+
+-- Maintained by Postgres on every insert/update, so searches never re-read text
+ALTER TABLE public.journal_entries
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('english', public.journal_entry_text(prompt_responses))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_journal_entries_search
+    ON public.journal_entries USING GIN (search_vector);
+
+-- Ranked, paginated search with highlighted snippets. Snippet highlights are
+-- delimited by \\x01 ... \\x02 so the application can escape the text first.
+CREATE OR REPLACE FUNCTION public.search_journal_entries(
+    p_user_id TEXT,
+    p_query TEXT,
+    p_psalm_id BIGINT DEFAULT NULL,
+    p_date DATE DEFAULT NULL,
+    p_limit INT DEFAULT 12,
+    p_offset INT DEFAULT 0
+)
+RETURNS TABLE (
+    id BIGINT,
+    psalm_id BIGINT,
+    prompt_responses JSONB,
+    created_at TIMESTAMPTZ,
+    rank REAL,
+    snippet TEXT,
+    total_count BIGINT
+)
+LANGUAGE sql STABLE
+AS $$
+    WITH query AS (
+        SELECT websearch_to_tsquery('english', p_query) AS q
+    ),
+    matches AS (
+        SELECT e.id, e.psalm_id, e.prompt_responses, e.created_at,
+               ts_rank_cd(e.search_vector, query.q) AS rank,
+               count(*) OVER () AS total_count
+        FROM public.journal_entries e, query
+        WHERE e.user_id = p_user_id
+          AND e.search_vector @@ query.q
+          AND public.journal_entry_completed(e.prompt_responses)
+          AND (p_psalm_id IS NULL OR e.psalm_id = p_psalm_id)
+          AND (p_date IS NULL OR (e.created_at AT TIME ZONE 'UTC')::DATE = p_date)
+        ORDER BY rank DESC, e.created_at DESC
+        LIMIT p_limit OFFSET p_offset
+    )
+    -- Headlines are only generated for the rows on the requested page
+    SELECT m.id, m.psalm_id, m.prompt_responses, m.created_at, m.rank,
+           ts_headline('english', public.journal_entry_text(m.prompt_responses), query.q,
+                       'StartSel=' || chr(1) || ', StopSel=' || chr(2) ||
+                       ', MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=" … "') AS snippet,
+           m.total_count
+    FROM matches m, query
+    ORDER BY m.rank DESC, m.created_at DESC
+$$;
+"""
+
+
+def create_journal_search_index():
+    """Print the journal search SQL for the Supabase SQL editor"""
+    print("Adding full-text search to journal_entries...")
+    print("SQL to execute:")
+    print(JOURNAL_SEARCH_SQL)
+
+    print("\nTo install journal search:")
+    print("1. Go to your Supabase dashboard")
+    print("2. Navigate to SQL Editor")
+    print("3. Run the above SQL")
+    print("Until it is installed, journal search falls back to scanning entries in the app.")
+    return True
+
+
+if __name__ == "__main__":
+    create_journal_search_index()
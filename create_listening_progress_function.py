@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Script to add the bulk listening progress function to Supabase
+save_listening_progress() applies a batch of buffered listening positions
+(see listening_buffer.py) to user_profiles in a single UPDATE.
+"""
+
+LISTENING_PROGRESS_SQL = """
+ALTER TABLE public.user_profiles ADD COLUMN IF NOT EXISTS listen_current_psalm INTEGER;
+ALTER TABLE public.user_profiles ADD COLUMN IF NOT EXISTS listen_current_position FLOAT;
+ALTER TABLE public.user_profiles ADD COLUMN IF NOT EXISTS listen_last_updated TIMESTAMP;
+
+-- rows: [{"user_id": ..., "listen_current_psalm": ..., "listen_current_position": ...,
+--         "listen_last_updated": ...}, ...]; only existing profiles are updated
+CREATE OR REPLACE FUNCTION public.save_listening_progress(rows JSONB)
+RETURNS SETOF TEXT
+LANGUAGE sql
+AS $$
+    UPDATE public.user_profiles p
+    SET listen_current_psalm = r.listen_current_psalm,
+        listen_current_position = r.listen_current_position,
+        listen_last_updated = r.listen_last_updated
+    FROM jsonb_to_recordset(rows) AS r(
+        user_id TEXT,
+        listen_current_psalm INTEGER,
+        listen_current_position FLOAT,
+        listen_last_updated TIMESTAMP
+    )
+    WHERE p.user_id = r.user_id
+      AND (p.listen_last_updated IS NULL OR p.listen_last_updated <= r.listen_last_updated)
+    RETURNING p.user_id
+$$;
+"""
+
+
+def create_listening_progress_function():
+    """Print the listening progress SQL for the Supabase SQL editor"""
+    print("Adding bulk listening progress updates to user_profiles...")
+    print("SQL to execute:")
+    print(LISTENING_PROGRESS_SQL)
+
+    print("\nTo install it:")
+    print("1. Go to your Supabase dashboard")
+    print("2. Navigate to SQL Editor")
+    print("3. Run the above SQL")
+    print("Until it is installed, buffered progress is written with one update per user.")
+    return True
+
+
+if __name__ == "__main__":
+    create_listening_progress_function()
@@ -2,14 +2,30 @@
 Supabase database initialization and table creation
 """
 import os
-from supabase import create_client
+from concurrent.futures import ThreadPoolExecutor
 
 def get_supabase_client():
-    """Get Supabase client instance"""
+    """
+    Get Supabase client instance
+    With SUPABASE_BACKEND=memory this is an in-process client over the
+    in-memory tables in fake_supabase.py (optionally seeded with synthetic
+    data via SUPABASE_MEMORY_SEED) instead of a Supabase project.
+    """
+    from instrumentation import instrument_supabase
+
+    if os.environ.get('SUPABASE_BACKEND', '').lower() == 'memory':
+        from fake_supabase import MemoryClient, memory_database
+        return instrument_supabase(MemoryClient(memory_database()))
+
+    # Imported on first use - the supabase package dominates import time for
+    # the app and for maintenance scripts that never open a connection
+    from supabase import create_client
+
     supabase_url = os.environ.get('SUPABASE_URL')
     # Use service role key for bypassing RLS when needed
     supabase_key = os.environ.get('SUPABASE_SERVICE_ROLE_KEY') or os.environ.get('SUPABASE_KEY')
-    return create_client(supabase_url, supabase_key)
+    # Queries are counted and timed per request (Server-Timing, request log)
+    return instrument_supabase(create_client(supabase_url, supabase_key))
 
 def initialize_database():
     """Initialize Supabase database tables"""
@@ -221,14 +237,24 @@ def check_table_exists(table_name):
         print(f"Table {table_name} check failed: {e}")
         return False
 
-def verify_all_tables():
-    """Verify all required tables exist"""
+def verify_all_tables(concurrent=False):
+    """
+    Verify all required tables exist
+    With concurrent=True every table is probed in parallel, so the check costs
+    one round trip instead of one per table.
+    """
     required_tables = ['psalms', 'journal_entries', 'markups', 'prayer_lists', 'progress']
     existing_tables = []
     missing_tables = []
     
-    for table in required_tables:
-        if check_table_exists(table):
+    if concurrent:
+        with ThreadPoolExecutor(max_workers=len(required_tables)) as executor:
+            results = list(executor.map(check_table_exists, required_tables))
+    else:
+        results = [check_table_exists(table) for table in required_tables]
+    
+    for table, exists in zip(required_tables, results):
+        if exists:
             existing_tables.append(table)
             print(f"✓ Table '{table}' exists")
         else:
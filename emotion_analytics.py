@@ -0,0 +1,166 @@
+"""
+Emotion analytics for the Heart Tracker
+Journal entries carry the pre-reflection check-in in prompt_responses
+['emotion']. EmotionAnalytics:
+  - fetches a user's check-ins once for the longest window asked for,
+    selecting only the emotion rather than the full responses, and derives
+    every shorter window from them (the dashboard's week and month charts)
+  - keeps per-user, per-day aggregates in the emotion_daily table (SQL in
+    create_emotion_daily_table.py): when a saved entry's emotion changes, its
+    day is recounted and upserted, so charts over 6 or 12 months read one row
+    per day
+Until the table is installed, daily views are computed from the entries.
+"""
+
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Check-in scale, worst to best, with the value charted for each
+EMOTION_VALUES = {'terrible': 1, 'bad': 2, 'okay': 3, 'good': 4, 'great': 5}
+
+EMOTION_DAILY_TABLE = 'emotion_daily'
+
+
+def day_of(created_at) -> str:
+    """UTC day (YYYY-MM-DD) of a created_at timestamp string or datetime"""
+    if isinstance(created_at, (datetime, date)):
+        return created_at.isoformat()[:10]
+    return str(created_at)[:10]
+
+
+def count_days(checkins: Iterable[Tuple[str, str]]) -> Dict[str, Counter]:
+    """{day: Counter of emotions} from (created_at, emotion) pairs, ignoring unknown emotions"""
+    days: Dict[str, Counter] = {}
+    for created_at, emotion in checkins:
+        if emotion in EMOTION_VALUES:
+            days.setdefault(day_of(created_at), Counter())[emotion] += 1
+    return days
+
+
+def daily_row(user_id: str, day: str, counts: Counter) -> Dict:
+    """emotion_daily row for one user's day"""
+    row = {'user_id': str(user_id), 'day': day}
+    row.update({emotion: counts.get(emotion, 0) for emotion in EMOTION_VALUES})
+    row['entries'] = sum(row[emotion] for emotion in EMOTION_VALUES)
+    row['value_sum'] = sum(row[emotion] * value for emotion, value in EMOTION_VALUES.items())
+    return row
+
+
+def day_point(row: Dict) -> Dict:
+    """Chart point for an emotion_daily row: the day's average and most common check-in"""
+    counts = {emotion: row.get(emotion) or 0 for emotion in EMOTION_VALUES}
+    entries = sum(counts.values())
+    return {
+        'date': day_of(row['day']),
+        # Ties go to the better emotion
+        'emotion': max(reversed(list(counts)), key=counts.get),
+        'value': round(row['value_sum'] / entries, 2),
+        'entries': entries
+    }
+
+
+class EmotionAnalytics:
+    """Heart Tracker data: check-in trends and daily aggregates"""
+
+    def __init__(self, table: str = EMOTION_DAILY_TABLE):
+        self.table = table
+
+    def _checkins(self, user_id, days_back: int, now: Optional[datetime] = None) -> List[Tuple[str, str]]:
+        """(created_at, emotion) of a user's entries in the last days_back days, oldest first"""
+        from database import get_supabase_client
+
+        from_date = ((now or datetime.utcnow()) - timedelta(days=days_back)).isoformat()
+        supabase = get_supabase_client()
+        result = supabase.table('journal_entries').select('created_at,emotion:prompt_responses->>emotion')\
+            .eq('user_id', str(user_id))\
+            .gte('created_at', from_date)\
+            .order('created_at', desc=False).execute()
+        return [(row['created_at'], row.get('emotion')) for row in result.data or []]
+
+    def trends(self, user_id, windows: Sequence[int] = (7, 30), now: Optional[datetime] = None) -> Dict[int, List[Dict]]:
+        """
+        Check-ins for each window of days, from a single query
+
+        Returns:
+            {days: [{'date', 'emotion', 'value'}, ...]} oldest first
+        """
+        now = now or datetime.utcnow()
+        try:
+            checkins = self._checkins(user_id, max(windows), now)
+        except Exception as e:
+            logger.error("Error getting emotion trends: %s", e)
+            return {days: [] for days in windows}
+
+        points = [(created_at, {'date': day_of(created_at), 'emotion': emotion, 'value': EMOTION_VALUES[emotion]})
+                  for created_at, emotion in checkins if emotion in EMOTION_VALUES]
+        trends = {}
+        for days in windows:
+            from_date = (now - timedelta(days=days)).isoformat()
+            trends[days] = [point for created_at, point in points if str(created_at) >= from_date]
+        return trends
+
+    def daily(self, user_id, days: int = 365, now: Optional[datetime] = None) -> List[Dict]:
+        """
+        One point per day with check-ins over the last `days` days
+
+        Returns:
+            [{'date', 'emotion', 'value', 'entries'}, ...] oldest first, where
+            value is the day's average and emotion its most common check-in
+        """
+        from database import get_supabase_client
+
+        now = now or datetime.utcnow()
+        from_day = (now - timedelta(days=days)).date().isoformat()
+        try:
+            supabase = get_supabase_client()
+            result = supabase.table(self.table).select('*')\
+                .eq('user_id', str(user_id))\
+                .gte('day', from_day)\
+                .order('day', desc=False).execute()
+            return [day_point(row) for row in result.data or [] if row.get('entries')]
+        except Exception as e:
+            logger.warning("Daily emotion aggregates unavailable, counting entries instead: %s", e)
+
+        try:
+            counted = count_days(self._checkins(user_id, days, now))
+        except Exception as e:
+            logger.error("Error getting daily emotions: %s", e)
+            return []
+        return [day_point(daily_row(user_id, day, counts))
+                for day, counts in sorted(counted.items()) if day >= from_day]
+
+    def record_entry(self, user_id, created_at) -> bool:
+        """
+        Recount the day of a saved entry and store its aggregate
+        Called when an entry's emotion changes; never raises, so a journal
+        save cannot fail on it.
+        """
+        from database import get_supabase_client
+
+        day = day_of(created_at or datetime.utcnow())
+        next_day = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+        try:
+            supabase = get_supabase_client()
+            result = supabase.table('journal_entries').select('created_at,emotion:prompt_responses->>emotion')\
+                .eq('user_id', str(user_id))\
+                .gte('created_at', day)\
+                .lt('created_at', next_day).execute()
+            counts = count_days((day, row.get('emotion')) for row in result.data or []).get(day, Counter())
+            if counts:
+                row = daily_row(user_id, day, counts)
+                row['updated_at'] = datetime.utcnow().isoformat()
+                supabase.table(self.table).upsert(row, on_conflict='user_id,day').execute()
+            else:
+                supabase.table(self.table).delete().eq('user_id', str(user_id)).eq('day', day).execute()
+            return True
+        except Exception as e:
+            logger.warning("Could not update daily emotions for %s on %s: %s", user_id, day, e)
+            return False
+
+
+# Global emotion analytics instance used by models and routes
+emotion_analytics = EmotionAnalytics()
@@ -0,0 +1,911 @@
+"""
+Local Supabase stand-in for Pray150 benchmarks
+A small PostgREST- and GoTrue-compatible HTTP server over in-memory tables,
+so the app can run end to end - through the real supabase client - without
+a Supabase project. It implements the subset of the REST API the app uses:
+select with column lists, eq/neq/gt/gte/lt/lte/in/is filters, order, limit,
+offset, exact counts, insert, update, upsert, delete and RPC calls, plus
+password sign-in and sign-up. Row level security is not emulated.
+
+The same tables also back MemoryClient, an in-process stand-in for the
+supabase client that database.get_supabase_client returns when
+SUPABASE_BACKEND=memory; seed_synthetic_data fills them with users and
+journal entries at scale (SUPABASE_MEMORY_SEED="users=100000,entries=2000000").
+
+Usage:
+    server = FakeSupabaseServer()
+    server.start()                # http://127.0.0.1:<port>
+    server.db.add_user('a@example.com', 'secret', first_name='A')
+    os.environ['SUPABASE_URL'] = server.url
+    os.environ['SUPABASE_KEY'] = FAKE_ANON_KEY
+"""
+
+import base64
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+from werkzeug.wrappers import Request, Response
+
+logger = logging.getLogger(__name__)
+
+# Columns with an equality index, per app table (every table is keyed on id)
+INDEXED_COLUMNS = {
+    'user_profiles': ('user_id', 'email'),
+    'psalms': ('psalm_number',),
+    'journal_entries': ('user_id', 'psalm_id'),
+    'prayer_lists': ('user_id',),
+    'markups': ('user_id', 'psalm_id'),
+    'psalm_progress': ('user_id',),
+    'emotion_daily': ('user_id',),
+}
+APP_TABLES = tuple(INDEXED_COLUMNS)
+
+FILTER_OPERATORS = ('eq', 'neq', 'gt', 'gte', 'lt', 'lte', 'in', 'is', 'like', 'ilike')
+
+
+def _b64(data: Dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b'=').decode()
+
+
+def fake_jwt(claims: Dict) -> str:
+    """Unsigned JWT-shaped token (the fake never verifies signatures)"""
+    return f"{_b64({'alg': 'HS256', 'typ': 'JWT'})}.{_b64(claims)}.fake-signature"
+
+
+def decode_fake_jwt(token: str) -> Dict:
+    payload = token.split('.')[1]
+    return json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+
+
+FAKE_ANON_KEY = fake_jwt({'role': 'anon', 'iss': 'fake-supabase'})
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def auth_user(user: Dict) -> Dict:
+    """GoTrue user object"""
+    return {
+        'id': user['id'],
+        'aud': 'authenticated',
+        'role': 'authenticated',
+        'email': user['email'],
+        'app_metadata': {'provider': 'email'},
+        'user_metadata': {},
+        'created_at': user['created_at'],
+    }
+
+
+def auth_session(user: Dict) -> Dict:
+    """GoTrue session (token grant / sign-up response)"""
+    expires_at = int(time.time()) + 3600
+    return {
+        'access_token': fake_jwt({'sub': user['id'], 'email': user['email'], 'role': 'authenticated',
+                                  'aud': 'authenticated', 'exp': expires_at}),
+        'refresh_token': uuid.uuid4().hex,
+        'token_type': 'bearer',
+        'expires_in': 3600,
+        'expires_at': expires_at,
+        'user': auth_user(user),
+    }
+
+
+class QueryError(Exception):
+    """PostgREST-style error, returned as JSON with an HTTP status"""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+def coerce(value, like):
+    """Convert a filter value from the query string to the type of a stored value"""
+    if not isinstance(value, str):
+        # Typed value from MemoryClient; PostgREST would compare a number
+        # with a text column as text
+        if isinstance(like, str) and isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        return value
+    if value == 'null':
+        return None
+    if isinstance(like, bool):
+        return value.lower() == 'true'
+    if isinstance(like, int):
+        try:
+            return int(value)
+        except ValueError:
+            return value
+    if isinstance(like, float):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _like(pattern: str, value, case_sensitive: bool) -> bool:
+    import fnmatch
+    if value is None:
+        return False
+    pattern = pattern.replace('%', '*').replace('_', '?')
+    value = str(value)
+    if not case_sensitive:
+        return fnmatch.fnmatch(value.lower(), pattern.lower())
+    return fnmatch.fnmatchcase(value, pattern)
+
+
+def matches(row: Dict, column: str, operator: str, value: str) -> bool:
+    """Whether a row passes one PostgREST filter"""
+    stored = row.get(column)
+    if operator == 'is':
+        if isinstance(value, str):
+            value = {'null': None, 'true': True, 'false': False}.get(value.lower(), value)
+        return stored is value
+    if operator == 'in':
+        if isinstance(value, str):
+            value = [item.strip().strip('"') for item in value.strip('()').split(',') if item.strip()]
+        return any(stored == coerce(option, stored) for option in value)
+    if operator == 'like':
+        return _like(value, stored, True)
+    if operator == 'ilike':
+        return _like(value, stored, False)
+
+    wanted = coerce(value, stored)
+    if operator == 'eq':
+        return stored == wanted
+    if operator == 'neq':
+        return stored != wanted
+    if stored is None or wanted is None:
+        return False
+    try:
+        if operator == 'gt':
+            return stored > wanted
+        if operator == 'gte':
+            return stored >= wanted
+        if operator == 'lt':
+            return stored < wanted
+        if operator == 'lte':
+            return stored <= wanted
+    except TypeError:
+        return str(stored) > str(wanted) if operator in ('gt', 'gte') else str(stored) < str(wanted)
+    return False
+
+
+def parse_filters(args: Iterable[Tuple[str, str]]) -> List[Tuple[str, str, str, bool]]:
+    """(column, operator, value, negated) for every filter query parameter"""
+    filters = []
+    for column, expression in args:
+        if column in ('select', 'order', 'limit', 'offset', 'on_conflict', 'columns'):
+            continue
+        negated = expression.startswith('not.')
+        if negated:
+            expression = expression[4:]
+        operator, _, value = expression.partition('.')
+        if operator not in FILTER_OPERATORS:
+            raise QueryError(400, 'PGRST100', f'unsupported filter operator "{operator}"')
+        filters.append((column, operator, value, negated))
+    return filters
+
+
+def parse_order(spec: Optional[str]) -> List[Tuple[str, bool]]:
+    """(column, descending) pairs from an order parameter"""
+    order = []
+    for item in (spec or '').split(','):
+        if item:
+            parts = item.split('.')
+            order.append((parts[0], 'desc' in parts[1:]))
+    return order
+
+
+def sort_key(value):
+    if value is None:
+        return (1, '', 0)
+    return (0, type(value).__name__, value)
+
+
+def copy_value(value):
+    """Copy of a JSON value, so callers never mutate stored rows"""
+    if isinstance(value, dict):
+        return {key: copy_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_value(item) for item in value]
+    return value
+
+
+_JSON_PATH_RE = re.compile(r'(->>?)')
+
+
+def column_value(row: Dict, expression: str):
+    """Value of a select expression: a column or a JSON path like prompt_responses->>emotion"""
+    parts = _JSON_PATH_RE.split(expression)
+    value = row.get(parts[0].strip())
+    for arrow, key in zip(parts[1::2], parts[2::2]):
+        value = value.get(key.strip().strip("'")) if isinstance(value, dict) else None
+        if arrow == '->>' and value is not None and not isinstance(value, str):
+            # ->> returns text, as Postgres renders the JSON value
+            value = json.dumps(value)
+    return value
+
+
+def project(row: Dict, columns: Optional[List[str]]) -> Dict:
+    if columns is None:
+        return {column: copy_value(value) for column, value in row.items()}
+    projected = {}
+    for column in columns:
+        alias, _, expression = column.rpartition(':')
+        # Unaliased JSON paths are named after their last key, as in PostgREST
+        name = alias.strip() or _JSON_PATH_RE.split(expression)[-1].strip().strip("'")
+        projected[name] = copy_value(column_value(row, expression.strip()))
+    return projected
+
+
+def parse_columns(select: Optional[str]) -> Optional[List[str]]:
+    if not select or select.strip() == '*':
+        return None
+    return [column.strip() for column in select.split(',') if column.strip()]
+
+
+class MemoryTable:
+    """Rows keyed by primary key, with equality indexes on selected columns"""
+
+    def __init__(self, name: str, primary_key: str = 'id', indexed: Iterable[str] = ()):
+        self.name = name
+        self.primary_key = primary_key
+        self.rows = {}   # primary key -> row, in insertion order
+        self.indexes = {column: {} for column in indexed}   # column -> value -> set of keys
+        self._next_id = 1
+
+    def insert(self, row: Dict) -> Dict:
+        row = dict(row)
+        if row.get(self.primary_key) is None:
+            row[self.primary_key] = self._next_id
+        if isinstance(row[self.primary_key], int):
+            self._next_id = max(self._next_id, row[self.primary_key] + 1)
+        if 'created_at' not in row:
+            row['created_at'] = utc_now()
+        key = row[self.primary_key]
+        if key in self.rows:
+            raise QueryError(409, '23505', f'duplicate key value violates unique constraint "{self.name}_pkey"')
+        self.rows[key] = row
+        for column, index in self.indexes.items():
+            index.setdefault(row.get(column), set()).add(key)
+        return row
+
+    def update_row(self, key, values: Dict) -> Dict:
+        row = self.rows[key]
+        for column, index in self.indexes.items():
+            if column in values and values[column] != row.get(column):
+                index.get(row.get(column), set()).discard(key)
+                index.setdefault(values[column], set()).add(key)
+        row.update(values)
+        return row
+
+    def delete_row(self, key) -> Dict:
+        row = self.rows.pop(key)
+        for column, index in self.indexes.items():
+            index.get(row.get(column), set()).discard(key)
+        return row
+
+    def find(self, filters) -> List[Dict]:
+        """Rows passing every filter; a primary key or indexed eq filter narrows the scan"""
+        candidates = None
+        for column, operator, value, negated in filters:
+            if operator != 'eq' or negated:
+                continue
+            if column == self.primary_key:
+                keys = {key for key in (value, coerce(value, 0)) if key in self.rows}
+            elif column in self.indexes:
+                keys = self._index_keys(self.indexes[column], value)
+            else:
+                continue
+            candidates = keys if candidates is None else candidates & keys
+
+        if candidates is None:
+            rows = self.rows.values()
+        else:
+            # Keys are sequential ints, so sorting restores insertion order
+            rows = [self.rows[key] for key in sorted(candidates, key=sort_key)]
+        return [row for row in rows
+                if all(matches(row, column, operator, value) != negated
+                       for column, operator, value, negated in filters)]
+
+    @staticmethod
+    def _index_keys(index: Dict, value) -> set:
+        keys = index.get(value)
+        if keys is None and isinstance(value, str):
+            # Query-string values of integer columns (psalm_id=eq.23)
+            try:
+                keys = index.get(int(value))
+            except ValueError:
+                pass
+        elif keys is None and isinstance(value, int) and not isinstance(value, bool):
+            keys = index.get(str(value))
+        return keys or set()
+
+
+class MemoryDatabase:
+    """In-memory tables, auth users and RPC functions behind the fake server"""
+
+    def __init__(self, tables: Iterable[str] = APP_TABLES):
+        self.tables = {}
+        self.users = {}       # email -> {'id', 'email', 'password', 'created_at'}
+        self.users_by_id = {}
+        self.functions = {}   # rpc name -> callable(db, params)
+        self.lock = threading.RLock()
+        for name in tables:
+            self.create_table(name)
+        self.functions['save_listening_progress'] = save_listening_progress
+
+    def create_table(self, name: str, primary_key: str = 'id', indexed: Iterable[str] = ()):
+        self.tables[name] = MemoryTable(name, primary_key, tuple(indexed) or INDEXED_COLUMNS.get(name, ()))
+        return self.tables[name]
+
+    def table(self, name: str) -> MemoryTable:
+        table = self.tables.get(name)
+        if table is None:
+            raise QueryError(404, '42P01', f'relation "public.{name}" does not exist')
+        return table
+
+    def create_auth_user(self, email: str, password: str, user_id: Optional[str] = None) -> Dict:
+        """Auth user only (what sign-up does); raises QueryError if the email is taken"""
+        with self.lock:
+            if email in self.users:
+                raise QueryError(422, 'user_already_exists', 'User already registered')
+            user = {'id': user_id or str(uuid.uuid4()), 'email': email, 'password': password,
+                    'created_at': utc_now()}
+            self.users[email] = user
+            self.users_by_id[user['id']] = user
+            return user
+
+    def add_user(self, email: str, password: str, user_id: Optional[str] = None, **profile) -> str:
+        """Create an auth user and their user_profiles row; returns the user id"""
+        with self.lock:
+            user_id = self.create_auth_user(email, password, user_id)['id']
+            self.table('user_profiles').insert(dict({
+                'user_id': user_id,
+                'email': email,
+                'username': email.split('@')[0],
+                'preferred_translation': 'NIV',
+                'font_preference': 'Georgia',
+                'theme_preference': 'default',
+            }, **profile))
+            return user_id
+
+    def select(self, name, filters, columns=None, order=(), limit=None, offset=0) -> Tuple[List[Dict], int]:
+        with self.lock:
+            rows = self.table(name).find(filters)
+            for column, descending in reversed(order):
+                # NULLs sort last ascending and first descending, as in Postgres
+                rows.sort(key=lambda row: sort_key(row.get(column)), reverse=descending)
+            total = len(rows)
+            rows = rows[offset:offset + limit if limit is not None else None]
+            return [project(row, columns) for row in rows], total
+
+    def insert(self, name, rows: List[Dict], on_conflict: Optional[str] = None) -> List[Dict]:
+        with self.lock:
+            table = self.table(name)
+            written = []
+            for row in rows:
+                existing = None
+                if on_conflict:
+                    existing = table.find([(column.strip(), 'eq', row.get(column.strip()), False)
+                                           for column in on_conflict.split(',')])
+                if existing:
+                    key = existing[0][table.primary_key]
+                    written.append(dict(table.update_row(key, row)))
+                else:
+                    written.append(dict(table.insert(row)))
+            return written
+
+    def update(self, name, filters, values: Dict) -> List[Dict]:
+        with self.lock:
+            table = self.table(name)
+            return [dict(table.update_row(row[table.primary_key], values)) for row in table.find(filters)]
+
+    def delete(self, name, filters) -> List[Dict]:
+        with self.lock:
+            table = self.table(name)
+            return [table.delete_row(row[table.primary_key]) for row in list(table.find(filters))]
+
+    def user_for_token(self, token: str) -> Optional[Dict]:
+        """Auth user an access token was issued to"""
+        try:
+            claims = decode_fake_jwt(token)
+        except (IndexError, ValueError):
+            return None
+        return self.users_by_id.get(claims.get('sub'))
+
+    def call(self, name: str, params: Dict):
+        function = self.functions.get(name)
+        if function is None:
+            raise QueryError(404, 'PGRST202', f'Could not find the function public.{name}')
+        with self.lock:
+            return function(self, params)
+
+
+def save_listening_progress(db: MemoryDatabase, params: Dict):
+    """Same behavior as the SQL function in create_listening_progress_function.py"""
+    for row in params.get('rows') or []:
+        values = {key: value for key, value in row.items() if key != 'user_id'}
+        db.update('user_profiles', [('user_id', 'eq', row['user_id'], False)], values)
+    return None
+
+
+class FakeSupabaseApp:
+    """WSGI app serving /rest/v1 (PostgREST) and /auth/v1 (GoTrue)"""
+
+    def __init__(self, db: MemoryDatabase, extra_routes: Optional[Dict[str, Callable]] = None):
+        self.db = db
+        self.extra_routes = extra_routes or {}   # path prefix -> WSGI-style handler(request) -> Response
+        self.requests = 0
+
+    def __call__(self, environ, start_response):
+        request = Request(environ)
+        self.requests += 1
+        try:
+            response = self.dispatch(request)
+        except QueryError as e:
+            response = self.json({'code': e.code, 'message': e.message, 'details': None, 'hint': None}, e.status)
+        return response(environ, start_response)
+
+    def dispatch(self, request: Request) -> Response:
+        path = request.path
+        for prefix, handler in self.extra_routes.items():
+            if path.startswith(prefix):
+                return handler(request)
+        if path.startswith('/rest/v1/rpc/'):
+            return self.rpc(request, path[len('/rest/v1/rpc/'):])
+        if path.startswith('/rest/v1/'):
+            return self.rest(request, path[len('/rest/v1/'):])
+        if path.startswith('/auth/v1/'):
+            return self.auth(request, path[len('/auth/v1/'):])
+        raise QueryError(404, 'PGRST000', f'unknown path {path}')
+
+    @staticmethod
+    def json(data, status: int = 200, headers: Optional[Dict] = None) -> Response:
+        return Response(json.dumps(data, default=str), status=status, headers=headers,
+                        mimetype='application/json')
+
+    def rest(self, request: Request, table: str) -> Response:
+        prefer = request.headers.get('Prefer', '')
+        filters = parse_filters(request.args.items(multi=True))
+        columns = parse_columns(request.args.get('select'))
+
+        if request.method in ('GET', 'HEAD'):
+            limit = request.args.get('limit', type=int)
+            offset = request.args.get('offset', 0, type=int)
+            rows, total = self.db.select(table, filters, columns, parse_order(request.args.get('order')),
+                                         limit, offset)
+            headers = {}
+            if 'count=exact' in prefer:
+                end = offset + len(rows) - 1
+                headers['Content-Range'] = f"{offset}-{end}/{total}" if rows else f"*/{total}"
+            return self.json(rows, 200, headers)
+
+        if request.method == 'POST':
+            body = request.get_json(silent=True)
+            rows = body if isinstance(body, list) else [body or {}]
+            on_conflict = request.args.get('on_conflict') if 'merge-duplicates' in prefer else None
+            written = self.db.insert(table, rows, on_conflict)
+            return self._written(written, prefer, columns, 201)
+
+        if request.method == 'PATCH':
+            written = self.db.update(table, filters, request.get_json(silent=True) or {})
+            return self._written(written, prefer, columns, 200)
+
+        if request.method == 'DELETE':
+            written = self.db.delete(table, filters)
+            return self._written(written, prefer, columns, 200)
+
+        raise QueryError(405, 'PGRST000', f'method {request.method} not allowed')
+
+    def _written(self, rows, prefer, columns, status) -> Response:
+        if 'return=minimal' in prefer:
+            return Response(status=204 if status == 200 else status)
+        return self.json([project(row, columns) for row in rows], status)
+
+    def rpc(self, request: Request, name: str) -> Response:
+        result = self.db.call(name, request.get_json(silent=True) or {})
+        return self.json(result)
+
+    def auth(self, request: Request, endpoint: str) -> Response:
+        body = request.get_json(silent=True) or {}
+        if endpoint == 'token' and request.args.get('grant_type') == 'password':
+            user = self.db.users.get(body.get('email'))
+            if user is None or user['password'] != body.get('password'):
+                return self.json({'error': 'invalid_grant', 'error_description': 'Invalid login credentials',
+                                  'code': 400, 'msg': 'Invalid login credentials'}, 400)
+            return self.json(auth_session(user))
+        if endpoint == 'signup':
+            try:
+                user = self.db.create_auth_user(body.get('email'), body.get('password'))
+            except QueryError as e:
+                return self.json({'code': e.status, 'msg': e.message}, e.status)
+            return self.json(auth_session(user))
+        if endpoint == 'user':
+            token = request.headers.get('Authorization', '').replace('Bearer ', '')
+            user = self.db.user_for_token(token)
+            if user is None:
+                return self.json({'code': 401, 'msg': 'invalid JWT'}, 401)
+            return self.json(auth_user(user))
+        if endpoint == 'logout':
+            return Response(status=204)
+        raise QueryError(404, 'PGRST000', f'unknown auth endpoint {endpoint}')
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class FakeSupabaseServer:
+    """Fake Supabase on a localhost port, served from a background thread"""
+
+    def __init__(self, db: Optional[MemoryDatabase] = None, host: str = '127.0.0.1', port: int = 0,
+                 extra_routes: Optional[Dict[str, Callable]] = None):
+        self.db = db or MemoryDatabase()
+        self.app = FakeSupabaseApp(self.db, extra_routes)
+        self._server = make_server(host, port, self.app, threaded=True, request_handler=_QuietRequestHandler)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self._server.host}:{self._server.port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-supabase', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class MemoryResponse:
+    """execute() result: rows in .data, exact row count in .count"""
+
+    def __init__(self, data, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+    def __repr__(self):
+        return f"MemoryResponse(data={self.data!r}, count={self.count!r})"
+
+
+class MemoryQuery:
+    """postgrest-py style query builder over one MemoryDatabase table"""
+
+    def __init__(self, db: MemoryDatabase, table: str):
+        self.db = db
+        self.table = table
+        self.method = 'select'
+        self.columns = None
+        self.count = None
+        self.filters = []
+        self.ordering = []
+        self.limit_rows = None
+        self.offset_rows = 0
+        self.values = None
+        self.on_conflict = None
+        self.single_row = None   # 'single' or 'maybe' when one row is expected
+
+    def select(self, *columns, count: Optional[str] = None, **kwargs):
+        self.columns = parse_columns(','.join(columns))
+        self.count = count
+        return self
+
+    def insert(self, json, count: Optional[str] = None, upsert: bool = False, **kwargs):
+        self.method = 'insert'
+        self.values = json if isinstance(json, list) else [json]
+        self.count = count
+        if upsert:
+            self.on_conflict = self.db.table(self.table).primary_key
+        return self
+
+    def upsert(self, json, count: Optional[str] = None, on_conflict: str = '', **kwargs):
+        self.insert(json, count)
+        self.on_conflict = on_conflict or self.db.table(self.table).primary_key
+        return self
+
+    def update(self, json, count: Optional[str] = None, **kwargs):
+        self.method = 'update'
+        self.values = json
+        self.count = count
+        return self
+
+    def delete(self, count: Optional[str] = None, **kwargs):
+        self.method = 'delete'
+        self.count = count
+        return self
+
+    def filter(self, column: str, operator: str, criteria):
+        negated = operator.startswith('not.')
+        operator = operator[4:] if negated else operator
+        if operator not in FILTER_OPERATORS:
+            raise QueryError(400, 'PGRST100', f'unsupported filter operator "{operator}"')
+        self.filters.append((column, operator, criteria, negated))
+        return self
+
+    def eq(self, column, value):
+        return self.filter(column, 'eq', value)
+
+    def neq(self, column, value):
+        return self.filter(column, 'neq', value)
+
+    def gt(self, column, value):
+        return self.filter(column, 'gt', value)
+
+    def gte(self, column, value):
+        return self.filter(column, 'gte', value)
+
+    def lt(self, column, value):
+        return self.filter(column, 'lt', value)
+
+    def lte(self, column, value):
+        return self.filter(column, 'lte', value)
+
+    def like(self, column, pattern):
+        return self.filter(column, 'like', pattern)
+
+    def ilike(self, column, pattern):
+        return self.filter(column, 'ilike', pattern)
+
+    def is_(self, column, value):
+        return self.filter(column, 'is', value)
+
+    def in_(self, column, values):
+        return self.filter(column, 'in', list(values))
+
+    def match(self, query: Dict):
+        for column, value in query.items():
+            self.eq(column, value)
+        return self
+
+    def order(self, column: str, desc: bool = False, **kwargs):
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, size: int, **kwargs):
+        self.limit_rows = size
+        return self
+
+    def offset(self, size: int, **kwargs):
+        self.offset_rows = size
+        return self
+
+    def range(self, start: int, end: int, **kwargs):
+        self.offset_rows = start
+        self.limit_rows = end - start + 1
+        return self
+
+    def single(self):
+        self.single_row = 'single'
+        return self
+
+    def maybe_single(self):
+        self.single_row = 'maybe'
+        return self
+
+    def execute(self) -> MemoryResponse:
+        count = None
+        if self.method == 'select':
+            rows, total = self.db.select(self.table, self.filters, self.columns, self.ordering,
+                                         self.limit_rows, self.offset_rows)
+            count = total if self.count else None
+        elif self.method == 'insert':
+            rows = self.db.insert(self.table, [copy_value(row) for row in self.values], self.on_conflict)
+        elif self.method == 'update':
+            rows = self.db.update(self.table, self.filters, copy_value(self.values))
+        else:
+            rows = self.db.delete(self.table, self.filters)
+
+        if self.method != 'select':
+            rows = [project(row, self.columns) for row in rows]
+            count = len(rows) if self.count else None
+        if self.single_row:
+            if len(rows) > 1 or (not rows and self.single_row == 'single'):
+                raise QueryError(406, 'PGRST116', 'JSON object requested, multiple (or no) rows returned')
+            rows = rows[0] if rows else None
+        return MemoryResponse(rows, count)
+
+
+class MemoryRPC:
+    """rpc() call, run on execute()"""
+
+    def __init__(self, db: MemoryDatabase, name: str, params: Optional[Dict]):
+        self.db = db
+        self.name = name
+        self.params = params or {}
+
+    def execute(self) -> MemoryResponse:
+        return MemoryResponse(self.db.call(self.name, copy_value(self.params)))
+
+
+def _namespace(value):
+    # Attribute access like the supabase_auth models (response.user.id)
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _namespace(item) for key, item in value.items()})
+    return value
+
+
+class MemoryAuth:
+    """The supabase.auth calls the app makes, against MemoryDatabase users"""
+
+    def __init__(self, db: MemoryDatabase):
+        self.db = db
+        self.session = None
+
+    def _signed_in(self, user: Dict):
+        session = auth_session(user)
+        self.session = session
+        return SimpleNamespace(user=_namespace(session['user']), session=_namespace(session))
+
+    def sign_in_with_password(self, credentials: Dict):
+        user = self.db.users.get(credentials.get('email'))
+        if user is None or user['password'] != credentials.get('password'):
+            raise QueryError(400, 'invalid_credentials', 'Invalid login credentials')
+        return self._signed_in(user)
+
+    def sign_up(self, credentials: Dict):
+        return self._signed_in(self.db.create_auth_user(credentials.get('email'), credentials.get('password')))
+
+    def set_session(self, access_token: str, refresh_token: str):
+        user = self.db.user_for_token(access_token)
+        if user is None:
+            raise QueryError(401, 'bad_jwt', 'invalid JWT')
+        return self._signed_in(user)
+
+    def get_user(self, jwt: Optional[str] = None):
+        token = jwt or (self.session or {}).get('access_token', '')
+        user = self.db.user_for_token(token)
+        return SimpleNamespace(user=_namespace(auth_user(user))) if user else None
+
+    def update_user(self, attributes: Dict):
+        user = self.db.user_for_token((self.session or {}).get('access_token', ''))
+        if user is None:
+            raise QueryError(401, 'session_not_found', 'Auth session missing!')
+        with self.db.lock:
+            if attributes.get('password'):
+                user['password'] = attributes['password']
+        return SimpleNamespace(user=_namespace(auth_user(user)))
+
+    def reset_password_for_email(self, email: str, options: Optional[Dict] = None):
+        return None
+
+    def sign_out(self, options: Optional[Dict] = None):
+        self.session = None
+
+
+class _MemoryPostgrest:
+    def auth(self, token: str):
+        # There is no row level security to bypass
+        return self
+
+
+class MemoryClient:
+    """In-process stand-in for supabase.Client over a MemoryDatabase"""
+
+    def __init__(self, db: MemoryDatabase):
+        self.db = db
+        self.auth = MemoryAuth(db)
+        self.postgrest = _MemoryPostgrest()
+
+    def table(self, name: str) -> MemoryQuery:
+        return MemoryQuery(self.db, name)
+
+    def from_(self, name: str) -> MemoryQuery:
+        return MemoryQuery(self.db, name)
+
+    def rpc(self, fn: str, params: Optional[Dict] = None, **kwargs) -> MemoryRPC:
+        return MemoryRPC(self.db, fn, params)
+
+
+def parse_seed(spec: Optional[str]) -> Dict[str, int]:
+    """Parse "users=100000,entries=2000000" (SUPABASE_MEMORY_SEED)"""
+    counts = {}
+    for item in (spec or '').split(','):
+        name, _, value = item.partition('=')
+        if name.strip() and value.strip():
+            counts[name.strip()] = int(value.strip().replace('_', ''))
+    return counts
+
+
+def seed_synthetic_data(db: MemoryDatabase, users: int = 1000, entries: int = 10000, prayers: int = 0,
+                        password: str = 'password', seed: int = 150) -> Dict[str, int]:
+    """
+    Deterministic synthetic data: the 150 psalms, `users` users
+    (user<N>@synthetic.pray150.local, all with `password`) and `entries`
+    journal entries and `prayers` prayer requests spread across them.
+    prompt_responses and timestamps come from small shared pools, which keeps
+    millions of rows to a few hundred bytes each - rows are copied on the way
+    out, so sharing is safe.
+    """
+    import random
+    from datetime import timedelta
+
+    rng = random.Random(seed)
+    with db.lock:
+        psalms = db.table('psalms')
+        for number in range(1, 151):
+            if not psalms.find([('psalm_number', 'eq', number, False)]):
+                psalms.insert({'psalm_number': number})
+
+        user_ids = []
+        for index in range(users):
+            user_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+            db.add_user(f"user{index}@synthetic.pray150.local", password, user_id=user_id,
+                        first_name=f"User{index}", last_name='Synthetic')
+            user_ids.append(user_id)
+        if not user_ids:
+            return {'users': 0, 'entries': 0, 'prayers': 0}
+
+        start = datetime.now(timezone.utc) - timedelta(days=365)
+        timestamps = [(start + timedelta(hours=hour)).isoformat() for hour in range(365 * 24)]
+        emotions = ('grateful', 'anxious', 'peaceful', 'weary', 'hopeful', 'joyful')
+        responses = [{
+            '1': f"Synthetic reflection {index} on trusting God",
+            '2': f"Prayer of response {index}",
+            'emotion': emotions[index % len(emotions)],
+            'completed': index % 5 != 0,
+        } for index in range(64)]
+
+        journal = db.table('journal_entries')
+        psalm_numbers = range(1, 151)
+        for index, (psalm_id, prompt_responses, created_at) in enumerate(zip(
+                rng.choices(psalm_numbers, k=entries), rng.choices(responses, k=entries),
+                rng.choices(timestamps, k=entries))):
+            journal.insert({
+                'user_id': user_ids[index % len(user_ids)],
+                'psalm_id': psalm_id,
+                'prompt_responses': prompt_responses,
+                'created_at': created_at,
+            })
+
+        prayer_lists = db.table('prayer_lists')
+        categories = ('family', 'friends', 'church', 'world', 'personal')
+        for index in range(prayers):
+            prayer_lists.insert({
+                'user_id': user_ids[index % len(user_ids)],
+                'category': categories[index % len(categories)],
+                'prayer_text': f"Synthetic prayer request {index}",
+                'is_answered': index % 7 == 0,
+                'created_at': rng.choice(timestamps),
+            })
+    return {'users': users, 'entries': entries, 'prayers': prayers}
+
+
+_memory_database = None
+_memory_database_lock = threading.Lock()
+
+
+def memory_database() -> MemoryDatabase:
+    """
+    Process-wide database behind SUPABASE_BACKEND=memory, seeded on first use
+    from SUPABASE_MEMORY_SEED (e.g. "users=100000,entries=2000000"). Each
+    process has its own copy, so run gunicorn with one worker.
+    """
+    global _memory_database
+    with _memory_database_lock:
+        if _memory_database is None:
+            db = MemoryDatabase()
+            counts = parse_seed(os.environ.get('SUPABASE_MEMORY_SEED'))
+            if counts:
+                started = time.perf_counter()
+                seed_synthetic_data(db, **counts)
+                logger.info("Seeded in-memory Supabase with %s in %.1fs", counts, time.perf_counter() - started)
+            _memory_database = db
+        return _memory_database
@@ -0,0 +1,38 @@
+"""
+Gunicorn configuration for Pray150
+Runs the Supabase startup checks once in the master process (STARTUP_CHECKS=
+preload) so that forked workers boot without any network I/O, and flushes
+write-behind buffers when a worker exits. Workers share Prometheus metrics
+through the METRICS_DIR directory (a fresh temporary one if unset).
+"""
+
+
+def on_starting(server):
+    from metrics import prepare_multiprocess_dir
+
+    prepare_multiprocess_dir()
+
+    from app import get_startup_mode, run_startup_checks
+
+    if get_startup_mode() == 'preload':
+        run_startup_checks()
+
+
+def post_fork(server, worker):
+    # Counters recorded by the master during startup checks are reported by
+    # the master itself, not once more by every worker
+    from metrics import registry
+
+    registry.reset()
+
+
+def worker_exit(server, worker):
+    # Write buffered listening progress before the worker goes away
+    from listening_buffer import listening_buffer
+
+    listening_buffer.flush()
+
+    # Keep the exiting worker's counters for /metrics
+    from metrics import registry
+
+    registry.dump()
@@ -0,0 +1,273 @@
+"""
+Per-request I/O accounting for Pray150
+Counts and times every Supabase query and upstream Bible API call made while
+handling a request, adds a Server-Timing header to the response and logs one
+summary line per request. Requests slower than SLOW_REQUEST_MS are logged as
+warnings with their full breakdown.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 0 disables the slow-request warning
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', '0'))
+
+# Server-Timing metric descriptions per call category
+CATEGORY_DESCRIPTIONS = {
+    'supabase': 'Supabase',
+    'rkeplin': 'Bible API',
+    'bolls': 'Bolls Bible API',
+    'api.bible': 'API.Bible',
+}
+
+
+class RequestStats:
+    """Call counts and durations of one request, per category"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.calls = {}     # category -> [count, total_ms, errors]
+        self.slowest = {}   # category -> (duration_ms, label)
+        self._lock = threading.Lock()
+
+    def add(self, category: str, duration_ms: float, label: str = '', error: bool = False):
+        with self._lock:
+            totals = self.calls.setdefault(category, [0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += duration_ms
+            totals[2] += int(error)
+            if duration_ms > self.slowest.get(category, (-1.0, ''))[0]:
+                self.slowest[category] = (duration_ms, label)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def summary(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                category: {'count': count, 'ms': round(total_ms, 1), 'errors': errors}
+                for category, (count, total_ms, errors) in sorted(self.calls.items())
+            }
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar('request_stats', default=None)
+_listeners: List[Callable] = []
+
+
+def current_stats() -> Optional[RequestStats]:
+    """Stats of the request being handled, or None outside a request"""
+    return _current_stats.get()
+
+
+def add_listener(callback: Callable):
+    """Call callback(category, duration_ms, error) for every recorded call"""
+    _listeners.append(callback)
+
+
+def record(category: str, duration_ms: float, label: str = '', error: bool = False):
+    """Record one completed call"""
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.add(category, duration_ms, label, error)
+    for callback in _listeners:
+        try:
+            callback(category, duration_ms, error)
+        except Exception as e:
+            logger.debug(f"Instrumentation listener failed: {e}")
+
+
+@contextmanager
+def track(category: str, label: str = ''):
+    """Time the enclosed call and record it; exceptions count as errors"""
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except Exception:
+        error = True
+        raise
+    finally:
+        record(category, (time.perf_counter() - started) * 1000, label, error)
+
+
+@contextmanager
+def tracked_request():
+    """Account for the calls made in the block (requests not served by Flask)"""
+    stats = RequestStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+class _TimedQuery:
+    """Supabase query builder whose execute() is recorded"""
+
+    def __init__(self, builder, label: str):
+        self._builder = builder
+        self._label = label
+
+    def execute(self, *args, **kwargs):
+        with track('supabase', self._label):
+            return self._builder.execute(*args, **kwargs)
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            # e.g. the .not_ property returns a builder as well
+            return _TimedQuery(attr, self._label) if hasattr(attr, 'execute') else attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            return _TimedQuery(result, self._label) if hasattr(result, 'execute') else result
+        return call
+
+
+class _TimedCalls:
+    """Proxy recording every method call (Supabase auth API)"""
+
+    def __init__(self, target, label: str):
+        self._target = target
+        self._label = label
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            # auth.admin is itself an API object
+            return _TimedCalls(attr, f"{self._label}.{name}") if hasattr(attr, '__dict__') else attr
+
+        def call(*args, **kwargs):
+            with track('supabase', f"{self._label}.{name}"):
+                return attr(*args, **kwargs)
+        return call
+
+
+class InstrumentedSupabase:
+    """Supabase client wrapper recording table queries, RPCs and auth calls"""
+
+    def __init__(self, client):
+        self._client = client
+
+    @property
+    def client(self):
+        """The wrapped supabase Client"""
+        return self._client
+
+    def table(self, name: str):
+        return _TimedQuery(self._client.table(name), name)
+
+    def from_(self, name: str):
+        return _TimedQuery(self._client.from_(name), name)
+
+    def rpc(self, fn: str, *args, **kwargs):
+        return _TimedQuery(self._client.rpc(fn, *args, **kwargs), f"rpc:{fn}")
+
+    @property
+    def auth(self):
+        return _TimedCalls(self._client.auth, 'auth')
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def instrument_supabase(client) -> InstrumentedSupabase:
+    """Wrap a supabase Client so its calls are counted per request"""
+    if isinstance(client, InstrumentedSupabase):
+        return client
+    return InstrumentedSupabase(client)
+
+
+def server_timing_header(stats: RequestStats, total_ms: float) -> str:
+    """Server-Timing value with one metric per category plus the total"""
+    metrics = []
+    for category, totals in stats.summary().items():
+        name = category.replace('.', '-')
+        description = f"{CATEGORY_DESCRIPTIONS.get(category, category)} ({totals['count']})"
+        metrics.append(f'{name};desc="{description}";dur={totals["ms"]:.1f}')
+    metrics.append(f'total;dur={total_ms:.1f}')
+    return ', '.join(metrics)
+
+
+def summary_line(method: str, path: str, endpoint: Optional[str], status: int,
+                 stats: RequestStats, total_ms: float) -> str:
+    """One key=value log line describing a finished request"""
+    parts = [f"method={method}", f"path={path}", f"endpoint={endpoint or '-'}",
+             f"status={status}", f"duration_ms={total_ms:.1f}"]
+    for category, totals in stats.summary().items():
+        parts.append(f"{category}_calls={totals['count']}")
+        parts.append(f"{category}_ms={totals['ms']:.1f}")
+        if totals['errors']:
+            parts.append(f"{category}_errors={totals['errors']}")
+    return 'request ' + ' '.join(parts)
+
+
+class RequestInstrumentation:
+    """Flask extension that accounts for the I/O of every request"""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SERVER_TIMING_ENABLED', True)
+        app.config.setdefault('SLOW_REQUEST_MS', SLOW_REQUEST_MS)
+
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+
+    def before_request(self):
+        from flask import g
+        g._request_stats_token = _current_stats.set(RequestStats())
+
+    def after_request(self, response):
+        from flask import current_app, request
+
+        stats = _current_stats.get()
+        if stats is None:
+            return response
+        total_ms = stats.elapsed_ms()
+        config = current_app.config
+
+        if config['SERVER_TIMING_ENABLED']:
+            response.headers['Server-Timing'] = server_timing_header(stats, total_ms)
+
+        # Static files would drown out the interesting lines
+        level = logging.DEBUG if request.endpoint == 'static' else logging.INFO
+        slow_ms = config['SLOW_REQUEST_MS']
+        if slow_ms and total_ms >= slow_ms:
+            level = logging.WARNING
+        if logger.isEnabledFor(level):
+            line = summary_line(request.method, request.path, request.endpoint,
+                                response.status_code, stats, total_ms)
+            if level == logging.WARNING:
+                slowest = ', '.join(f"{category}={ms:.1f}ms {label}"
+                                    for category, (ms, label) in sorted(stats.slowest.items()))
+                line = f"slow {line} slowest=[{slowest}]"
+            # Fields for LOG_FORMAT=json (see logging_config.py)
+            fields = {'event': 'request', 'endpoint': request.endpoint, 'status': response.status_code,
+                      'duration_ms': round(total_ms, 1), 'calls': stats.summary()}
+            logger.log(level, line, extra=fields)
+        return response
+
+    def teardown_request(self, exc=None):
+        from flask import g
+        token = g.pop('_request_stats_token', None)
+        if token is not None:
+            try:
+                _current_stats.reset(token)
+            except ValueError:
+                # Token from another context (e.g. a copied test request context)
+                _current_stats.set(None)
+
+
+# Global instrumentation instance used by app.create_app
+instrumentation = RequestInstrumentation()
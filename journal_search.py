@@ -0,0 +1,75 @@
+"""
+Journal search helpers for Pray150
+Snippet rendering for results of the search_journal_entries() Postgres
+function (see create_journal_search_index.py), and an in-app fallback used
+while that function is not installed.
+"""
+
+import html
+import re
+
+from markupsafe import Markup, escape
+
+# Highlight delimiters emitted by ts_headline (StartSel / StopSel)
+HIGHLIGHT_START = '\x01'
+HIGHLIGHT_STOP = '\x02'
+
+SNIPPET_CONTEXT_CHARS = 90
+
+_TAG_RE = re.compile(r'<[^>]*>')
+_WORD_RE = re.compile(r'\w+')
+
+
+def entry_text(prompt_responses):
+    """Plain text of the four prompt responses, HTML tags removed"""
+    parts = [str(prompt_responses.get(key) or '') for key in ('1', '2', '3', '4')]
+    text = _TAG_RE.sub(' ', ' '.join(parts))
+    return re.sub(r'\s+', ' ', html.unescape(text)).strip()
+
+
+def render_snippet(raw):
+    """Escape a delimited snippet and turn the highlight delimiters into <mark>"""
+    if not raw:
+        return Markup('')
+    escaped = str(escape(raw))
+    return Markup(escaped.replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_STOP, '</mark>'))
+
+
+def query_terms(query):
+    """Lowercased words of a search query (quotes and operators ignored)"""
+    return [term for term in _WORD_RE.findall(query.lower()) if term != 'or']
+
+
+def build_snippet(text, terms):
+    """Delimited snippet around the first match with every term occurrence marked"""
+    lowered = text.lower()
+    first = min((lowered.find(term) for term in terms if term in lowered), default=0)
+    start = max(0, first - SNIPPET_CONTEXT_CHARS // 2)
+    end = min(len(text), first + SNIPPET_CONTEXT_CHARS * 2)
+    window = text[start:end]
+
+    pattern = re.compile('|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.I)
+    window = pattern.sub(lambda m: f"{HIGHLIGHT_START}{m.group(0)}{HIGHLIGHT_STOP}", window)
+    return ('… ' if start else '') + window + (' …' if end < len(text) else '')
+
+
+def search_entries(entries, query):
+    """
+    Rank entries that contain every query term by number of occurrences
+    Returns [(entry, rank, raw_snippet)], best first and newest first on ties.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+
+    matches = []
+    for entry in entries:
+        text = entry_text(entry.prompt_responses or {})
+        lowered = text.lower()
+        if all(term in lowered for term in terms):
+            rank = sum(lowered.count(term) for term in terms)
+            matches.append((entry, rank, build_snippet(text, terms)))
+
+    matches.sort(key=lambda match: str(match[0].created_at or ''), reverse=True)
+    matches.sort(key=lambda match: match[1], reverse=True)
+    return matches
@@ -0,0 +1,70 @@
+"""
+Fast JSON provider for Pray150
+Plugs orjson into Flask's JSON layer so every jsonify() response (psalm
+translations, admin exports, playlists, markup lists) is serialized by a
+native encoder. Output matches Flask's default provider (sorted keys, dates in
+HTTP date format, dataclasses as dicts) except that non-ASCII text is written
+as UTF-8 instead of \\u escapes; model objects are encoded via their to_dict().
+Falls back to the stdlib provider when orjson is not installed or cannot encode
+a value (e.g. integers beyond 64 bits).
+"""
+
+import logging
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # declared in pyproject.toml; without it the stdlib provider is used
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    @staticmethod
+    def default(o):
+        # Model objects from models.py (User, Psalm, JournalEntry, ...)
+        to_dict = getattr(o, 'to_dict', None)
+        if callable(to_dict):
+            return to_dict()
+        return DefaultJSONProvider.default(o)
+
+    def _options(self, indent=False):
+        # Datetimes are passed through to default() so they are encoded exactly
+        # as Flask's default provider encodes them
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps_bytes(self, obj, indent=False):
+        """Serialize obj to UTF-8 JSON bytes"""
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._options(indent))
+            except TypeError as e:
+                logger.debug("orjson could not encode value, using stdlib encoder: %s", e)
+        kwargs = {'indent': 2} if indent else {'separators': (',', ':')}
+        return super().dumps(obj, **kwargs).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(
+            self.dumps_bytes(obj, indent=indent) + b"\n", mimetype=self.mimetype
+        )
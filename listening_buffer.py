@@ -0,0 +1,137 @@
+"""
+Write-behind buffer for listening progress
+The listen page reports its playback position every few seconds, but only
+the latest position per user matters. Heartbeats are kept in memory and
+flushed to user_profiles in coalesced batches on an interval, when many users
+are pending, and at interpreter shutdown. Reads are served from the buffer
+first, so a user always resumes from their latest heartbeat in this process;
+once a row is flushed it is dropped and the stored row is authoritative.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = float(os.environ.get('LISTENING_FLUSH_SECONDS', '30'))
+FLUSH_MAX_PENDING = int(os.environ.get('LISTENING_FLUSH_MAX_PENDING', '500'))
+
+
+class ListeningProgressBuffer:
+    """Latest listening position per user, flushed to Supabase in bulk"""
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL_SECONDS, max_pending=FLUSH_MAX_PENDING, writer=None):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._writer = writer   # callable(rows) -> user ids written
+        self._latest = {}       # user_id -> latest progress row until it is flushed
+        self._pending = set()   # user_ids with unflushed progress
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self.flushes = 0
+        self.rows_written = 0
+
+    def record(self, user_id, psalm_number, position_seconds) -> Dict:
+        """Buffer a heartbeat; older unflushed positions for the user are replaced"""
+        row = {
+            'user_id': str(user_id),
+            'listen_current_psalm': psalm_number,
+            'listen_current_position': position_seconds,
+            'listen_last_updated': datetime.utcnow().isoformat()
+        }
+        with self._lock:
+            self._latest[row['user_id']] = row
+            self._pending.add(row['user_id'])
+            pending = len(self._pending)
+
+        self._ensure_flusher()
+        if pending >= self.max_pending:
+            self._wakeup.set()
+        return row
+
+    def get(self, user_id) -> Optional[Dict]:
+        """Latest unflushed progress for a user, or None to read the stored row"""
+        with self._lock:
+            row = self._latest.get(str(user_id))
+            return dict(row) if row else None
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Write all pending rows in one batch; returns the number written"""
+        with self._flush_lock:
+            with self._lock:
+                batch = {user_id: self._latest[user_id] for user_id in self._pending}
+                self._pending.clear()
+            rows = [dict(row) for row in batch.values()]
+            if not rows:
+                return 0
+
+            writer = self._writer or _write_rows
+            try:
+                written = set(writer(rows))
+            except Exception as e:
+                logger.error(f"Listening progress flush failed: {e}")
+                written = set()
+
+            failed = [row['user_id'] for row in rows if row['user_id'] not in written]
+            with self._lock:
+                # Retried on the next flush (with any newer position recorded meanwhile)
+                self._pending.update(failed)
+                for user_id in written:
+                    # Forget flushed rows unless a newer heartbeat arrived meanwhile
+                    if self._latest.get(user_id) is batch.get(user_id) and user_id not in self._pending:
+                        del self._latest[user_id]
+
+            self.flushes += 1
+            self.rows_written += len(written)
+            logger.debug(f"Flushed listening progress for {len(written)}/{len(rows)} users")
+            return len(written)
+
+    def _ensure_flusher(self):
+        # Started lazily (and again after a fork) so it runs in each worker
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='listening-progress-flush', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+def is_newer(buffered_at, stored_at) -> bool:
+    """Whether a buffered timestamp is at least as recent as the stored one"""
+    if not stored_at:
+        return True
+    try:
+        stored = datetime.fromisoformat(str(stored_at).replace('Z', '+00:00')).replace(tzinfo=None)
+        return datetime.fromisoformat(buffered_at) >= stored
+    except ValueError:
+        return True
+
+
+def _write_rows(rows):
+    """Write rows with User.save_listening_progress_batch; returns written user ids"""
+    from models import User
+    return User.save_listening_progress_batch(rows)
+
+
+# Global buffer instance used by models.User
+listening_buffer = ListeningProgressBuffer()
+atexit.register(listening_buffer.flush)
@@ -0,0 +1,114 @@
+"""
+Logging setup for Pray150
+Configures the root logger from the environment:
+  LOG_LEVEL       - default level (INFO); DEBUG diagnostics cost only a level
+                    check when disabled, as messages are formatted lazily
+  LOG_LEVELS      - per-module overrides, e.g. "models=DEBUG,routes=DEBUG"
+  LOG_FORMAT      - "text" (default) or "json", one object per line
+  LOG_SAMPLE_EVERY - keep 1 in N records logged with extra={'sample': key},
+                    counted per key (default 10), for high-frequency events
+                    such as journal autosaves
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - the stdlib encoder is used instead
+    orjson = None
+
+# Chatty HTTP client libraries stay quiet unless LOG_LEVELS says otherwise
+DEFAULT_LEVELS = {
+    'httpx': 'WARNING',
+    'httpcore': 'WARNING',
+    'hpack': 'WARNING',
+    'urllib3': 'WARNING',
+}
+
+TEXT_FORMAT = '%(levelname)s:%(name)s:%(message)s'
+
+# Attributes every LogRecord has; anything else was passed with extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+def parse_levels(spec: Optional[str]) -> Dict[str, str]:
+    """Parse "module=LEVEL,..." into a dict (malformed items are ignored)"""
+    levels = {}
+    for item in (spec or '').split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, including fields passed with extra={...}"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        if orjson is not None:
+            try:
+                return orjson.dumps(entry, default=str).decode()
+            except TypeError:
+                pass
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Pass 1 in `every` records per sample key; unkeyed records always pass"""
+
+    def __init__(self, every: int = 10):
+        super().__init__()
+        self.every = max(1, every)
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, 'sample', None)
+        if key is None:
+            return True
+        with self._lock:
+            seen = self._seen.get(key, 0)
+            self._seen[key] = seen + 1
+        if seen % self.every:
+            return False
+        record.sampled_every = self.every
+        return True
+
+
+def configure_logging(level: Optional[str] = None, levels: Optional[str] = None,
+                      fmt: Optional[str] = None, stream=None) -> logging.Handler:
+    """Install the Pray150 handler on the root logger (replacing earlier ones)"""
+    level = (level or os.environ.get('LOG_LEVEL') or 'INFO').upper()
+    levels = levels if levels is not None else os.environ.get('LOG_LEVELS')
+    fmt = (fmt or os.environ.get('LOG_FORMAT') or 'text').lower()
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JSONFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT))
+    handler.addFilter(SamplingFilter(int(os.environ.get('LOG_SAMPLE_EVERY', '10'))))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    for name, module_level in {**DEFAULT_LEVELS, **parse_levels(levels)}.items():
+        logging.getLogger(name).setLevel(module_level)
+    return handler
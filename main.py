@@ -1,4 +1,7 @@
-from app import app
+from app import app, get_startup_mode, run_startup_checks
 
 if __name__ == '__main__':
+    # The development server has no gunicorn preload hook - run the checks here
+    if get_startup_mode() == 'preload':
+        run_startup_checks()
     app.run(host='0.0.0.0', port=5000, debug=True)
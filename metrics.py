@@ -0,0 +1,417 @@
+"""
+Prometheus metrics for Pray150
+Request latency per Flask endpoint, upstream Bible provider latency and
+errors, Supabase query counts, scripture cache hits and journal autosave
+rates, served in the Prometheus text format from /metrics.
+
+Every gunicorn worker keeps its own counters and periodically writes them to
+METRICS_DIR/metrics_<pid>.json; /metrics adds up the files of all workers,
+so the numbers are the same whichever worker answers the scrape. Without
+METRICS_DIR (development server) only the current process is reported.
+"""
+
+import atexit
+import glob
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from instrumentation import add_listener
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', '10'))
+
+# Seconds; covers fast JSON endpoints up to slow upstream-bound pages
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# name -> (type, help)
+METRICS = {
+    'pray150_http_requests_total':
+        ('counter', 'HTTP requests by endpoint, method and status class'),
+    'pray150_http_request_duration_seconds':
+        ('histogram', 'HTTP request latency by endpoint'),
+    'pray150_upstream_request_duration_seconds':
+        ('histogram', 'Bible provider request latency by provider'),
+    'pray150_upstream_errors_total':
+        ('counter', 'Bible provider requests that failed or returned 5xx'),
+    'pray150_upstream_circuit_open':
+        ('gauge', 'Workers whose circuit for the provider is open or half-open'),
+    'pray150_upstream_circuit_opened_total':
+        ('counter', 'Times a provider circuit opened'),
+    'pray150_upstream_rejected_total':
+        ('counter', 'Provider calls failed fast by an open circuit'),
+    'pray150_provider_hedged_total':
+        ('counter', 'Scripture fetches that sent a hedged request to a second provider'),
+    'pray150_provider_fallbacks_total':
+        ('counter', 'Scripture fetches that fell back to another provider after a failure'),
+    'pray150_provider_wins_total':
+        ('counter', 'Scripture fetches answered, by the provider whose response was used'),
+    'pray150_supabase_queries_total':
+        ('counter', 'Supabase queries, RPCs and auth calls'),
+    'pray150_supabase_query_duration_seconds':
+        ('histogram', 'Supabase call latency'),
+    'pray150_supabase_errors_total':
+        ('counter', 'Supabase calls that raised'),
+    'pray150_cache_hits_total':
+        ('counter', 'In-process cache hits by cache'),
+    'pray150_cache_misses_total':
+        ('counter', 'In-process cache misses by cache'),
+    'pray150_cache_stale_hits_total':
+        ('counter', 'Stale scripture served while refreshed in the background (included in hits)'),
+    'pray150_cache_refreshes_total':
+        ('counter', 'Background scripture cache refreshes by result'),
+    'pray150_scripture_fetches_total':
+        ('counter', 'Scripture cache misses by outcome: fetched upstream, coalesced onto a fetch in flight, '
+                    'or read from the shared tier'),
+    'pray150_journal_saves_total':
+        ('counter', 'Journal saves (autosave and completion) by action and result'),
+    'pray150_listening_progress_rows_written_total':
+        ('counter', 'Listening progress rows written by buffer flushes'),
+    'pray150_listening_progress_flushes_total':
+        ('counter', 'Listening progress buffer flushes'),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Optional[Dict[str, str]]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in (labels or {}).items()))
+
+
+class MetricsRegistry:
+    """Counters and histograms of one process, shared across processes via files"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS, flush_interval=FLUSH_INTERVAL_SECONDS):
+        self.buckets = tuple(buckets)
+        self.flush_interval = flush_interval
+        self._counters = {}     # (name, labels) -> value
+        self._histograms = {}   # (name, labels) -> [per-bucket counts..., +Inf count, sum]
+        self._collectors = []   # callables yielding (name, labels, value) counter samples
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1):
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._ensure_flusher()
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        key = (name, _labels(labels))
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+        self._ensure_flusher()
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, Dict, float]]]):
+        """Register a callable reporting cumulative counters (read at snapshot time)"""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> Dict:
+        """JSON-serializable state of this process"""
+        counters = {}
+        for collector in self._collectors:
+            try:
+                for name, labels, value in collector():
+                    counters[(name, _labels(labels))] = value
+            except Exception as e:
+                logger.debug(f"Metrics collector failed: {e}")
+        with self._lock:
+            counters.update(self._counters)
+            histograms = {key: list(series) for key, series in self._histograms.items()}
+        return {
+            'buckets': list(self.buckets),
+            'counters': [[name, list(labels), value] for (name, labels), value in counters.items()],
+            'histograms': [[name, list(labels), series] for (name, labels), series in histograms.items()],
+        }
+
+    def dump(self, directory: Optional[str] = None):
+        """Write this process's snapshot to its file in the metrics directory"""
+        directory = directory or metrics_dir()
+        if not directory:
+            return
+        path = os.path.join(directory, f'metrics_{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, path)   # readers never see a partial file
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {directory}: {e}")
+
+    def collect(self, directory: Optional[str] = None) -> List[Dict]:
+        """Snapshots of all processes: the live one plus the files of the others"""
+        directory = directory or metrics_dir()
+        snapshots = [self.snapshot()]
+        if directory:
+            own_file = os.path.join(directory, f'metrics_{os.getpid()}.json')
+            for path in sorted(glob.glob(os.path.join(directory, 'metrics_*.json'))):
+                if path == own_file:
+                    continue
+                try:
+                    with open(path) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError) as e:
+                    logger.debug(f"Skipping metrics file {path}: {e}")
+        return snapshots
+
+    def render(self, directory: Optional[str] = None) -> str:
+        """Prometheus text exposition of the summed snapshots"""
+        return render_snapshots(self.collect(directory), self.buckets)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def _ensure_flusher(self):
+        # Started lazily (and again after a fork) so it runs in each worker
+        if self._pid == os.getpid() or not metrics_dir():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='metrics-flush', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.dump()
+
+
+def render_snapshots(snapshots: List[Dict], buckets=LATENCY_BUCKETS) -> str:
+    """Sum per-process snapshots and format them for Prometheus"""
+    counters = {}
+    histograms = {}
+    for snapshot in snapshots:
+        if tuple(snapshot.get('buckets', buckets)) != tuple(buckets):
+            continue   # written by a different deploy
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, series in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            total = histograms.setdefault(key, [0] * len(series))
+            for index, value in enumerate(series):
+                total[index] += value
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        samples = sorted((labels, value) for (metric, labels), value in counters.items() if metric == name)
+        series = sorted((labels, value) for (metric, labels), value in histograms.items() if metric == name)
+        if not samples and not series:
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        for labels, values in series:
+            cumulative = 0
+            for bound, count in zip(list(buckets) + ['+Inf'], values[:-1]):
+                cumulative += count
+                le = bound if bound == '+Inf' else _format_value(bound)
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", le),))} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(values[-1])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+def metrics_dir() -> Optional[str]:
+    """Directory shared by all workers, or None for single-process mode"""
+    return os.environ.get('METRICS_DIR') or None
+
+
+def prepare_multiprocess_dir():
+    """
+    Create (or empty) the shared metrics directory before workers fork
+    Called from the gunicorn on_starting hook; counters restart with the server.
+    """
+    directory = metrics_dir()
+    if directory is None:
+        directory = tempfile.mkdtemp(prefix='pray150-metrics-')
+        os.environ['METRICS_DIR'] = directory
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, 'metrics_*.json*')):
+        os.remove(path)
+    return directory
+
+
+def record_instrumented_call(category: str, duration_ms: float, error: bool):
+    """instrumentation listener: Supabase and Bible provider calls"""
+    seconds = duration_ms / 1000
+    if category == 'supabase':
+        registry.inc('pray150_supabase_queries_total')
+        registry.observe('pray150_supabase_query_duration_seconds', seconds)
+        if error:
+            registry.inc('pray150_supabase_errors_total')
+    else:
+        registry.observe('pray150_upstream_request_duration_seconds', seconds, {'provider': category})
+        if error:
+            registry.inc('pray150_upstream_errors_total', {'provider': category})
+
+
+def _cache_samples(name: str, hits: int, misses: int):
+    labels = {'cache': name}
+    return [('pray150_cache_hits_total', labels, hits), ('pray150_cache_misses_total', labels, misses)]
+
+
+def _cache_refresh_samples(name: str, stats: Dict[str, int]):
+    labels = {'cache': name}
+    return [('pray150_cache_stale_hits_total', labels, stats['stale_hits']),
+            ('pray150_cache_refreshes_total', dict(labels, result='ok'),
+             stats['refreshes'] - stats['refresh_failures']),
+            ('pray150_cache_refreshes_total', dict(labels, result='failed'), stats['refresh_failures'])]
+
+
+def collect_cache_stats():
+    """Hit/miss counters of the scripture and response caches that are loaded"""
+    # Only modules that are already imported - scraping must not load clients
+    samples = []
+    bible_api = sys.modules.get('bible_api')
+    if bible_api is not None:
+        stats = bible_api.bible_api.cache.stats
+        samples += _cache_samples('scripture', stats['hits'] + stats['stale_hits'], stats['misses'])
+        samples += _cache_refresh_samples('scripture', stats)
+    bolls = sys.modules.get('bolls_bible_api')
+    if bolls is not None:
+        stats = bolls.bolls_api.cache.stats
+        samples += _cache_samples('original_language', stats['hits'] + stats['stale_hits'], stats['misses'])
+        samples += _cache_refresh_samples('original_language', stats)
+    compression = sys.modules.get('compression')
+    if compression is not None:
+        variants = compression.compress.variants
+        samples += _cache_samples('compressed_responses', variants.hits, variants.misses)
+    return samples
+
+
+def collect_scripture_fetches():
+    singleflight = sys.modules.get('singleflight')
+    if singleflight is None:
+        return []
+    stats = singleflight.scripture_flight.stats
+    return [('pray150_scripture_fetches_total', {'outcome': 'fetched'}, stats['calls']),
+            ('pray150_scripture_fetches_total', {'outcome': 'coalesced'}, stats['coalesced']),
+            ('pray150_scripture_fetches_total', {'outcome': 'shared'}, stats['shared_hits'])]
+
+
+def collect_upstream_circuits():
+    upstream = sys.modules.get('upstream')
+    if upstream is None:
+        return []
+    samples = []
+    for provider, breaker in upstream.breakers().items():
+        labels = {'provider': provider}
+        samples += [('pray150_upstream_circuit_open', labels, int(breaker.state != breaker.CLOSED)),
+                    ('pray150_upstream_circuit_opened_total', labels, breaker.stats['opened']),
+                    ('pray150_upstream_rejected_total', labels, breaker.stats['rejected'])]
+    return samples
+
+
+def collect_provider_routing():
+    bible_api = sys.modules.get('bible_api')
+    if bible_api is None:
+        return []
+    stats = bible_api.bible_api.router.stats
+    samples = [('pray150_provider_hedged_total', {}, stats['hedged']),
+               ('pray150_provider_fallbacks_total', {}, stats['fallbacks'])]
+    samples += [('pray150_provider_wins_total', {'provider': provider}, wins)
+                for provider, wins in stats['wins'].items()]
+    return samples
+
+
+def collect_listening_buffer():
+    listening_buffer = sys.modules.get('listening_buffer')
+    if listening_buffer is None:
+        return []
+    buffer = listening_buffer.listening_buffer
+    return [('pray150_listening_progress_rows_written_total', {}, buffer.rows_written),
+            ('pray150_listening_progress_flushes_total', {}, buffer.flushes)]
+
+
+class PrometheusMetrics:
+    """Flask extension recording request latency and serving /metrics"""
+
+    def __init__(self, registry, app=None):
+        self.registry = registry
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_ENABLED', True)
+        app.config.setdefault('METRICS_TOKEN', os.environ.get('METRICS_TOKEN'))
+        if not app.config['METRICS_ENABLED']:
+            return
+
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+    def before_request(self):
+        from flask import g
+        g._metrics_started = time.perf_counter()
+
+    def after_request(self, response):
+        from flask import g, request
+
+        started = g.pop('_metrics_started', None)
+        endpoint = request.endpoint or 'unmatched'
+        if started is None or endpoint in ('static', 'metrics'):
+            return response
+        labels = {'endpoint': endpoint, 'method': request.method}
+        self.registry.observe('pray150_http_request_duration_seconds', time.perf_counter() - started, labels)
+        labels['status'] = f'{response.status_code // 100}xx'
+        self.registry.inc('pray150_http_requests_total', labels)
+        return response
+
+    def metrics_view(self):
+        from flask import Response, current_app, request
+
+        token = current_app.config['METRICS_TOKEN']
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        return Response(self.registry.render(), mimetype='text/plain; version=0.0.4')
+
+
+# Global registry and extension used by app.create_app and routes
+registry = MetricsRegistry()
+add_listener(record_instrumented_call)
+registry.add_collector(collect_cache_stats)
+registry.add_collector(collect_scripture_fetches)
+registry.add_collector(collect_upstream_circuits)
+registry.add_collector(collect_provider_routing)
+registry.add_collector(collect_listening_buffer)
+prometheus = PrometheusMetrics(registry)
+atexit.register(registry.dump)
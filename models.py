@@ -1,11 +1,14 @@
 """
 Supabase-based models for Pray150 app
 """
+import logging
 from flask_login import UserMixin
 from datetime import datetime
 from database import get_supabase_client
 import uuid
 
+logger = logging.getLogger(__name__)
+
 class User(UserMixin):
     def __init__(self, id=None, username=None, email=None, first_name=None, last_name=None,
                  country=None, zip_code=None, preferred_translation='NIV', 
@@ -26,6 +29,25 @@ class User(UserMixin):
         self.listen_current_position = listen_current_position
         self.listen_last_updated = listen_last_updated
         self.created_at = created_at or datetime.utcnow()
+
+    def to_dict(self):
+        """JSON-serializable representation of the user profile"""
+        return {
+            'id': self.id,
+            'username': self.username,
+            'email': self.email,
+            'first_name': self.first_name,
+            'last_name': self.last_name,
+            'country': self.country,
+            'zip_code': self.zip_code,
+            'preferred_translation': self.preferred_translation,
+            'font_preference': self.font_preference,
+            'theme_preference': self.theme_preference,
+            'listen_current_psalm': self.listen_current_psalm,
+            'listen_current_position': self.listen_current_position,
+            'listen_last_updated': self.listen_last_updated,
+            'created_at': self.created_at
+        }
     
     @property
     def display_name(self):
@@ -87,7 +109,7 @@ class User(UserMixin):
                     preferred_translation='NIV'
                 )
         except Exception as e:
-            print(f"Error getting user by ID {user_id}: {e}")
+            logger.error("Error getting user by ID %s: %s", user_id, e)
             # Fallback user object
             return User(
                 id=str(user_id),
@@ -135,7 +157,7 @@ class User(UserMixin):
                 return bool(result.data)
             return True
         except Exception as e:
-            print(f"Error updating user preferences: {e}")
+            logger.error("Error updating user preferences: %s", e)
             return False
     
     @property
@@ -178,7 +200,7 @@ class User(UserMixin):
                 if psalm_id and not is_explore and is_completed:
                     completed_psalms.add(int(psalm_id))
             
-            print(f"DEBUG: User {self.id} completed psalms: {sorted(completed_psalms)}")
+            logger.debug("User %s completed psalms: %s", self.id, sorted(completed_psalms))
             
             # Find the next psalm in sequence starting from 1
             current_psalm = 1
@@ -189,11 +211,11 @@ class User(UserMixin):
             if current_psalm > 150:
                 return 1
                 
-            print(f"DEBUG: Next psalm for user {self.id}: {current_psalm}")
+            logger.debug("Next psalm for user %s: %s", self.id, current_psalm)
             return current_psalm
             
         except Exception as e:
-            print(f"Error getting current psalm: {e}")
+            logger.error("Error getting current psalm: %s", e)
             return 1  # Default to Psalm 1
 
     def get_progress_stats(self):
@@ -238,7 +260,7 @@ class User(UserMixin):
             }
             
         except Exception as e:
-            print(f"Error getting progress stats: {e}")
+            logger.error("Error getting progress stats: %s", e)
             return {
                 'completed_count': 0,
                 'total_count': 150,
@@ -247,42 +269,69 @@ class User(UserMixin):
             }
 
     def update_listening_progress(self, psalm_number, position_seconds):
-        """Update user's listening progress"""
+        """
+        Record user's listening progress
+        Heartbeats are buffered and written to user_profiles in batches by
+        listening_buffer; only the latest position per user is stored.
+        """
+        from listening_buffer import listening_buffer
+        
+        row = listening_buffer.record(self.id, psalm_number, position_seconds)
+        
+        # Update local instance
+        self.listen_current_psalm = psalm_number
+        self.listen_current_position = position_seconds
+        self.listen_last_updated = row['listen_last_updated']
+        return True
+
+    @staticmethod
+    def save_listening_progress_batch(rows):
+        """
+        Write buffered listening progress rows to user_profiles
+        Uses the save_listening_progress() function for a single bulk update
+        (see create_listening_progress_function.py), falling back to per-user
+        updates. Returns the user ids that were written.
+        """
         try:
             from database import get_supabase_client
             supabase = get_supabase_client()
-            
-            # Update the user's listening progress
-            update_data = {
-                'listen_current_psalm': psalm_number,
-                'listen_current_position': position_seconds,
-                'listen_last_updated': datetime.utcnow().isoformat()
-            }
-            
-            result = supabase.table('user_profiles').update(update_data)\
-                .eq('user_id', str(self.id)).execute()
-            
-            # Update local instance if the attributes exist
-            if hasattr(self, 'listen_current_psalm'):
-                self.listen_current_psalm = psalm_number
-            if hasattr(self, 'listen_current_position'):
-                self.listen_current_position = position_seconds
-            if hasattr(self, 'listen_last_updated'):
-                self.listen_last_updated = datetime.utcnow().isoformat()
-            
-            return True
         except Exception as e:
-            print(f"Error updating listening progress: {e}")
-            print(f"This is likely because the database columns don't exist yet.")
-            print(f"Please add these columns to your user_profiles table in Supabase:")
-            print(f"ALTER TABLE user_profiles ADD COLUMN listen_current_psalm INTEGER;")
-            print(f"ALTER TABLE user_profiles ADD COLUMN listen_current_position FLOAT;")
-            print(f"ALTER TABLE user_profiles ADD COLUMN listen_last_updated TIMESTAMP;")
-            return False
+            logger.error("Error saving listening progress: %s", e)
+            return []
+        
+        try:
+            supabase.rpc('save_listening_progress', {'rows': rows}).execute()
+            # Users without a profile row (or with a newer stored position) are
+            # skipped by the function; retrying them would not change anything
+            return [row['user_id'] for row in rows]
+        except Exception as e:
+            logger.warning("Bulk listening progress update unavailable, updating users individually: %s", e)
+        
+        written = []
+        for row in rows:
+            update_data = {key: value for key, value in row.items() if key != 'user_id'}
+            try:
+                supabase.table('user_profiles').update(update_data)\
+                    .eq('user_id', row['user_id']).execute()
+                written.append(row['user_id'])
+            except Exception as e:
+                logger.error("Error updating listening progress: %s", e)
+                logger.warning("user_profiles may be missing the listen_current_psalm (INTEGER), "
+                               "listen_current_position (FLOAT) and listen_last_updated (TIMESTAMP) columns")
+        return written
 
     def get_listening_resume_position(self):
         """Get the position where user should resume listening"""
         try:
+            # Buffered heartbeats are newer than the stored profile until flushed
+            from listening_buffer import listening_buffer, is_newer
+            buffered = listening_buffer.get(self.id)
+            if buffered and is_newer(buffered['listen_last_updated'], self.listen_last_updated):
+                return {
+                    'psalm_number': buffered['listen_current_psalm'],
+                    'position': buffered['listen_current_position'] or 0
+                }
+            
             # Check if listening progress attributes exist (database columns may not exist yet)
             if hasattr(self, 'listen_current_psalm') and self.listen_current_psalm:
                 # If they were within 15 seconds of the end, advance to next psalm
@@ -301,7 +350,7 @@ class User(UserMixin):
             else:
                 return {'psalm_number': None, 'position': 0}
         except Exception as e:
-            print(f"Error getting listening resume position: {e}")
+            logger.error("Error getting listening resume position: %s", e)
             return {'psalm_number': None, 'position': 0}
     
     def advance_to_next_psalm(self):
@@ -324,6 +373,19 @@ class Psalm:
         self.text_nrsv = text_nrsv
         self.music_url = music_url
 
+    def to_dict(self):
+        """JSON-serializable representation of the psalm row"""
+        return {
+            'id': self.id,
+            'psalm_number': self.number,
+            'text_niv': self.text_niv,
+            'text_esv': self.text_esv,
+            'text_nlt': self.text_nlt,
+            'text_nkjv': self.text_nkjv,
+            'text_nrsv': self.text_nrsv,
+            'music_url': self.music_url
+        }
+
     @staticmethod
     def get_by_number(psalm_number):
         """Get psalm by number from Supabase"""
@@ -344,7 +406,7 @@ class Psalm:
                 )
             return None
         except Exception as e:
-            print(f"Error getting psalm by number: {e}")
+            logger.error("Error getting psalm by number: %s", e)
             return None
 
     @staticmethod
@@ -355,9 +417,20 @@ class Psalm:
             result = supabase.table('psalms').select('id', count='exact').execute()
             return result.count or 0
         except Exception as e:
-            print(f"Error getting psalm count: {e}")
+            logger.error("Error getting psalm count: %s", e)
             return 0
 
+    @staticmethod
+    def get_all_rows(columns='*'):
+        """Every stored psalm row as a dict, or None if the table cannot be read"""
+        try:
+            supabase = get_supabase_client()
+            result = supabase.table('psalms').select(columns).execute()
+            return result.data or []
+        except Exception as e:
+            logger.error("Error reading psalms: %s", e)
+            return None
+
     def save(self):
         """Save psalm to Supabase"""
         try:
@@ -376,9 +449,31 @@ class Psalm:
                 self.id = result.data[0]['id']
             return result.data
         except Exception as e:
-            print(f"Error saving psalm: {e}")
+            logger.error("Error saving psalm: %s", e)
             return None
 
+    @staticmethod
+    def bulk_upsert(rows):
+        """
+        Insert or update many psalm rows keyed on psalm_number
+        Only the columns present in a row are written. PostgREST fills keys
+        missing from a bulk payload with NULL, so rows are sent in one request
+        per distinct column set (usually two or three).
+        """
+        groups = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        try:
+            supabase = get_supabase_client()
+            written = 0
+            for group in groups.values():
+                result = supabase.table('psalms').upsert(group, on_conflict='psalm_number').execute()
+                written += len(result.data or [])
+            return written
+        except Exception as e:
+            logger.error("Error bulk upserting psalms: %s", e)
+            return 0
+
 class JournalEntry:
     def __init__(self, id=None, user_id=None, psalm_id=None, prompt_responses=None, 
                  created_at=None):
@@ -387,6 +482,25 @@ class JournalEntry:
         self.psalm_id = psalm_id
         self.prompt_responses = prompt_responses or {}  # JSONB field
         self.created_at = created_at or datetime.utcnow()
+        # Emotion as last stored, so saves that keep it skip the daily aggregates
+        self._saved_emotion = self.emotion if id else None
+
+    @property
+    def emotion(self):
+        """Pre-reflection check-in (terrible/bad/okay/good/great) or None"""
+        if isinstance(self.prompt_responses, dict):
+            return self.prompt_responses.get('emotion')
+        return None
+
+    def to_dict(self):
+        """JSON-serializable representation of the journal entry"""
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'psalm_id': self.psalm_id,
+            'prompt_responses': self.prompt_responses,
+            'created_at': self.created_at
+        }
 
     @staticmethod
     def get_by_user_and_psalm(user_id, psalm_id):
@@ -407,7 +521,7 @@ class JournalEntry:
                 ))
             return entries
         except Exception as e:
-            print(f"Error getting journal entries: {e}")
+            logger.error("Error getting journal entries: %s", e)
             return []
 
     @staticmethod
@@ -418,9 +532,69 @@ class JournalEntry:
             all_entries = JournalEntry.get_all_by_user(user_id)
             return all_entries[:limit]
         except Exception as e:
-            print(f"Error getting recent journal entries: {e}")
+            logger.error("Error getting recent journal entries: %s", e)
             return []
 
+    @staticmethod
+    def search(user_id, query, psalm_id=None, date=None, page=1, per_page=12):
+        """
+        Full-text search over a user's completed journal entries
+        Uses the indexed search_journal_entries() function (see
+        create_journal_search_index.py) and falls back to scanning entries in
+        the app when it is not installed. Returns (entries, total); each entry
+        has a rank and an HTML-safe snippet with <mark> highlights.
+        """
+        from journal_search import render_snippet, search_entries
+        
+        offset = (max(page, 1) - 1) * per_page
+        try:
+            supabase = get_supabase_client()
+            result = supabase.rpc('search_journal_entries', {
+                'p_user_id': str(user_id),
+                'p_query': query,
+                'p_psalm_id': psalm_id,
+                'p_date': date.isoformat() if date else None,
+                'p_limit': per_page,
+                'p_offset': offset
+            }).execute()
+            
+            rows = result.data or []
+            entries = []
+            for row in rows:
+                entry = JournalEntry(
+                    id=row['id'],
+                    user_id=user_id,
+                    psalm_id=row['psalm_id'],
+                    prompt_responses=row.get('prompt_responses') or {},
+                    created_at=row.get('created_at')
+                )
+                # psalm_id in journal_entries corresponds to the psalm number
+                entry.psalm = Psalm(psalm_number=entry.psalm_id)
+                entry.rank = row.get('rank')
+                entry.snippet = render_snippet(row.get('snippet'))
+                entries.append(entry)
+            total = rows[0]['total_count'] if rows else 0
+            if not rows and offset:
+                # Past the last page - the window function reports no total
+                total = JournalEntry.search(user_id, query, psalm_id, date, 1, 1)[1]
+            return entries, total
+        except Exception as e:
+            logger.warning("Indexed journal search unavailable, scanning entries instead: %s", e)
+        
+        entries = JournalEntry.get_all_by_user(user_id)
+        if psalm_id:
+            entries = [entry for entry in entries if entry.psalm_id == psalm_id]
+        if date:
+            entries = [entry for entry in entries if str(entry.created_at or '')[:10] == date.isoformat()]
+        
+        matches = search_entries(entries, query)
+        page_entries = []
+        for entry, rank, snippet in matches[offset:offset + per_page]:
+            entry.rank = rank
+            entry.snippet = render_snippet(snippet)
+            page_entries.append(entry)
+        return page_entries, len(matches)
+
     @staticmethod
     def get_entry_dates_by_user(user_id):
         """Get all dates when user made journal entries for calendar highlighting"""
@@ -445,7 +619,7 @@ class JournalEntry:
                         continue
             return list(set(dates))  # Remove duplicates
         except Exception as e:
-            print(f"Error getting journal entry dates: {e}")
+            logger.error("Error getting journal entry dates: %s", e)
             return []
 
     @staticmethod
@@ -462,7 +636,7 @@ class JournalEntry:
             count = len(result.data) if result.data else 0
             return count
         except Exception as e:
-            print(f"Error getting journal entry count: {e}")
+            logger.error("Error getting journal entry count: %s", e)
             return 0
             
     @staticmethod
@@ -479,40 +653,14 @@ class JournalEntry:
                 .gte('created_at', week_ago).execute()
             return len(result.data) if result.data else 0
         except Exception as e:
-            print(f"Error getting week journal entry count: {e}")
+            logger.error("Error getting week journal entry count: %s", e)
             return 0
             
     @staticmethod
     def get_emotion_trends(user_id, days_back=30):
         """Get emotion data over time for heart tracker"""
-        try:
-            from datetime import timedelta
-            from database import get_supabase_client
-            from_date = (datetime.utcnow() - timedelta(days=days_back)).isoformat()
-            
-            supabase = get_supabase_client()
-            result = supabase.table('journal_entries').select('created_at,prompt_responses')\
-                .eq('user_id', str(user_id))\
-                .gte('created_at', from_date)\
-                .order('created_at', desc=False).execute()
-                
-            emotion_data = []
-            emotion_values = {'terrible': 1, 'bad': 2, 'okay': 3, 'good': 4, 'great': 5}
-            
-            for entry in result.data:
-                if entry.get('prompt_responses', {}).get('emotion'):
-                    emotion = entry['prompt_responses']['emotion']
-                    if emotion in emotion_values:
-                        emotion_data.append({
-                            'date': entry['created_at'][:10],  # Extract date part
-                            'emotion': emotion,
-                            'value': emotion_values[emotion]
-                        })
-            
-            return emotion_data
-        except Exception as e:
-            print(f"Error getting emotion trends: {e}")
-            return []
+        from emotion_analytics import emotion_analytics
+        return emotion_analytics.trends(user_id, windows=(days_back,))[days_back]
 
     @staticmethod
     def get_all_by_user(user_id):
@@ -520,17 +668,16 @@ class JournalEntry:
         try:
             from database import get_supabase_client
             supabase = get_supabase_client()
-            print(f"DEBUG: Getting all entries for user_id {user_id}")
+            logger.debug("Getting all entries for user_id %s", user_id)
             
             # Get journal entries without join first
             result = supabase.table('journal_entries').select('*')\
                 .eq('user_id', str(user_id)).order('created_at', desc=True).execute()
             
-            print(f"DEBUG: Query result: {result}")
-            print(f"DEBUG: Found {len(result.data) if result.data else 0} raw journal entries for user {user_id}")
+            logger.debug("Found %s raw journal entries for user %s", len(result.data) if result.data else 0, user_id)
             
             if not result.data:
-                print("DEBUG: No data returned from query")
+                logger.debug("No data returned from query")
                 return []
             
             # Take most recent entries (since we now save consolidated entries)
@@ -538,12 +685,10 @@ class JournalEntry:
             
             entries = []
             for entry_data in result.data:
-                print(f"DEBUG: Processing entry data: {entry_data}")
-                
                 # Only include completed entries for dashboard/history display
                 prompt_responses = entry_data.get('prompt_responses', {})
                 if not prompt_responses.get('completed'):
-                    print(f"DEBUG: Skipping incomplete entry {entry_data['id']}")
+                    logger.debug("Skipping incomplete entry %s", entry_data['id'])
                     continue
                 
                 entry = JournalEntry(
@@ -569,12 +714,10 @@ class JournalEntry:
                 
                 entries.append(entry)
             
-            print(f"DEBUG: Returning {len(entries)} consolidated journal entries")
+            logger.debug("Returning %s consolidated journal entries", len(entries))
             return entries
         except Exception as e:
-            print(f"Error getting all journal entries: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error getting all journal entries: %s", e)
             return []
 
     def save(self):
@@ -592,34 +735,34 @@ class JournalEntry:
                 'prompt_responses': self.prompt_responses
             }
             
-            print(f"DEBUG: Saving entry_data: {entry_data}")
+            logger.debug("Saving journal entry %s for psalm %s", self.id, self.psalm_id)
             
             if self.id:
                 # Update existing entry
-                print(f"DEBUG: Updating existing entry ID {self.id}")
+                logger.debug("Updating existing entry ID %s", self.id)
                 result = supabase.table('journal_entries').update(entry_data).eq('id', self.id).execute()
             else:
                 # Create new entry
-                print(f"DEBUG: Creating new entry")
+                logger.debug("Creating new entry")
                 result = supabase.table('journal_entries').insert(entry_data).execute()
                 if result.data:
                     self.id = result.data[0]['id']
-                    print(f"DEBUG: New entry created with ID {self.id}")
+                    logger.debug("New entry created with ID %s", self.id)
             
-            print(f"DEBUG: Supabase result: {result}")
+            logger.debug("Saved journal entry %s (%s rows returned)", self.id, len(result.data or []))
+            if result.data:
+                self._update_emotion_aggregates(result.data)
             return result.data
         except Exception as e:
-            import traceback
-            print(f"Error saving journal entry: {e}")
-            print(f"Full traceback: {traceback.format_exc()}")
+            logger.exception("Error saving journal entry: %s", e)
             
             # If RLS is blocking, let's try using the service role key directly
             if "row-level security" in str(e).lower():
-                print("DEBUG: RLS detected, trying with service role...")
+                logger.debug("RLS detected, trying with service role...")
                 try:
-                    print("DEBUG: Getting SUPABASE_URL and keys...")
                     import os
                     from supabase import create_client
+                    from instrumentation import instrument_supabase
                     
                     supabase_url = os.environ.get("SUPABASE_URL")
                     # Try various service key environment variables
@@ -627,16 +770,16 @@ class JournalEntry:
                                  os.environ.get("SUPABASE_SERVICE_KEY") or 
                                  os.environ.get("SUPABASE_KEY"))
                     
-                    print(f"DEBUG: URL exists: {bool(supabase_url)}, Service key exists: {bool(service_key)}")
+                    logger.debug("URL exists: %s, Service key exists: %s", bool(supabase_url), bool(service_key))
                     
                     if not supabase_url or not service_key:
-                        print("DEBUG: Missing Supabase credentials")
+                        logger.debug("Missing Supabase credentials")
                         return None
                     
                     # Use service role key to bypass RLS for development
-                    service_supabase = create_client(supabase_url, service_key)
+                    service_supabase = instrument_supabase(create_client(supabase_url, service_key))
                     
-                    print(f"DEBUG: Created service client, attempting save...")
+                    logger.debug("Created service client, attempting save...")
                     
                     # Add headers to bypass RLS
                     service_supabase.postgrest.auth(service_key)
@@ -648,21 +791,28 @@ class JournalEntry:
                         if result.data:
                             self.id = result.data[0]['id']
                     
-                    print(f"DEBUG: Service role result: {result}")
                     if result.data:
-                        print("DEBUG: Service role save successful!")
+                        logger.debug("Service role save successful")
+                        self._update_emotion_aggregates(result.data)
                         return result.data
                     else:
-                        print("DEBUG: Service role save returned no data")
+                        logger.debug("Service role save returned no data")
                         return None
                         
                 except Exception as service_error:
-                    print(f"Service role attempt failed: {service_error}")
-                    import traceback
-                    print(f"Service role traceback: {traceback.format_exc()}")
+                    logger.exception("Service role attempt failed: %s", service_error)
             
             return None
 
+    def _update_emotion_aggregates(self, rows):
+        """Recount the entry's day in the daily emotion aggregates if its emotion changed"""
+        emotion = self.emotion
+        if emotion == self._saved_emotion:
+            return
+        from emotion_analytics import emotion_analytics
+        emotion_analytics.record_entry(self.user_id, rows[0].get('created_at') or self.created_at)
+        self._saved_emotion = emotion
+
     # Helper methods for backward compatibility
     @property
     def prompt_number(self):
@@ -704,6 +854,20 @@ class Prayer:
         self.created_at = created_at or datetime.utcnow()
         self.answered_at = answered_at
 
+    def to_dict(self):
+        """JSON-serializable representation of the prayer"""
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'category': self.category,
+            'title': self.title,
+            'description': self.description,
+            'is_answered': self.is_answered,
+            'answered_note': self.answered_note,
+            'created_at': self.created_at,
+            'answered_at': self.answered_at
+        }
+
     @staticmethod
     def get_active_by_user(user_id, limit=None):
         """Get active prayers for a user"""
@@ -762,7 +926,7 @@ class Prayer:
                     ))
             return prayers
         except Exception as e:
-            print(f"Error getting active prayers: {e}")
+            logger.error("Error getting active prayers: %s", e)
             return []
 
     @staticmethod
@@ -818,7 +982,7 @@ class Prayer:
                     ))
             return prayers
         except Exception as e:
-            print(f"Error getting answered prayers: {e}")
+            logger.error("Error getting answered prayers: %s", e)
             return []
 
     def save(self):
@@ -842,7 +1006,7 @@ class Prayer:
             if hasattr(self, 'answered_at') and self.answered_at:
                 prayer_data['answered_at'] = self.answered_at.isoformat() if hasattr(self.answered_at, 'isoformat') else self.answered_at
             
-            print(f"DEBUG: Saving prayer data: {prayer_data}")
+            logger.debug("Saving prayer %s", self.id)
             
             if self.id:
                 # Update existing prayer
@@ -853,12 +1017,10 @@ class Prayer:
                 if result.data:
                     self.id = result.data[0]['id']
             
-            print(f"DEBUG: Save result: {result}")
+            logger.debug("Saved prayer %s", self.id)
             return result.data
         except Exception as e:
-            print(f"Error saving prayer: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error saving prayer: %s", e)
             return None
 
     # Ensure title property works
@@ -894,6 +1056,16 @@ class PsalmProgress:
         self.completed = completed
         self.created_at = created_at or datetime.utcnow()
 
+    def to_dict(self):
+        """JSON-serializable representation of the progress record"""
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'psalm_id': self.psalm_id,
+            'completed': self.completed,
+            'created_at': self.created_at
+        }
+
     @staticmethod
     def get_count_by_user(user_id):
         """Get total count of completed psalms for a user based on journal entries"""
@@ -910,7 +1082,7 @@ class PsalmProgress:
                 return len(unique_psalms)
             return 0
         except Exception as e:
-            print(f"Error getting progress count: {e}")
+            logger.error("Error getting progress count: %s", e)
             return 0
 
     @staticmethod
@@ -932,7 +1104,7 @@ class PsalmProgress:
                 return len(unique_psalms)
             return 0
         except Exception as e:
-            print(f"Error getting week progress count: {e}")
+            logger.error("Error getting week progress count: %s", e)
             return 0
 
     def save(self):
@@ -950,5 +1122,5 @@ class PsalmProgress:
                 self.id = result.data[0]['id']
             return result.data
         except Exception as e:
-            print(f"Error saving progress: {e}")
+            logger.error("Error saving progress: %s", e)
             return None
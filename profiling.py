@@ -0,0 +1,267 @@
+"""
+On-demand request profiler for Pray150 admins
+An admin adds the X-Profile header (or the _profile query parameter) to a
+request to run it under a profiler:
+  sample   - a background thread samples the request thread's stack every
+             PROFILE_SAMPLE_INTERVAL seconds (default); saved as collapsed
+             stacks ("frame;frame;frame count"), ready for flamegraph.pl,
+             speedscope or inferno
+  cprofile - deterministic cProfile; saved as a .prof file (snakeviz,
+             pstats) plus a text summary
+Profiles are written to PROFILE_DIR so any worker can serve them, and are
+listed for download on /admin/system_info. Requests without the flag only
+pay for one header and one query-string lookup.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import marshal
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY_ARG = '_profile'
+PROFILE_MODES = ('sample', 'cprofile')
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'profiles')
+
+# File extension per export format
+EXPORT_FORMATS = {
+    'folded': 'folded',   # collapsed stacks (sample mode)
+    'prof': 'prof',       # cProfile stats (cprofile mode)
+    'text': 'txt',        # human-readable summary (both modes)
+}
+
+_PROFILE_ID_RE = re.compile(r'^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$')
+
+
+def frame_label(frame) -> str:
+    """Flame graph frame name: function (file:line)"""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples one thread's call stack on a background thread"""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()   # "root;...;leaf" -> samples
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+
+def collapsed_stacks(stacks: Counter) -> str:
+    """Collapsed stack format: one "frame;frame;frame count" line per stack"""
+    return ''.join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+def sample_summary(stacks: Counter, limit: int = 30) -> str:
+    """Functions by inclusive and by self samples"""
+    total = sum(stacks.values()) or 1
+    inclusive = Counter()
+    own = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')
+        for label in set(frames):
+            inclusive[label] += count
+        own[frames[-1]] += count
+
+    lines = [f"{total} samples", '', 'Inclusive (function and its callees):']
+    lines += [f"{count / total:7.1%}  {label}" for label, count in inclusive.most_common(limit)]
+    lines += ['', 'Self (function itself):']
+    lines += [f"{count / total:7.1%}  {label}" for label, count in own.most_common(limit)]
+    return '\n'.join(lines) + '\n'
+
+
+def cprofile_summary(profiler: cProfile.Profile, limit: int = 40) -> str:
+    """pstats listing sorted by cumulative time"""
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
+
+
+class ProfileStore:
+    """Profiles on disk: <id>.json metadata plus one file per export format"""
+
+    def __init__(self, directory: str, keep: int = 20):
+        self.directory = directory
+        self.keep = keep
+
+    def save(self, meta: Dict, exports: Dict[str, object]) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        meta = dict(meta, id=profile_id, formats=sorted(exports))
+        for fmt, content in exports.items():
+            mode = 'wb' if isinstance(content, bytes) else 'w'
+            with open(self._file(profile_id, EXPORT_FORMATS[fmt]), mode) as f:
+                f.write(content)
+        with open(self._file(profile_id, 'json'), 'w') as f:
+            json.dump(meta, f)
+        self.prune()
+        return profile_id
+
+    def list(self) -> List[Dict]:
+        """Stored profiles, newest first"""
+        profiles = []
+        if not os.path.isdir(self.directory):
+            return profiles
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            if name.endswith('.json'):
+                try:
+                    with open(os.path.join(self.directory, name)) as f:
+                        profiles.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return profiles
+
+    def path(self, profile_id: str, fmt: str) -> Optional[str]:
+        """File of one export, or None if the id or format is unknown"""
+        if not _PROFILE_ID_RE.match(profile_id or '') or fmt not in EXPORT_FORMATS:
+            return None
+        path = self._file(profile_id, EXPORT_FORMATS[fmt])
+        return path if os.path.exists(path) else None
+
+    def prune(self):
+        for meta in self.list()[self.keep:]:
+            for extension in list(EXPORT_FORMATS.values()) + ['json']:
+                try:
+                    os.remove(self._file(meta['id'], extension))
+                except OSError:
+                    pass
+
+    def _file(self, profile_id: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+
+
+def _current_user_is_admin() -> bool:
+    from admin import is_admin
+    from flask_login import current_user
+    return is_admin(current_user)
+
+
+class RequestProfiler:
+    """Flask extension that profiles flagged requests from admins"""
+
+    def __init__(self, app=None, is_allowed=_current_user_is_admin):
+        self.is_allowed = is_allowed
+        self.store = ProfileStore(DEFAULT_PROFILE_DIR)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PROFILE_DIR', os.environ.get('PROFILE_DIR', DEFAULT_PROFILE_DIR))
+        app.config.setdefault('PROFILE_KEEP', int(os.environ.get('PROFILE_KEEP', '20')))
+        app.config.setdefault('PROFILE_SAMPLE_INTERVAL', float(os.environ.get('PROFILE_SAMPLE_INTERVAL', '0.005')))
+
+        self.store = ProfileStore(app.config['PROFILE_DIR'], app.config['PROFILE_KEEP'])
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+
+    def requested_mode(self, request) -> Optional[str]:
+        flag = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_ARG)
+        if not flag:
+            return None
+        flag = flag.strip().lower()
+        return flag if flag in PROFILE_MODES else 'sample'
+
+    def before_request(self):
+        from flask import current_app, g, request
+
+        mode = self.requested_mode(request)
+        if mode is None or not self.is_allowed():
+            return
+
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(threading.get_ident(), current_app.config['PROFILE_SAMPLE_INTERVAL'])
+            profiler.start()
+        g._profile = (mode, profiler, time.perf_counter())
+
+    def after_request(self, response):
+        from flask import g, request
+
+        active = g.pop('_profile', None)
+        if active is None:
+            return response
+        mode, profiler, started = active
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        if mode == 'cprofile':
+            profiler.disable()
+            profiler.create_stats()
+            exports = {'prof': _marshal_stats(profiler), 'text': cprofile_summary(profiler)}
+        else:
+            stacks = profiler.stop()
+            exports = {'folded': collapsed_stacks(stacks), 'text': sample_summary(stacks)}
+
+        from flask_login import current_user
+        meta = {
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'mode': mode,
+            'duration_ms': round(duration_ms, 1),
+            'user': getattr(current_user, 'email', None),
+            'created_at': datetime.utcnow().isoformat(),
+        }
+        try:
+            response.headers['X-Profile-Id'] = self.store.save(meta, exports)
+        except OSError as e:
+            logger.error("Could not store profile for %s: %s", request.path, e)
+        return response
+
+    def teardown_request(self, exc=None):
+        from flask import g
+
+        # Request failed before after_request - stop without storing
+        active = g.pop('_profile', None)
+        if active is not None:
+            mode, profiler, _ = active
+            profiler.disable() if mode == 'cprofile' else profiler.stop()
+
+
+def _marshal_stats(profiler: cProfile.Profile) -> bytes:
+    # Same format as Profile.dump_stats, loadable with pstats.Stats(path)
+    return marshal.dumps(profiler.stats)
+
+
+# Global profiler instance used by app.create_app and admin
+profiler = RequestProfiler()
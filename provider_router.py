@@ -0,0 +1,193 @@
+"""
+Hedged routing across Bible providers
+Some translations are served by more than one provider (ESV, NLT and KJV by
+both rkeplin and API.Bible). ProviderRouter knows every source of each
+translation and, per fetch:
+  - picks as primary the provider with the best latency score: an
+    exponentially weighted average of its recent fetch times, inflated by its
+    recent failure rate (providers without samples yet rank last, in the
+    configured order)
+  - if the primary has not answered within its p95 fetch time, sends a
+    hedged request to the next provider and takes the first good response;
+    a provider that fails hands over to the next one at once
+Each provider has its own worker pool, so calls stuck on a slow provider
+never delay hedges to another one. A provider already running a full pool
+of calls is passed over for the next source, and losing calls still queued
+are cancelled; losers already running finish in the background and still
+update the scores. Costly providers can be marked fallback-only: they are
+never hedged to and only called once the other sources have failed.
+PROVIDER_HEDGE_DEFAULT_MS (default 1500) is the hedge delay until a provider
+has PROVIDER_HEDGE_MIN_SAMPLES (10) timings; PROVIDER_HEDGE_MIN_MS (50) is
+the shortest.
+"""
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderScore:
+    """Recent fetch latencies and failures of one provider"""
+
+    def __init__(self, alpha: float = 0.2, samples: int = 100, failure_window: int = 20):
+        self.alpha = alpha
+        self.ewma = None
+        self.latencies = deque(maxlen=samples)
+        self.failures = deque(maxlen=failure_window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, ok: bool):
+        with self._lock:
+            self.failures.append(not ok)
+            if ok:
+                self.latencies.append(seconds)
+                self.ewma = seconds if self.ewma is None else self.alpha * seconds + (1 - self.alpha) * self.ewma
+
+    @property
+    def sampled(self) -> bool:
+        return self.ewma is not None
+
+    def score(self) -> float:
+        """Expected seconds to a good response (lower is better)"""
+        with self._lock:
+            if self.ewma is None:
+                return float('inf')
+            failure_rate = sum(self.failures) / len(self.failures)
+            return self.ewma * (1 + 4 * failure_rate)
+
+    def p95(self, minimum: int) -> Optional[float]:
+        with self._lock:
+            if len(self.latencies) < minimum:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+class ProviderRouter:
+    """Fetches from the best source of a translation, hedging slow primaries"""
+
+    def __init__(self, fetchers: Dict[str, Callable], sources: Callable[[str], Sequence[str]],
+                 is_good: Callable = bool, hedge_default: Optional[float] = None,
+                 hedge_minimum: Optional[float] = None, min_samples: Optional[int] = None, workers: int = 8,
+                 fallback_only: Sequence[str] = ()):
+        self.fetchers = fetchers   # provider -> fetch(psalm_number, translation)
+        self.sources = sources     # translation -> providers, in configured order
+        self.is_good = is_good
+        self.fallback_only = frozenset(fallback_only)
+        self.hedge_default = hedge_default if hedge_default is not None else \
+            float(os.environ.get('PROVIDER_HEDGE_DEFAULT_MS', '1500')) / 1000
+        self.hedge_minimum = hedge_minimum if hedge_minimum is not None else \
+            float(os.environ.get('PROVIDER_HEDGE_MIN_MS', '50')) / 1000
+        self.min_samples = min_samples if min_samples is not None else \
+            int(os.environ.get('PROVIDER_HEDGE_MIN_SAMPLES', '10'))
+        self.workers = workers     # pool size, and cap on outstanding calls, per provider
+        self.scores: Dict[str, ProviderScore] = {provider: ProviderScore() for provider in fetchers}
+        self.stats = {'fetches': 0, 'hedged': 0, 'fallbacks': 0, 'wins': {provider: 0 for provider in fetchers}}
+        self._stats_lock = threading.Lock()
+        self._outstanding: Dict[str, int] = {provider: 0 for provider in fetchers}
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._executor_pid = None
+
+    def ranked(self, translation: str) -> List[str]:
+        """Sources of a translation, best first (fallback-only providers last)"""
+        configured = [provider for provider in self.sources(translation) if provider in self.fetchers]
+        return sorted(configured, key=lambda provider: (provider in self.fallback_only,
+                                                        not self.scores[provider].sampled,
+                                                        self.scores[provider].score(),
+                                                        configured.index(provider)))
+
+    def hedge_delay(self, provider: str) -> float:
+        p95 = self.scores[provider].p95(self.min_samples)
+        return self.hedge_default if p95 is None else max(self.hedge_minimum, p95)
+
+    def fetch(self, psalm_number: int, translation: str):
+        """First good response from the sources of a translation, or None"""
+        candidates = self.ranked(translation)
+        if not candidates:
+            return None
+        self._count('fetches')
+        if len(candidates) == 1:
+            return self._call(candidates[0], psalm_number, translation)
+
+        pending = {}   # future -> provider
+        result = None
+        try:
+            self._start(pending, candidates, psalm_number, translation)
+            while pending:
+                primary = next(iter(pending.values()))
+                hedge = len(pending) == 1 and any(p not in self.fallback_only for p in candidates)
+                delay = self.hedge_delay(primary) if hedge else None
+                done, _ = wait(list(pending), timeout=delay, return_when=FIRST_COMPLETED)
+                if not done:
+                    # Primary is slower than its p95 - hedge with the next source
+                    self._count('hedged')
+                    logger.debug("Hedging %s psalm %s: %s slower than %.0fms", translation, psalm_number,
+                                 primary, delay * 1000)
+                    self._start(pending, candidates, psalm_number, translation)
+                    continue
+                for future in done:
+                    provider = pending.pop(future)
+                    value = future.result()
+                    if self.is_good(value):
+                        with self._stats_lock:
+                            self.stats['wins'][provider] += 1
+                        return value
+                    result = value
+                if not pending and candidates:
+                    self._count('fallbacks')
+                    self._start(pending, candidates, psalm_number, translation, fallback=True)
+            return result
+        finally:
+            # Losers that have not started yet never reach their provider
+            for future in pending:
+                future.cancel()
+
+    def _start(self, pending: Dict, candidates: List[str], psalm_number: int, translation: str,
+               fallback: bool = False):
+        """Submit a call to the next candidate, preferring providers with spare capacity"""
+        eligible = [p for p in candidates if fallback or p not in self.fallback_only] or candidates
+        with self._stats_lock:
+            # Worker threads do not survive a gunicorn fork
+            if self._executor_pid != os.getpid():
+                self._executors = {}
+                self._outstanding = {name: 0 for name in self.fetchers}
+                self._executor_pid = os.getpid()
+            provider = next((p for p in eligible if self._outstanding[p] < self.workers), eligible[0])
+            self._outstanding[provider] += 1
+            executor = self._executors.get(provider)
+            if executor is None:
+                executor = self._executors[provider] = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix=f'provider-{provider}')
+        candidates.remove(provider)
+        # Copy the context so provider calls count towards the request (instrumentation.py)
+        context = contextvars.copy_context()
+        future = executor.submit(context.run, self._call, provider, psalm_number, translation)
+        future.add_done_callback(lambda _: self._release(provider))
+        pending[future] = provider
+
+    def _release(self, provider: str):
+        with self._stats_lock:
+            self._outstanding[provider] -= 1
+
+    def _call(self, provider: str, psalm_number: int, translation: str):
+        started = time.perf_counter()
+        value = None
+        try:
+            value = self.fetchers[provider](psalm_number, translation)
+            return value
+        except Exception as e:
+            logger.warning("%s failed for psalm %s (%s): %s", provider, psalm_number, translation, e)
+            return None
+        finally:
+            self.scores[provider].observe(time.perf_counter() - started, self.is_good(value))
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
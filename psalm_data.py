@@ -1,3 +1,5 @@
+import json
+
 from models import Psalm
 
 # Sample Psalm data - In production, this would be populated from a complete database
@@ -110,25 +112,75 @@ With long life I will satisfy him
     }
 ]
 
-def initialize_psalms():
-    """Initialize Supabase with sample Psalm data"""
-    for psalm_data in PSALM_DATA:
-        # Check if psalm already exists
-        existing_psalm = Psalm.get_by_number(psalm_data['number'])
-        if not existing_psalm:
-            psalm = Psalm(
-                psalm_number=psalm_data['number'],
-                text_niv=psalm_data['text_niv'],
-                text_esv=psalm_data['text_niv'],  # Using NIV for all translations in this demo
-                text_nlt=psalm_data['text_niv'],
-                text_nkjv=psalm_data['text_niv'],
-                text_nrsv=psalm_data['text_niv'],
-                music_url=psalm_data['youtube_url']
-            )
-            result = psalm.save()
-            if result:
-                print(f"Successfully initialized Psalm {psalm_data['number']}")
-            else:
-                print(f"Failed to initialize Psalm {psalm_data['number']}")
-    
-    print("Psalm initialization complete")
+TOTAL_PSALMS = 150
+TRANSLATION_COLUMNS = ('text_niv', 'text_esv', 'text_nlt', 'text_nkjv', 'text_nrsv')
+YOUTUBE_EMBED_URL = 'https://www.youtube.com/embed/{}'
+
+
+def load_psalm_file(path):
+    """
+    Load psalm rows from a local JSON file
+    Accepts a list of objects with a 'psalm_number' (or 'number') key, or an
+    object keyed by psalm number. Recognised fields are the translation text
+    columns and 'music_url'.
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        data = [dict(row, psalm_number=int(number)) for number, row in data.items()]
+
+    rows = {}
+    for row in data:
+        number = int(row.get('psalm_number') or row.get('number'))
+        if not 1 <= number <= TOTAL_PSALMS:
+            raise ValueError(f"Psalm number out of range in {path}: {number}")
+        rows[number] = row
+    return rows
+
+
+def build_psalm_rows(data_file=None, existing=None):
+    """
+    Build one row per psalm (1-150) for the psalms table
+    Values from the data file are always written. Otherwise text falls back
+    to the sample PSALM_DATA and music_url to the curated video catalog, but
+    only for columns that are empty in `existing` (psalm number -> stored
+    row), so re-seeding never replaces stored text or hand-set music. Columns
+    with no value are left out of the row.
+    """
+    from psalm_music_config import MUSIC_CATALOG
+
+    samples = {psalm['number']: psalm for psalm in PSALM_DATA}
+    file_rows = load_psalm_file(data_file) if data_file else {}
+    existing = existing or {}
+
+    rows = []
+    for number in range(1, TOTAL_PSALMS + 1):
+        row = {'psalm_number': number}
+        source = file_rows.get(number, {})
+        sample = samples.get(number, {})
+        stored = existing.get(number, {})
+
+        for column in TRANSLATION_COLUMNS:
+            # Sample data only ships NIV text, used for every translation in this demo
+            row[column] = source.get(column) or (None if stored.get(column) else sample.get('text_niv'))
+
+        videos = MUSIC_CATALOG.videos.get(number)
+        fallback_music = sample.get('youtube_url') or (YOUTUBE_EMBED_URL.format(videos[0]) if videos else None)
+        row['music_url'] = source.get('music_url') or (None if stored.get('music_url') else fallback_music)
+        rows.append({column: value for column, value in row.items() if value is not None})
+    return rows
+
+
+def initialize_psalms(data_file=None):
+    """
+    Seed the psalms table with a bulk upsert keyed on psalm_number
+    Safe to run repeatedly; returns the number of rows written.
+    """
+    stored = Psalm.get_all_rows(', '.join(('psalm_number',) + TRANSLATION_COLUMNS + ('music_url',)))
+    if stored is None:
+        return 0
+    rows = build_psalm_rows(data_file, {row['psalm_number']: row for row in stored})
+    count = Psalm.bulk_upsert(rows)
+    print(f"Psalm initialization complete: {count} of {len(rows)} psalms upserted")
+    return count
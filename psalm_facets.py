@@ -0,0 +1,178 @@
+"""
+Psalm metadata facet index for Pray150
+Precomputes one bitset per facet value (author, musical term, superscript,
+music availability, verse count) over the 150 psalms, so combined filters
+such as "Asaph psalms with music and under 20 verses" are answered with a
+few bitwise operations. Bit n of a bitset is set when psalm n matches.
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from psalm_music_config import MUSIC_CATALOG
+from psalm_superscripts import PSALM_SUPERSCRIPTS, get_musical_term_psalms, get_superscripts_by_author
+
+TOTAL_PSALMS = 150
+
+# Facet value -> text as it appears in the superscripts
+AUTHORS = {
+    'david': 'David',
+    'asaph': 'Asaph',
+    'sons-of-korah': 'Sons of Korah',
+    'solomon': 'Solomon',
+    'moses': 'Moses',
+    'heman': 'Heman',
+    'ethan': 'Ethan',
+}
+
+MUSICAL_TERMS = {
+    'choirmaster': 'choirmaster',
+    'maskil': 'Maskil',
+    'miktam': 'Miktam',
+    'shiggaion': 'Shiggaion',
+    'song-of-ascents': 'Song of Ascents',
+    'stringed-instruments': 'stringed instruments',
+    'flutes': 'flutes',
+    'gittith': 'Gittith',
+    'sheminith': 'Sheminith',
+    'alamoth': 'Alamoth',
+    'jeduthun': 'Jeduthun',
+    'lilies': 'Lilies',
+    'mahalath': 'Mahalath',
+    'do-not-destroy': 'Do Not Destroy',
+}
+
+# "Selah" occurs in the psalm text rather than the superscript (39 psalms)
+SELAH_PSALMS = (3, 4, 7, 9, 20, 21, 24, 32, 39, 44, 46, 47, 48, 49, 50, 52, 54, 55, 57, 59,
+                60, 61, 62, 66, 67, 68, 75, 76, 77, 81, 82, 83, 84, 85, 87, 88, 89, 140, 143)
+
+# Number of verses in each psalm (English versification), 2,461 in total
+VERSE_COUNTS = (
+    6, 12, 8, 8, 12, 10, 17, 9, 20, 18, 7, 8, 6, 7, 5, 11, 15, 50, 14, 9,
+    13, 31, 6, 10, 22, 12, 14, 9, 11, 12, 24, 11, 22, 22, 28, 12, 40, 22, 13, 17,
+    13, 11, 5, 26, 17, 11, 9, 14, 20, 23, 19, 9, 6, 7, 23, 13, 11, 11, 17, 12,
+    8, 12, 11, 10, 13, 20, 7, 35, 36, 5, 24, 20, 28, 23, 10, 12, 20, 72, 13, 19,
+    16, 8, 18, 12, 13, 17, 7, 18, 52, 17, 16, 15, 5, 23, 11, 13, 12, 9, 9, 5,
+    8, 28, 22, 35, 45, 48, 43, 13, 31, 7, 10, 10, 9, 8, 18, 19, 2, 29, 176, 7,
+    8, 9, 4, 8, 5, 6, 5, 6, 8, 8, 3, 18, 3, 3, 21, 26, 9, 8, 24, 13,
+    10, 7, 12, 15, 21, 10, 20, 14, 9, 6,
+)
+MAX_VERSES = max(VERSE_COUNTS)
+
+
+def bitset(psalm_numbers: Iterable[int]) -> int:
+    """Bitset with bit n set for every psalm number n"""
+    bits = 0
+    for number in psalm_numbers:
+        bits |= 1 << number
+    return bits
+
+
+def psalm_numbers(bits: int) -> List[int]:
+    """Psalm numbers in a bitset, ascending"""
+    numbers = []
+    while bits:
+        lowest = bits & -bits
+        numbers.append(lowest.bit_length() - 1)
+        bits ^= lowest
+    return numbers
+
+
+@dataclass(frozen=True)
+class PsalmFacetIndex:
+    """Immutable bitsets for every facet value"""
+    all: int
+    authors: MappingProxyType
+    terms: MappingProxyType
+    has_superscript: int
+    has_music: int
+    # verses_below[n] = psalms with fewer than n verses, for n in 0..MAX_VERSES + 1
+    verses_below: Tuple[int, ...]
+
+    def verse_range(self, min_verses: Optional[int] = None, max_verses: Optional[int] = None) -> int:
+        """Psalms with min_verses <= verse count <= max_verses"""
+        low = self.verses_below[min(max(min_verses or 0, 0), MAX_VERSES + 1)]
+        high_index = MAX_VERSES + 1 if max_verses is None else min(max(max_verses + 1, 0), MAX_VERSES + 1)
+        return self.verses_below[high_index] & ~low
+
+    def filter(self, authors: Iterable[str] = (), terms: Iterable[str] = (),
+               has_music: Optional[bool] = None, has_superscript: Optional[bool] = None,
+               min_verses: Optional[int] = None, max_verses: Optional[int] = None) -> int:
+        """
+        Bitset of psalms matching every given filter
+        Several authors match any of them; several terms must all match.
+        Unknown facet values raise KeyError.
+        """
+        bits = self.all
+
+        authors = list(authors)
+        if authors:
+            any_author = 0
+            for author in authors:
+                any_author |= self.authors[author]
+            bits &= any_author
+
+        for term in terms:
+            bits &= self.terms[term]
+
+        if has_music is not None:
+            bits &= self.has_music if has_music else ~self.has_music
+        if has_superscript is not None:
+            bits &= self.has_superscript if has_superscript else ~self.has_superscript
+        if min_verses is not None or max_verses is not None:
+            bits &= self.verse_range(min_verses, max_verses)
+
+        return bits & self.all
+
+    def counts(self, bits: int) -> Dict[str, Dict[str, int]]:
+        """Number of psalms per facet value within a result set"""
+        return {
+            'authors': {name: (bits & value).bit_count() for name, value in self.authors.items()},
+            'terms': {name: (bits & value).bit_count() for name, value in self.terms.items()},
+            'has_music': (bits & self.has_music).bit_count(),
+            'has_superscript': (bits & self.has_superscript).bit_count(),
+        }
+
+    def describe(self, psalm_number: int) -> Dict:
+        """Metadata of one psalm"""
+        bit = 1 << psalm_number
+        return {
+            'psalm_number': psalm_number,
+            'superscript': PSALM_SUPERSCRIPTS.get(psalm_number),
+            'authors': [name for name, value in self.authors.items() if value & bit],
+            'terms': [name for name, value in self.terms.items() if value & bit],
+            'has_music': bool(self.has_music & bit),
+            'verse_count': VERSE_COUNTS[psalm_number - 1],
+        }
+
+
+def _build_index() -> PsalmFacetIndex:
+    everything = bitset(range(1, TOTAL_PSALMS + 1))
+
+    authors = {name: bitset(get_superscripts_by_author(text)) for name, text in AUTHORS.items()}
+    attributed = 0
+    for value in authors.values():
+        attributed |= value
+    authors['anonymous'] = everything & ~attributed
+
+    terms = {name: bitset(get_musical_term_psalms(text)) for name, text in MUSICAL_TERMS.items()}
+    terms['selah'] = bitset(SELAH_PSALMS)
+
+    verses_below = [0] * (MAX_VERSES + 2)
+    for count in range(1, MAX_VERSES + 2):
+        verses_below[count] = verses_below[count - 1] | bitset(
+            number for number, verses in enumerate(VERSE_COUNTS, 1) if verses == count - 1)
+
+    return PsalmFacetIndex(
+        all=everything,
+        authors=MappingProxyType(authors),
+        terms=MappingProxyType(terms),
+        has_superscript=bitset(n for n, text in PSALM_SUPERSCRIPTS.items() if text),
+        has_music=bitset(MUSIC_CATALOG.psalms_with_music),
+        verses_below=tuple(verses_below),
+    )
+
+
+# Built once at import - metadata only changes with a deploy
+PSALM_FACETS = _build_index()
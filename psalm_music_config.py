@@ -1,4 +1,8 @@
 # Psalm Music Configuration
+import hashlib
+import json
+from dataclasses import dataclass
+from types import MappingProxyType
 # YouTube Video IDs from your curated playlist: https://youtube.com/playlist?list=PLlAZONCUO1iQr2m19nFmRLyTWdey-iXuh
 
 # Instructions for adding videos:
@@ -166,27 +170,96 @@ def get_psalm_alternate_videos(psalm_number):
 
 def has_psalm_music(psalm_number):
     """Check if a psalm has any music configured"""
-    primary = get_psalm_video_id(psalm_number)
-    alternates = get_psalm_alternate_videos(psalm_number)
-    return bool(primary) or bool(alternates)
+    return psalm_number in MUSIC_CATALOG.videos
 
 def get_all_psalm_videos(psalm_number):
     """Get all video IDs for a psalm (primary + alternates)"""
-    videos = []
-    primary = get_psalm_video_id(psalm_number)
-    if primary:
-        videos.append(primary)
-    videos.extend(get_psalm_alternate_videos(psalm_number))
-    return videos
+    return list(MUSIC_CATALOG.videos.get(psalm_number, ()))
 
 def get_psalms_with_music():
     """Get list of all psalm numbers that have music"""
-    psalms_with_music = []
-    for psalm_num in range(1, 151):  # Check all 150 psalms
-        if has_psalm_music(psalm_num):
-            psalms_with_music.append(psalm_num)
-    return psalms_with_music
+    return list(MUSIC_CATALOG.psalms_with_music)
 
 def get_total_psalm_count_with_music():
     """Get total count of psalms with music"""
-    return len(get_psalms_with_music())
\ No newline at end of file
+    return len(MUSIC_CATALOG.psalms_with_music)
+
+
+# Precompiled music catalog
+# The configuration above never changes at runtime, so the playlist and the
+# JSON bodies served by the music endpoints are built once at import.
+
+@dataclass(frozen=True)
+class JsonBody:
+    """Pre-serialized JSON response body with its ETag"""
+    data: bytes
+    etag: str
+
+@dataclass(frozen=True)
+class MusicCatalog:
+    psalms_with_music: tuple        # psalm numbers with at least one video
+    videos: MappingProxyType        # psalm number -> tuple of video IDs (primary first)
+    playlist: tuple                 # sequential playback entries, alternates included
+    playlist_json: JsonBody         # body for /api/psalms-with-music
+    psalm_music_json: MappingProxyType  # psalm number -> body for /api/psalm-music/<n>
+
+def _json_body(payload):
+    # Same encoding as jsonify (sorted keys, compact, trailing newline)
+    data = (json.dumps(payload, sort_keys=True, separators=(',', ':')) + '\n').encode('utf-8')
+    return JsonBody(data=data, etag=hashlib.sha1(data).hexdigest())
+
+def _build_catalog():
+    videos = {}
+    for psalm_num in range(1, 151):  # Check all 150 psalms
+        primary = get_psalm_video_id(psalm_num)
+        all_videos = ([primary] if primary else []) + [v for v in get_psalm_alternate_videos(psalm_num) if v]
+        if all_videos:
+            videos[psalm_num] = tuple(all_videos)
+
+    playlist = []
+    for psalm_num, psalm_videos in videos.items():
+        # Add each video as a separate entry for sequential playback
+        for i, video_id in enumerate(psalm_videos):
+            # For alternates, add a suffix to distinguish them (b, c, d, etc.)
+            suffix_letter = chr(ord('b') + i - 1) if i > 0 else ''
+            playlist.append(MappingProxyType({
+                'psalm_number': psalm_num,
+                'video_id': video_id,
+                'display_name': f"Psalm {psalm_num}{suffix_letter}",
+                'is_alternate': i > 0,
+                'alternate_index': i
+            }))
+
+    playlist_json = _json_body({
+        'success': True,
+        'psalms': [dict(entry) for entry in playlist],
+        'total': len(playlist)
+    })
+
+    psalm_music_json = {}
+    for psalm_num in range(1, 151):
+        if psalm_num in videos:
+            psalm_music_json[psalm_num] = _json_body({
+                'success': True,
+                'psalm_number': psalm_num,
+                'video_id': get_psalm_video_id(psalm_num),
+                'alternates': get_psalm_alternate_videos(psalm_num),
+                'has_music': True
+            })
+        else:
+            psalm_music_json[psalm_num] = _json_body({
+                'success': False,
+                'psalm_number': psalm_num,
+                'has_music': False,
+                'message': 'No music configured for this psalm'
+            })
+
+    return MusicCatalog(
+        psalms_with_music=tuple(videos),
+        videos=MappingProxyType(videos),
+        playlist=tuple(playlist),
+        playlist_json=playlist_json,
+        psalm_music_json=MappingProxyType(psalm_music_json)
+    )
+
+MUSIC_CATALOG = _build_catalog()
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Local full-text search over the Psalms for Pray150
+An in-process inverted index of every psalm verse, per translation, with
+tokenization, light English stemming, phrase ("still waters") and prefix
+(shep*) queries and BM25 ranking. The index is fed by every psalm the Bible
+API clients fetch and by a corpus snapshot file, so searches never touch the
+network.
+
+Build or refresh the snapshot:
+    python psalm_search.py --build ESV KJV     # fetch psalms 1-150 per translation
+    python psalm_search.py "still waters"      # query the snapshot
+"""
+
+import bisect
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Snapshot of fetched psalms the index is loaded from on first search
+DEFAULT_CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'psalm_corpus.json')
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Maximum number of vocabulary terms a prefix query expands to
+MAX_PREFIX_EXPANSIONS = 50
+
+TOTAL_PSALMS = 150
+
+_TOKEN_RE = re.compile(r"\w+(?:'\w+)*")
+_QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+_VOWELS = set('aeiouy')
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip diacritics (also Hebrew points and Greek accents)"""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize('NFD', text.lower())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Light suffix-stripping stemmer for English scripture text, including the
+    archaic -eth / -est verb forms of the KJV (maketh, leadest)
+    """
+    if len(word) <= 3 or not word.isascii():
+        return word
+
+    if word.endswith("'s"):
+        word = word[:-2]
+    elif word.endswith("s'"):
+        word = word[:-1]
+
+    if word.endswith('sses'):
+        word = word[:-2]
+    elif word.endswith('ies') and len(word) > 4:
+        word = word[:-3] + 'y'
+    elif word.endswith('s') and not word.endswith(('ss', 'us', 'is')) and len(word) > 3:
+        word = word[:-1]
+
+    for suffix, min_length in (('ing', 6), ('eth', 6), ('est', 7), ('ed', 5), ('ly', 6)):
+        if word.endswith(suffix) and len(word) >= min_length:
+            base = word[:-len(suffix)]
+            if not _VOWELS.intersection(base):
+                break
+            word = base
+            # running -> run, stopped -> stop (but not bless, fall, buzz)
+            if suffix in ('ing', 'ed') and len(word) > 2 and word[-1] == word[-2] and word[-1] not in 'lsz':
+                word = word[:-1]
+            break
+
+    if word.endswith('e') and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into stemmed index terms"""
+    return [stem(token) for token in _TOKEN_RE.findall(_fold(text or ''))]
+
+
+def parse_query(query: str) -> List[Dict]:
+    """
+    Parse a query into clauses: quoted phrases, prefix terms (ending in *)
+    and plain terms. Every clause must match a verse.
+    """
+    clauses = []
+    for phrase, word in _QUERY_RE.findall(query or ''):
+        if phrase:
+            terms = tokenize(phrase)
+            if len(terms) > 1:
+                clauses.append({'type': 'phrase', 'terms': terms})
+            elif terms:
+                clauses.append({'type': 'term', 'term': terms[0]})
+        elif word.endswith('*'):
+            prefix = ''.join(_TOKEN_RE.findall(_fold(word[:-1])))
+            # Index terms are stemmed, so "blessing*" should also match "bless"
+            stemmed = stem(prefix)
+            if prefix.startswith(stemmed):
+                prefix = stemmed
+            if prefix:
+                clauses.append({'type': 'prefix', 'prefix': prefix})
+        else:
+            clauses.extend({'type': 'term', 'term': term} for term in tokenize(word))
+    return clauses
+
+
+class _TranslationIndex:
+    """Postings and statistics for one translation"""
+
+    def __init__(self):
+        self.postings = defaultdict(dict)   # term -> {doc_id: [positions]}
+        self.doc_lengths = {}               # doc_id -> number of terms
+        self.total_length = 0
+        self._vocabulary = None             # sorted terms, rebuilt lazily for prefix queries
+
+    @property
+    def doc_count(self):
+        return len(self.doc_lengths)
+
+    @property
+    def vocabulary(self):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        return self._vocabulary
+
+    def add(self, doc_id, terms):
+        for position, term in enumerate(terms):
+            self.postings[term].setdefault(doc_id, []).append(position)
+        self.doc_lengths[doc_id] = len(terms)
+        self.total_length += len(terms)
+        self._vocabulary = None
+
+    def remove(self, doc_id, terms):
+        for term in set(terms):
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id, 0)
+        self._vocabulary = None
+
+    def expand_prefix(self, prefix):
+        vocabulary = self.vocabulary
+        start = bisect.bisect_left(vocabulary, prefix)
+        terms = []
+        for term in vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def phrase_matches(self, terms):
+        """doc_id -> number of occurrences of the exact term sequence"""
+        candidates = None
+        for term in terms:
+            docs = self.postings.get(term)
+            if not docs:
+                return {}
+            candidates = set(docs) if candidates is None else candidates & docs.keys()
+            if not candidates:
+                return {}
+
+        matches = {}
+        for doc_id in candidates:
+            starts = set(self.postings[terms[0]][doc_id])
+            for offset, term in enumerate(terms[1:], 1):
+                positions = self.postings[term][doc_id]
+                starts &= {position - offset for position in positions}
+                if not starts:
+                    break
+            if starts:
+                matches[doc_id] = len(starts)
+        return matches
+
+    def bm25(self, frequencies):
+        """Score {doc_id: term frequency} for one term or phrase"""
+        if not frequencies:
+            return {}
+        n = self.doc_count
+        df = len(frequencies)
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        avg_length = self.total_length / n if n else 1
+        scores = {}
+        for doc_id, tf in frequencies.items():
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / avg_length)
+            scores[doc_id] = idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def clause_scores(self, clause):
+        if clause['type'] == 'phrase':
+            return self.bm25(self.phrase_matches(clause['terms']))
+
+        if clause['type'] == 'prefix':
+            terms = self.expand_prefix(clause['prefix'])
+        else:
+            terms = [clause['term']]
+
+        scores = {}
+        for term in terms:
+            frequencies = {doc_id: len(positions) for doc_id, positions in self.postings.get(term, {}).items()}
+            for doc_id, score in self.bm25(frequencies).items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+        return scores
+
+    def search(self, clauses):
+        """doc_id -> BM25 score for verses matching every clause"""
+        combined = None
+        for clause in clauses:
+            scores = self.clause_scores(clause)
+            if combined is None:
+                combined = scores
+            else:
+                combined = {doc_id: combined[doc_id] + score
+                            for doc_id, score in scores.items() if doc_id in combined}
+            if not combined:
+                return {}
+        return combined or {}
+
+
+class PsalmSearchIndex:
+    """Inverted index of psalm verses across translations"""
+
+    def __init__(self, corpus_file: Optional[str] = None):
+        self.corpus_file = corpus_file
+        self._translations = {}   # translation -> _TranslationIndex
+        self._docs = {}           # doc_id -> verse record
+        self._psalm_docs = {}     # (translation, psalm_number) -> [doc_id]
+        self._next_doc_id = 0
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def translations(self) -> List[str]:
+        """Translations that have at least one psalm indexed"""
+        with self._lock:
+            return sorted(t for t, index in self._translations.items() if index.doc_count)
+
+    def psalm_count(self, translation: str) -> int:
+        """Number of psalms indexed for a translation"""
+        with self._lock:
+            return sum(1 for (t, _) in self._psalm_docs if t == translation)
+
+    def add_psalm(self, psalm_data: Dict):
+        """
+        Index (or re-index) one psalm as returned by BibleAPI.get_psalm
+        Each verse becomes a searchable document.
+        """
+        translation = (psalm_data.get('translation') or '').upper()
+        psalm_number = psalm_data.get('psalm_number')
+        verses = psalm_data.get('verses') or []
+        if not translation or not psalm_number or not verses:
+            return
+
+        with self._lock:
+            self._remove_psalm(translation, psalm_number)
+            index = self._translations.setdefault(translation, _TranslationIndex())
+            doc_ids = []
+            for verse in verses:
+                text = verse.get('text') or ''
+                terms = tokenize(text)
+                if not terms:
+                    continue
+                doc_id = self._next_doc_id
+                self._next_doc_id += 1
+                self._docs[doc_id] = {
+                    'psalm_number': psalm_number,
+                    'verse_number': verse.get('verse_number'),
+                    'text': text,
+                    'verse_id': verse.get('verse_id'),
+                    'translation': translation,
+                    '_terms': terms,
+                }
+                index.add(doc_id, terms)
+                doc_ids.append(doc_id)
+            self._psalm_docs[(translation, psalm_number)] = doc_ids
+
+    def _remove_psalm(self, translation, psalm_number):
+        doc_ids = self._psalm_docs.pop((translation, psalm_number), None)
+        if not doc_ids:
+            return
+        index = self._translations[translation]
+        for doc_id in doc_ids:
+            index.remove(doc_id, self._docs.pop(doc_id)['_terms'])
+
+    def search(self, query: str, translation: Optional[str] = None, limit: int = 10,
+               offset: int = 0) -> List[Dict]:
+        """
+        Search verses, best matches first
+
+        Args:
+            query: Terms, "quoted phrases" and prefix* terms (all must match)
+            translation: Translation code, or None to search every translation
+            limit: Maximum number of results
+            offset: Number of results to skip (pagination)
+
+        Returns:
+            List of verse dicts with psalm_number, verse_number, text,
+            verse_id, translation and score
+        """
+        self.ensure_loaded()
+        clauses = parse_query(query)
+        if not clauses:
+            return []
+
+        with self._lock:
+            if translation:
+                indexes = [self._translations.get(translation.upper())]
+            else:
+                indexes = list(self._translations.values())
+
+            scores = {}
+            for index in indexes:
+                if index is not None and index.doc_count:
+                    scores.update(index.search(clauses))
+
+            # Best scores first, ties in canonical psalm/verse/translation order
+            def rank_key(doc_id):
+                doc = self._docs[doc_id]
+                return (-scores[doc_id], doc['psalm_number'], doc['verse_number'] or 0, doc['translation'])
+
+            ranked = heapq.nsmallest(offset + limit, scores, key=rank_key)
+
+            results = []
+            for doc_id in ranked[offset:]:
+                score = scores[doc_id]
+                record = {key: value for key, value in self._docs[doc_id].items() if key != '_terms'}
+                record['score'] = round(score, 4)
+                results.append(record)
+            return results
+
+    def has_documents(self, translation: Optional[str] = None) -> bool:
+        """Whether anything (or anything in the given translation) is indexed"""
+        self.ensure_loaded()
+        with self._lock:
+            if translation:
+                index = self._translations.get(translation.upper())
+                return bool(index and index.doc_count)
+            return bool(self._docs)
+
+    def is_complete(self, translation: Optional[str] = None) -> bool:
+        """
+        Whether all 150 psalms are indexed for the translation (or, without
+        one, for every translation indexed) - searches over a partial corpus
+        would silently miss verses
+        """
+        self.ensure_loaded()
+        translations = [translation.upper()] if translation else self.translations()
+        return bool(translations) and all(self.psalm_count(t) >= TOTAL_PSALMS for t in translations)
+
+    def ensure_loaded(self):
+        """Load the corpus snapshot on first use"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            path = self.corpus_file or os.environ.get('PSALM_CORPUS_FILE', DEFAULT_CORPUS_FILE)
+            self.load(path)
+
+    def load(self, path: str) -> int:
+        """Index every psalm in a snapshot file; returns the number of psalms"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                psalms = json.load(f)
+        except FileNotFoundError:
+            logger.info(f"No psalm corpus snapshot at {path} - index starts empty")
+            return 0
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read psalm corpus snapshot {path}: {e}")
+            return 0
+
+        for psalm_data in psalms:
+            self.add_psalm(psalm_data)
+        logger.info(f"Indexed {len(psalms)} psalms ({len(self._docs)} verses) from {path}")
+        return len(psalms)
+
+    def save(self, path: str):
+        """Write every indexed psalm to a snapshot file"""
+        with self._lock:
+            psalms = []
+            for (translation, psalm_number), doc_ids in sorted(self._psalm_docs.items()):
+                psalms.append({
+                    'psalm_number': psalm_number,
+                    'translation': translation,
+                    'verses': [
+                        {key: self._docs[doc_id][key] for key in ('verse_number', 'text', 'verse_id')}
+                        for doc_id in doc_ids
+                    ]
+                })
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(psalms, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+# Global index instance, fed by bible_api.BibleAPI.get_psalm
+psalm_index = PsalmSearchIndex()
+
+
+def build_corpus(translations: List[str], path: str = DEFAULT_CORPUS_FILE):
+    """Fetch psalms 1-150 in each translation and write the snapshot"""
+    from bible_api import bible_api
+
+    for translation in translations:
+        fetched = 0
+        for psalm_number in range(1, 151):
+            if bible_api.get_psalm(psalm_number, translation):
+                fetched += 1
+        print(f"✓ {translation}: {fetched}/150 psalms indexed")
+    psalm_index.save(path)
+    print(f"✓ Wrote {len(psalm_index)} verses to {path}")
+
+
+def main():
+    # Use the importable module so bible_api feeds the same index instance
+    import psalm_search
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--build':
+        psalm_search.psalm_index.ensure_loaded()
+        psalm_search.build_corpus([t.upper() for t in sys.argv[2:]] or ['ESV'])
+        return
+
+    query = ' '.join(sys.argv[1:])
+    if not query:
+        print(__doc__)
+        return
+    for result in psalm_search.psalm_index.search(query, limit=10):
+        print(f"{result['score']:>7.3f}  Psalm {result['psalm_number']}:{result['verse_number']} "
+              f"({result['translation']}) {result['text']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,8 @@ Psalm Superscripts/Inscriptions Database for Pray150
 Contains authorship, musical directions, and historical contexts for all 150 Psalms
 """
 
+from functools import lru_cache
+
 PSALM_SUPERSCRIPTS = {
     1: None,  # No superscript
     2: None,  # No superscript 
@@ -166,27 +168,19 @@ def has_superscript(psalm_number: int) -> bool:
     """Check if a psalm has a superscript"""
     return get_psalm_superscript(psalm_number) is not None
 
+@lru_cache(maxsize=128)
+def _psalms_with_superscript_text(text_lower: str) -> tuple:
+    """Psalm numbers whose superscript contains the (lowercased) text, computed once per text"""
+    return tuple(psalm_num for psalm_num, superscript in PSALM_SUPERSCRIPTS.items()
+                 if superscript and text_lower in superscript.lower())
+
 def get_superscripts_by_author(author: str) -> list:
     """Get all psalm numbers attributed to a specific author"""
-    author_lower = author.lower()
-    results = []
-    
-    for psalm_num, superscript in PSALM_SUPERSCRIPTS.items():
-        if superscript and author_lower in superscript.lower():
-            results.append(psalm_num)
-    
-    return results
+    return list(_psalms_with_superscript_text(author.lower()))
 
 def get_musical_term_psalms(term: str) -> list:
     """Get all psalms that contain a specific musical term"""
-    term_lower = term.lower()
-    results = []
-    
-    for psalm_num, superscript in PSALM_SUPERSCRIPTS.items():
-        if superscript and term_lower in superscript.lower():
-            results.append(psalm_num)
-    
-    return results
+    return list(_psalms_with_superscript_text(term.lower()))
 
 # Statistics
 DAVID_PSALMS = get_superscripts_by_author("David")  # 73 psalms
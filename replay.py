@@ -0,0 +1,302 @@
+"""
+Record/replay transport for the upstream Bible providers
+A requests transport adapter that ProviderSession (upstream.py) mounts when
+BIBLE_REPLAY is set, so rkeplin, bolls.life and API.Bible traffic can be
+captured once and replayed offline:
+  BIBLE_REPLAY              record - call the provider and store the response
+                            replay - answer from the archive only (misses
+                                     raise ConnectionError)
+                            auto   - replay, recording misses
+  BIBLE_REPLAY_PATH         archive file (default instance/bible_recordings.jsonl.gz)
+  BIBLE_REPLAY_LATENCY_MS   latency added to replayed calls: "40", a "20-80"
+                            range, or "recorded" for the recorded latency
+  BIBLE_REPLAY_ERROR_RATE   fraction of replayed calls that fail (default 0)
+  BIBLE_REPLAY_ERRORS       failure kinds: status (HTTP 503), timeout,
+                            connection - comma separated (default status)
+  BIBLE_REPLAY_SEED         seed for latency jitter and failures (default 150)
+
+The archive is gzipped JSON lines, one response per line keyed on method
+and URL (query parameters sorted; request headers such as API keys are never
+stored). Recording appends a gzip member per response; `python replay.py
+compact` rewrites it as one. Server errors are not recorded.
+
+Usage:
+    BIBLE_REPLAY=record python replay.py record [--psalms 1-150] [--translations NIV,ESV]
+    python replay.py stats
+    BIBLE_REPLAY=replay BIBLE_REPLAY_LATENCY_MS=20-80 BIBLE_REPLAY_ERROR_RATE=0.05 gunicorn ...
+"""
+
+import gzip
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from http.client import responses as HTTP_REASONS
+from typing import Dict, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+REPLAY_MODES = ('record', 'replay', 'auto')
+ERROR_KINDS = ('status', 'timeout', 'connection')
+
+DEFAULT_REPLAY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance',
+                                   'bible_recordings.jsonl.gz')
+
+
+def request_key(method: str, url: str) -> str:
+    """Archive key: method and URL with its query parameters sorted"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))}"
+
+
+def parse_latency(spec: Optional[str]):
+    """(low_ms, high_ms), 'recorded' or None from BIBLE_REPLAY_LATENCY_MS"""
+    spec = (spec or '').strip().lower()
+    if not spec:
+        return None
+    if spec == 'recorded':
+        return spec
+    low, _, high = spec.partition('-')
+    return float(low), float(high or low)
+
+
+class FixtureArchive:
+    """Recorded responses by request key, backed by a gzipped JSON lines file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries = None
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self) -> Dict[str, Dict]:
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._read()
+            return self._entries
+
+    def _read(self) -> Dict[str, Dict]:
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+        # Concatenated gzip members read as one stream; later lines win
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries[entry['key']] = entry
+        return entries
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.entries.get(key)
+
+    def add(self, entry: Dict):
+        entries = self.entries
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            entries[entry['key']] = entry
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                f.write(line)
+
+    def compact(self):
+        """Rewrite the archive as a single gzip member without superseded lines"""
+        entries = self.entries
+        with self._lock:
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+                for key in sorted(entries):
+                    f.write(json.dumps(entries[key], ensure_ascii=False, separators=(',', ':')) + '\n')
+            os.replace(temp_path, self.path)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def build_response(request, status: int, body: str = '', content_type: str = 'application/json',
+                   adapter=None) -> requests.Response:
+    """requests.Response for a request, as if it came off the wire"""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = HTTP_REASONS.get(status, '')
+    response.headers = CaseInsensitiveDict({'Content-Type': content_type})
+    response._content = body.encode('utf-8')
+    response.encoding = 'utf-8'
+    response.url = request.url
+    response.request = request
+    response.connection = adapter
+    return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter that records responses to, or replays them from, an archive"""
+
+    def __init__(self, archive: FixtureArchive, mode: str = 'replay', latency_ms=None,
+                 error_rate: float = 0.0, errors: Sequence[str] = ('status',), seed=150):
+        super().__init__()
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Unknown replay mode {mode!r} (expected one of {', '.join(REPLAY_MODES)})")
+        unknown = set(errors) - set(ERROR_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown error kinds: {', '.join(sorted(unknown))}")
+        self.archive = archive
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.errors = tuple(errors) or ('status',)
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = request_key(request.method, request.url)
+        if self.mode != 'record':
+            entry = self.archive.get(key)
+            if entry is not None:
+                return self._replay(request, entry, timeout)
+            if self.mode == 'replay':
+                raise requests.ConnectionError(f"No recorded response for {key}", request=request)
+
+        started = time.perf_counter()
+        response = super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert,
+                                proxies=proxies)
+        if response.status_code < 500:
+            self.archive.add({
+                'key': key,
+                'status': response.status_code,
+                'content_type': response.headers.get('Content-Type', 'application/json'),
+                'body': response.text,
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+            })
+        return response
+
+    def _replay(self, request, entry: Dict, timeout) -> requests.Response:
+        with self._random_lock:
+            if self.latency_ms == 'recorded':
+                delay_ms = entry.get('elapsed_ms', 0)
+            elif self.latency_ms:
+                delay_ms = self._random.uniform(*self.latency_ms)
+            else:
+                delay_ms = 0
+            failure = self._random.choice(self.errors) if self._random.random() < self.error_rate else None
+
+        if failure == 'timeout':
+            read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+            time.sleep(min(delay_ms / 1000, read_timeout or delay_ms / 1000))
+            raise requests.ReadTimeout(f"Injected timeout for {request.url}", request=request)
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+        if failure == 'connection':
+            raise requests.ConnectionError(f"Injected connection error for {request.url}", request=request)
+        if failure == 'status':
+            return build_response(request, 503, '{"detail": "Injected failure"}', adapter=self)
+        return build_response(request, entry['status'], entry['body'], entry.get('content_type', 'application/json'),
+                              adapter=self)
+
+
+_archives = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(path: Optional[str] = None) -> FixtureArchive:
+    """Archive shared by every session in the process"""
+    path = path or os.environ.get('BIBLE_REPLAY_PATH') or DEFAULT_REPLAY_PATH
+    with _archives_lock:
+        if path not in _archives:
+            _archives[path] = FixtureArchive(path)
+        return _archives[path]
+
+
+def adapter_from_env(provider: str = '') -> Optional[ReplayAdapter]:
+    """ReplayAdapter configured from BIBLE_REPLAY_*, or None when replay is off"""
+    mode = os.environ.get('BIBLE_REPLAY', '').strip().lower()
+    if not mode:
+        return None
+    errors = [kind.strip() for kind in os.environ.get('BIBLE_REPLAY_ERRORS', 'status').split(',') if kind.strip()]
+    return ReplayAdapter(
+        get_archive(),
+        mode=mode,
+        latency_ms=parse_latency(os.environ.get('BIBLE_REPLAY_LATENCY_MS')),
+        error_rate=float(os.environ.get('BIBLE_REPLAY_ERROR_RATE', '0')),
+        errors=errors,
+        # Per provider, so one provider's traffic does not shift another's failures
+        seed=f"{os.environ.get('BIBLE_REPLAY_SEED', '150')}:{provider}",
+    )
+
+
+def install_replay(session: requests.Session, provider: str = '') -> Optional[ReplayAdapter]:
+    """Mount the configured ReplayAdapter on a session for http and https"""
+    adapter = adapter_from_env(provider)
+    if adapter is not None:
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+    return adapter
+
+
+def _parse_range(spec: str) -> Tuple[int, int]:
+    low, _, high = spec.partition('-')
+    return int(low), int(high or low)
+
+
+def record_psalms(psalms: Tuple[int, int], translations: Sequence[str]) -> int:
+    """Fetch psalms through every provider so their responses are recorded"""
+    from bible_api import BibleAPI
+    from bolls_bible_api import BollsBibleAPI
+    from upstream import rate_limited
+
+    rkeplin = BibleAPI()
+    bolls = BollsBibleAPI()
+    fetched = 0
+    for translation in translations:
+        # CSB/NASB go through API.Bible (needs API_BIBLE_KEY)
+        fetched += sum(1 for _ in rkeplin.get_psalm_range(psalms[0], psalms[1], translation))
+    for number in range(psalms[0], psalms[1] + 1):
+        for psalm in rate_limited(bolls.get_psalm_both_languages, number).values():
+            fetched += psalm is not None
+    return fetched
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    archive = get_archive()
+
+    if command == 'record':
+        if os.environ.get('BIBLE_REPLAY', '').lower() not in ('record', 'auto'):
+            os.environ['BIBLE_REPLAY'] = 'auto'
+        psalms = (1, 150)
+        translations = ['NIV', 'ESV', 'NLT', 'KJV']
+        if '--psalms' in sys.argv:
+            psalms = _parse_range(sys.argv[sys.argv.index('--psalms') + 1])
+        if '--translations' in sys.argv:
+            translations = sys.argv[sys.argv.index('--translations') + 1].split(',')
+        fetched = record_psalms(psalms, translations)
+        print(f"✓ Fetched {fetched} psalms; {len(archive)} responses in {archive.path}")
+    elif command == 'compact':
+        archive.compact()
+        print(f"✓ Compacted {len(archive)} responses into {archive.path}")
+    elif command == 'stats':
+        if not len(archive):
+            print(f"❌ No recordings in {archive.path}")
+            sys.exit(1)
+        hosts = {}
+        for key in archive.entries:
+            host = urlsplit(key.split(' ', 1)[1]).netloc
+            hosts[host] = hosts.get(host, 0) + 1
+        print(f"{len(archive)} responses in {archive.path} ({os.path.getsize(archive.path) / 1024:.0f} KB)")
+        for host, count in sorted(hosts.items()):
+            print(f"  {host:40} {count:>6}")
+    else:
+        print(__doc__)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,29 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify
+import logging
+from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify, current_app
 from flask_login import login_required, current_user
 from models import Psalm, JournalEntry, Prayer, PsalmProgress, User
-from psalm_data import initialize_psalms
 from datetime import datetime, timedelta
 from database import get_supabase_client
 from bible_api import bible_api, get_psalm, get_daily_psalm, get_available_translations
+from metrics import registry as metrics
+
+logger = logging.getLogger(__name__)
 
 main_bp = Blueprint('main', __name__)
 
+# Scripture text is effectively static, so psalm JSON can be cached by clients
+# and proxies (and is compressed once by the compression layer)
+SCRIPTURE_CACHE_MAX_AGE = 86400
+
+# The music catalog only changes on deploy; clients revalidate with the ETag
+MUSIC_CATALOG_MAX_AGE = 3600
+
+def cacheable(response, max_age=SCRIPTURE_CACHE_MAX_AGE):
+    """Mark a response as publicly cacheable"""
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response
+
 @main_bp.route('/')
 def index():
     return render_template('index.html')
@@ -48,7 +64,7 @@ def fix_profile():
             flash('Profile already exists.', 'info')
             
     except Exception as e:
-        print(f"Profile fix error: {e}")
+        logger.error("Profile fix error: %s", e)
         flash('Error fixing profile.', 'error')
     
     return redirect(url_for('main.dashboard'))
@@ -56,12 +72,6 @@ def fix_profile():
 @main_bp.route('/dashboard')
 @login_required
 def dashboard():
-    # Initialize psalms if needed
-    psalm_count = Psalm.get_count()
-    if psalm_count == 0:
-        initialize_psalms()
-        psalm_count = Psalm.get_count()
-    
     # Get user's current psalm number in their sequential progression
     current_psalm_number = current_user.get_current_psalm_number()
     
@@ -85,9 +95,13 @@ def dashboard():
     psalms_this_week = PsalmProgress.get_week_count_by_user(current_user.id)
     total_journal_entries = JournalEntry.get_count_by_user(current_user.id)
     
-    # Get emotion trends for heart tracker
-    emotion_trends_week = JournalEntry.get_emotion_trends(current_user.id, days_back=7)
-    emotion_trends_month = JournalEntry.get_emotion_trends(current_user.id, days_back=30)
+    # Get emotion trends for heart tracker: both windows from one query, and
+    # the past year from the daily aggregates
+    from emotion_analytics import emotion_analytics
+    emotion_trends = emotion_analytics.trends(current_user.id, windows=(7, 30))
+    emotion_trends_week = emotion_trends[7]
+    emotion_trends_month = emotion_trends[30]
+    emotion_trends_year = emotion_analytics.daily(current_user.id, days=365)
     
     # Get dates with journal entries for calendar highlighting
     journal_dates = JournalEntry.get_entry_dates_by_user(current_user.id)
@@ -107,6 +121,7 @@ def dashboard():
                          total_journal_entries=total_journal_entries,
                          emotion_trends_week=emotion_trends_week,
                          emotion_trends_month=emotion_trends_month,
+                         emotion_trends_year=emotion_trends_year,
                          journal_dates=journal_dates,
                          progress_stats=progress_stats)
 
@@ -152,44 +167,27 @@ def pre_reflection_journal(psalm_number):
                          emotion=emotion,
                          is_explore=is_explore)
 
-@main_bp.route('/journal-history')
-@login_required
-def journal_history():
-    """Display all journal entries with search and filter capabilities"""
-    # Get search parameters
-    search_psalm = request.args.get('psalm', type=int)
-    search_date = request.args.get('date')
-    search_text = request.args.get('search', '').strip()
-    page = request.args.get('page', 1, type=int)
-    per_page = 12  # entries per page
-    
+def filter_journal_entries(user_id, psalm_id, filter_date, page, per_page):
+    """List a user's journal entries newest first, filtered by psalm and date"""
     # Get all journal entries for the user
-    all_entries = JournalEntry.get_all_by_user(current_user.id)
-    print(f"DEBUG: Journal history - found {len(all_entries)} total entries for user {current_user.id}")
+    all_entries = JournalEntry.get_all_by_user(user_id)
+    logger.debug("Journal history - found %s total entries for user %s", len(all_entries), user_id)
     
     # Apply filters
     filtered_entries = all_entries
     
     # Filter by psalm number
-    if search_psalm:
-        filtered_entries = [entry for entry in filtered_entries if entry.psalm_id == search_psalm]
+    if psalm_id:
+        filtered_entries = [entry for entry in filtered_entries if entry.psalm_id == psalm_id]
     
     # Filter by date
-    if search_date:
+    if filter_date:
         try:
-            filter_date = datetime.strptime(search_date, '%Y-%m-%d').date()
             filtered_entries = [entry for entry in filtered_entries 
                               if entry.created_at and 
                               datetime.fromisoformat(entry.created_at.replace('Z', '+00:00')).date() == filter_date]
         except (ValueError, AttributeError):
-            flash('Invalid date format. Please use YYYY-MM-DD.', 'error')
-    
-    # Filter by text content
-    if search_text:
-        search_lower = search_text.lower()
-        filtered_entries = [entry for entry in filtered_entries 
-                          if any(search_lower in str(response).lower() 
-                                for response in entry.prompt_responses.values())]
+            pass
     
     # Sort by creation date (newest first) - handle string dates from Supabase
     def get_sort_date(entry):
@@ -206,7 +204,36 @@ def journal_history():
     total = len(filtered_entries)
     start = (page - 1) * per_page
     end = start + per_page
-    entries = filtered_entries[start:end]
+    return filtered_entries[start:end], total, start, end
+
+@main_bp.route('/journal-history')
+@login_required
+def journal_history():
+    """Display all journal entries with search and filter capabilities"""
+    # Get search parameters
+    search_psalm = request.args.get('psalm', type=int)
+    search_date = request.args.get('date')
+    search_text = request.args.get('search', '').strip()
+    page = request.args.get('page', 1, type=int)
+    per_page = 12  # entries per page
+    
+    filter_date = None
+    if search_date:
+        try:
+            filter_date = datetime.strptime(search_date, '%Y-%m-%d').date()
+        except ValueError:
+            flash('Invalid date format. Please use YYYY-MM-DD.', 'error')
+    
+    if search_text:
+        # Ranked, paginated full-text search with highlighted snippets
+        entries, total = JournalEntry.search(current_user.id, search_text,
+                                             psalm_id=search_psalm, date=filter_date,
+                                             page=page, per_page=per_page)
+        start = (page - 1) * per_page
+        end = start + len(entries)
+    else:
+        entries, total, start, end = filter_journal_entries(current_user.id, search_psalm, filter_date,
+                                                            page, per_page)
     
     # Calculate pagination info
     has_prev = page > 1
@@ -231,6 +258,39 @@ def journal_history():
                          search_text=search_text,
                          journal_dates=journal_dates)
 
+@main_bp.route('/api/journal/search')
+@login_required
+def api_search_journal():
+    """API endpoint for ranked journal search with highlighted snippets"""
+    query = request.args.get('q', '').strip()
+    psalm_id = request.args.get('psalm', type=int)
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 12, type=int), 1), 50)
+    
+    if not query:
+        return jsonify({
+            'success': False,
+            'error': 'Search query is required'
+        }), 400
+    
+    entries, total = JournalEntry.search(current_user.id, query, psalm_id=psalm_id,
+                                         page=page, per_page=per_page)
+    return jsonify({
+        'success': True,
+        'query': query,
+        'data': [{
+            'id': entry.id,
+            'psalm_id': entry.psalm_id,
+            'created_at': entry.created_at,
+            'rank': entry.rank,
+            'snippet': str(entry.snippet)
+        } for entry in entries],
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'has_next': (page - 1) * per_page + len(entries) < total
+    })
+
 @main_bp.route('/api/psalms/<int:number>')
 def api_get_psalm(number):
     """API endpoint to retrieve psalm data by number from Bible API"""
@@ -249,10 +309,10 @@ def api_get_psalm(number):
         psalm_data = get_psalm(number, translation)
         
         if psalm_data:
-            return jsonify({
+            return cacheable(jsonify({
                 'success': True,
                 'data': psalm_data
-            })
+            }))
         else:
             return jsonify({
                 'success': False,
@@ -284,12 +344,12 @@ def api_get_psalm_multiple_translations(number):
         psalm_data = bible_api.get_psalm_multiple_translations(number, translations)
         
         if psalm_data:
-            return jsonify({
+            return cacheable(jsonify({
                 'success': True,
                 'data': psalm_data,
                 'psalm_number': number,
                 'translations_count': len(psalm_data)
-            })
+            }))
         else:
             return jsonify({
                 'success': False,
@@ -307,11 +367,11 @@ def api_get_translations():
     """API endpoint to get available Bible translations"""
     try:
         translations = get_available_translations()
-        return jsonify({
+        return cacheable(jsonify({
             'success': True,
             'data': translations,
             'count': len(translations)
-        })
+        }))
     except Exception as e:
         return jsonify({
             'success': False,
@@ -323,7 +383,8 @@ def api_search_psalms():
     """API endpoint to search psalms"""
     try:
         query = request.args.get('q', '').strip()
-        limit = request.args.get('limit', 10, type=int)
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+        translation = request.args.get('translation', '').strip().upper() or None
         
         if not query:
             return jsonify({
@@ -331,12 +392,19 @@ def api_search_psalms():
                 'error': 'Search query is required'
             }), 400
         
-        results = bible_api.search_psalms(query, limit)
+        if translation and translation not in bible_api.AVAILABLE_TRANSLATIONS:
+            return jsonify({
+                'success': False,
+                'error': f'Unknown translation: {translation}'
+            }), 400
+        
+        results = bible_api.search_psalms(query, limit, translation)
         
         return jsonify({
             'success': True,
             'data': results,
             'query': query,
+            'translation': translation,
             'count': len(results)
         })
         
@@ -346,6 +414,54 @@ def api_search_psalms():
             'error': str(e)
         }), 500
 
+def parse_bool_arg(name):
+    """Read an optional true/false query parameter"""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+def parse_list_arg(name):
+    """Read a repeatable or comma-separated query parameter"""
+    values = []
+    for value in request.args.getlist(name):
+        values.extend(item.strip().lower() for item in value.split(',') if item.strip())
+    return values
+
+@main_bp.route('/api/psalms/browse')
+def api_browse_psalms():
+    """API endpoint to browse psalms by metadata facets (author, musical terms, music, verse count)"""
+    from psalm_facets import PSALM_FACETS, psalm_numbers
+    
+    authors = parse_list_arg('author')
+    terms = parse_list_arg('term')
+    unknown = [a for a in authors if a not in PSALM_FACETS.authors] + \
+              [t for t in terms if t not in PSALM_FACETS.terms]
+    if unknown:
+        return jsonify({
+            'success': False,
+            'error': f"Unknown facet value: {', '.join(unknown)}",
+            'authors': list(PSALM_FACETS.authors),
+            'terms': list(PSALM_FACETS.terms)
+        }), 400
+    
+    matches = PSALM_FACETS.filter(
+        authors=authors,
+        terms=terms,
+        has_music=parse_bool_arg('has_music'),
+        has_superscript=parse_bool_arg('has_superscript'),
+        min_verses=request.args.get('min_verses', type=int),
+        max_verses=request.args.get('max_verses', type=int)
+    )
+    numbers = psalm_numbers(matches)
+    
+    return cacheable(jsonify({
+        'success': True,
+        'count': len(numbers),
+        'psalms': [PSALM_FACETS.describe(number) for number in numbers],
+        'facets': PSALM_FACETS.counts(matches)
+    }), max_age=MUSIC_CATALOG_MAX_AGE)
+
 @main_bp.route('/bible-api-demo')
 def bible_api_demo():
     """Demo page to showcase Bible API integration"""
@@ -357,29 +473,29 @@ def bible_api_demo():
 def listen():
     """Listen page for continuous psalm music playback"""
     try:
-        # Import the music configuration
-        from psalm_music_config import has_psalm_music
-        
-        # Get list of psalms that have music configured
-        psalms_with_music = []
-        for psalm_num in range(1, 151):
-            if has_psalm_music(psalm_num):
-                psalms_with_music.append(psalm_num)
+        # Psalms with music come from the precompiled music catalog
+        from psalm_music_config import MUSIC_CATALOG
         
         return render_template('listen.html', 
-                             psalms_with_music=psalms_with_music,
-                             total_psalms_with_music=len(psalms_with_music))
+                             psalms_with_music=MUSIC_CATALOG.psalms_with_music,
+                             total_psalms_with_music=len(MUSIC_CATALOG.psalms_with_music))
                              
     except Exception as e:
         flash(f'Error loading listen page: {str(e)}', 'error')
         return redirect(url_for('main.dashboard'))
 
+def music_catalog_response(body):
+    """Serve a pre-serialized music catalog body, honouring If-None-Match"""
+    response = current_app.response_class(body.data, mimetype='application/json')
+    response.set_etag(body.etag)
+    cacheable(response, max_age=MUSIC_CATALOG_MAX_AGE)
+    return response.make_conditional(request)
+
 @main_bp.route('/api/psalm-music/<int:psalm_number>')
 def api_psalm_music(psalm_number):
     """API endpoint to get music for a specific psalm"""
     try:
-        # Import the music configuration
-        from psalm_music_config import get_psalm_video_id, get_psalm_alternate_videos, has_psalm_music
+        from psalm_music_config import MUSIC_CATALOG
         
         if not (1 <= psalm_number <= 150):
             return jsonify({
@@ -387,24 +503,7 @@ def api_psalm_music(psalm_number):
                 'error': 'Invalid psalm number'
             }), 400
         
-        video_id = get_psalm_video_id(psalm_number)
-        alternates = get_psalm_alternate_videos(psalm_number)
-        
-        if video_id or alternates:
-            return jsonify({
-                'success': True,
-                'psalm_number': psalm_number,
-                'video_id': video_id,
-                'alternates': alternates,
-                'has_music': True
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'psalm_number': psalm_number,
-                'has_music': False,
-                'message': 'No music configured for this psalm'
-            })
+        return music_catalog_response(MUSIC_CATALOG.psalm_music_json[psalm_number])
             
     except Exception as e:
         return jsonify({
@@ -416,36 +515,10 @@ def api_psalm_music(psalm_number):
 def api_psalms_with_music():
     """API endpoint to get list of all psalms with music (including alternates)"""
     try:
-        from psalm_music_config import has_psalm_music, get_all_psalm_videos
+        from psalm_music_config import MUSIC_CATALOG
         
-        psalms_with_music = []
-        for psalm_num in range(1, 151):
-            if has_psalm_music(psalm_num):
-                all_videos = get_all_psalm_videos(psalm_num)
-                
-                # Add each video as a separate entry for sequential playback
-                for i, video_id in enumerate(all_videos):
-                    if video_id:  # Only include if there's a video ID
-                        # For alternates, add a suffix to distinguish them
-                        if i > 0:  # This is an alternate version
-                            suffix_letter = chr(ord('b') + i - 1)  # b, c, d, etc.
-                            display_name = f"Psalm {psalm_num}{suffix_letter}"
-                        else:
-                            display_name = f"Psalm {psalm_num}"
-                        
-                        psalms_with_music.append({
-                            'psalm_number': psalm_num,
-                            'video_id': video_id,
-                            'display_name': display_name,
-                            'is_alternate': i > 0,
-                            'alternate_index': i
-                        })
-        
-        return jsonify({
-            'success': True,
-            'psalms': psalms_with_music,
-            'total': len(psalms_with_music)
-        })
+        # Playlist is compiled and serialized once at import
+        return music_catalog_response(MUSIC_CATALOG.playlist_json)
         
     except Exception as e:
         return jsonify({
@@ -544,9 +617,7 @@ def psalm(psalm_number):
     
     # Pass only the draft entry for editor loading (empty dict if no draft entry)
     entries_dict = {draft_entry.id: draft_entry} if draft_entry else {}
-    print(f"DEBUG: entries_dict: {entries_dict}")
-    if draft_entry:
-        print(f"DEBUG: draft_entry prompt_responses: {draft_entry.prompt_responses}")
+    logger.debug("Psalm %s draft entry: %s", psalm_number, draft_entry.id if draft_entry else None)
     
     # Get user's markups for this psalm from database
     markups = []
@@ -554,9 +625,9 @@ def psalm(psalm_number):
         supabase = get_supabase_client()
         response = supabase.table('markups').select('*').eq('user_id', current_user.id).eq('psalm_id', psalm_number).execute()
         markups = response.data if response.data else []
-        print(f"Fetched {len(markups)} markups for psalm {psalm_number}: {markups}")
+        logger.debug("Fetched %s markups for psalm %s", len(markups), psalm_number)
     except Exception as e:
-        print(f"Error fetching markups: {e}")
+        logger.error("Error fetching markups: %s", e)
         markups = []
     
     # Get available translations for the translation selector
@@ -618,10 +689,6 @@ def save_journal():
         
         if draft_entry_to_update:
             # Update existing draft entry with consolidated responses
-            print(f"DEBUG SAVE: Updating existing entry {draft_entry_to_update.id}")
-            print(f"DEBUG SAVE: Current prompt_responses: {draft_entry_to_update.prompt_responses}")
-            print(f"DEBUG SAVE: New prompt_responses to add: {prompt_responses}")
-            
             # IMPORTANT: Make sure prompt_responses is a dictionary
             if not isinstance(draft_entry_to_update.prompt_responses, dict):
                 draft_entry_to_update.prompt_responses = {}
@@ -634,8 +701,6 @@ def save_journal():
             else:
                 # Update existing completed status
                 draft_entry_to_update.prompt_responses['completed'] = completed
-                
-            print(f"DEBUG SAVE: Updated prompt_responses: {draft_entry_to_update.prompt_responses}")
             
             # Preserve emotion data if not already present and we have it from session
             if 'emotion' not in draft_entry_to_update.prompt_responses:
@@ -651,9 +716,12 @@ def save_journal():
                 if pre_reflection_data and pre_reflection_data.get('is_explore'):
                     draft_entry_to_update.prompt_responses['is_explore'] = pre_reflection_data['is_explore']
             
-            print(f"DEBUG SAVE: About to save with prompt_responses: {draft_entry_to_update.prompt_responses}")
             result = draft_entry_to_update.save()
-            print(f"DEBUG SAVE: Save completed, result: {result}")
+            # Autosaves arrive every few seconds per active user - sampled
+            logger.debug("Autosaved entry %s for psalm %s (prompts %s, completed=%s)",
+                         draft_entry_to_update.id, psalm_id, sorted(prompt_responses), completed,
+                         extra={'sample': 'journal.autosave'})
+            metrics.inc('pray150_journal_saves_total', {'action': 'update', 'result': 'ok' if result else 'failed'})
         else:
             # Check if we have pre-reflection emotion data stored separately
             from flask import session
@@ -668,12 +736,9 @@ def save_journal():
                 prompt_responses['is_explore'] = pre_reflection_data['is_explore']
             
             # Create new consolidated entry
-            print(f"DEBUG SAVE: Creating new entry for psalm {psalm_id}")
-            print(f"DEBUG SAVE: New entry prompt_responses: {prompt_responses}")
-            
             # Add completed flag to prompt_responses
             if 'completed' not in prompt_responses:
-                prompt_responses['completed'] = str(completed)
+                prompt_responses['completed'] = bool(completed)
             
             entry = JournalEntry(
                 user_id=current_user.id,
@@ -681,12 +746,14 @@ def save_journal():
                 prompt_responses=prompt_responses
             )
             result = entry.save()
-            print(f"DEBUG SAVE: Save result: {result}")
-            print(f"DEBUG SAVE: Created entry with ID: {entry.id}")
+            logger.debug("Created entry %s for psalm %s (prompts %s)", entry.id, psalm_id, sorted(prompt_responses))
+            metrics.inc('pray150_journal_saves_total', {'action': 'create', 'result': 'ok' if result else 'failed'})
         
         return jsonify({'success': True, 'message': 'Journal entry saved successfully!'})
         
     except Exception as e:
+        logger.exception("Error saving journal entry: %s", e)
+        metrics.inc('pray150_journal_saves_total', {'action': 'save', 'result': 'error'})
         return jsonify({'success': False, 'error': 'Error saving journal entry. Please try again.'}), 500
 
 @main_bp.route('/complete_psalm', methods=['POST'])
@@ -723,7 +790,7 @@ def complete_psalm():
         flash('Psalm completed! Moving to your next psalm in the journey.', 'success')
             
     except Exception as e:
-        print(f"Error completing psalm: {e}")
+        logger.error("Error completing psalm: %s", e)
         flash('Error completing psalm. Please try again.', 'error')
     
     return redirect(url_for('main.dashboard'))
@@ -760,7 +827,7 @@ def view_journal_entry(entry_id):
         return render_template('journal_entry.html', entry=entry, psalm=psalm)
         
     except Exception as e:
-        print(f"Error viewing journal entry: {e}")
+        logger.error("Error viewing journal entry: %s", e)
         flash('Error loading journal entry.', 'error')
         return redirect(url_for('main.journal_history'))
 
@@ -837,7 +904,7 @@ def answer_prayer():
         else:
             flash('Prayer not found.', 'error')
     except Exception as e:
-        print(f"Error answering prayer: {e}")
+        logger.error("Error answering prayer: %s", e)
         flash('Error updating prayer. Please try again.', 'error')
     
     return redirect(url_for('main.prayers'))
@@ -887,16 +954,16 @@ def save_markup():
             }
             
             response = supabase.table('markups').insert(insert_data).execute()
-            print(f"Successfully saved markup: {response.data}")
+            logger.debug("Saved markup for psalm %s", data['psalm_id'])
             
         except Exception as e:
-            print(f"Save failed: {e}")
+            logger.error("Save failed: %s", e)
             return jsonify({'error': f'Failed to save markup: {str(e)}'}), 500
         
         return jsonify({'success': True, 'message': 'Markup saved successfully'})
         
     except Exception as e:
-        print(f"Error saving markup: {e}")
+        logger.error("Error saving markup: %s", e)
         return jsonify({'error': 'Failed to save markup'}), 500
 
 @main_bp.route('/get_markups/<int:psalm_id>')
@@ -917,14 +984,14 @@ def get_markups(psalm_id):
             if markup_translation == translation:
                 filtered_markups.append(markup)
         
-        print(f"AJAX: Fetched {len(filtered_markups)} markups for psalm {psalm_id} translation {translation} (total: {len(markups)})")
+        logger.debug("AJAX: Fetched %s markups for psalm %s translation %s (total: %s)", len(filtered_markups), psalm_id, translation, len(markups))
         return jsonify({
             'markups': filtered_markups,
             'translation': translation
         })
         
     except Exception as e:
-        print(f"Error fetching markups via AJAX: {e}")
+        logger.error("Error fetching markups via AJAX: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -966,7 +1033,7 @@ def update_markup():
         return jsonify({'success': False, 'error': 'Note not found'})
             
     except Exception as e:
-        print(f"Error updating markup: {e}")
+        logger.error("Error updating markup: %s", e)
         return jsonify({'success': False, 'error': str(e)})
 
 
@@ -1001,7 +1068,7 @@ def delete_markup():
         return jsonify({'success': False, 'error': 'Markup not found'})
             
     except Exception as e:
-        print(f"Error deleting markup: {e}")
+        logger.error("Error deleting markup: %s", e)
         return jsonify({'success': False, 'error': str(e)})
 
 @main_bp.route('/update_preferences', methods=['POST'])
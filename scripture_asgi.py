@@ -0,0 +1,467 @@
+"""
+Async (ASGI) serving path for the read-only scripture API
+The scripture endpoints are almost pure upstream I/O. ScriptureASGI serves
+them on an event loop, so a request waiting on a Bible provider holds no
+thread and one worker can keep thousands of them in flight:
+  /api/psalms/<n>, /api/psalms/<n>/multiple-translations, /api/translations
+  and /api/search/psalms
+Every other request (and other methods on these paths) goes to the Flask app
+on a thread pool through WSGIBridge (ASGI_WSGI_THREADS, default 32).
+
+Psalms share BibleAPI's scripture cache, and concurrent misses for the same
+psalm share one fetch. rkeplin is called through an httpx AsyncClient that
+uses the same circuit breakers and adaptive timeouts as ProviderSession
+(upstream.py); like other user-facing calls it does not wait on the rate
+limiters. With SCRIPTURE_CACHE_DIR set, misses instead go through BibleAPI's
+single-flight in a worker thread, so they are coalesced with the other
+workers under its file lock and fill the shared tier. Translations rkeplin
+does not serve, the API.Bible fallback and BIBLE_REPLAY sessions also use the
+synchronous providers in a worker thread. Responses match the Flask views,
+including compression, Server-Timing, the request log line and request
+metrics.
+
+Run with an ASGI server, e.g.:
+    pip install ".[asgi]"
+    gunicorn -k uvicorn.workers.UvicornWorker -c gunicorn.conf.py asgi:app
+"""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+from werkzeug.http import parse_accept_header
+
+from compression import compress, compress_bytes
+from instrumentation import server_timing_header, summary_line, record, tracked_request
+from metrics import registry
+from upstream import USER_AGENT, CircuitOpenError, provider_state
+
+try:
+    import httpx
+except ImportError:  # httpx comes with supabase; without it psalms are fetched in worker threads
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncProviderClient:
+    """Async counterpart of ProviderSession for one provider"""
+
+    def __init__(self, provider: str, transport=None):
+        self.provider = provider
+        self.transport = transport
+        self._client = None
+        self._loop = None
+
+    @property
+    def client(self):
+        """httpx.AsyncClient, created per event loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(transport=self.transport, headers={
+                'User-Agent': USER_AGENT,
+                'Accept': 'application/json'
+            })
+            self._loop = loop
+        return self._client
+
+    async def get(self, url: str, params: Optional[Dict] = None, timeout: Optional[float] = None):
+        state = provider_state(self.provider)
+        label = f"GET {url}"
+        if not state.breaker.allow():
+            raise CircuitOpenError(f"Circuit for {self.provider} is open - not calling {label}")
+
+        timeout = state.timeouts.timeout(timeout)
+        started = time.perf_counter()
+        error = True
+        try:
+            response = await self.client.get(url, params=params, timeout=timeout)
+            error = response.status_code >= 500
+            return response
+        except httpx.TimeoutException:
+            state.timeouts.observe(timeout)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            state.breaker.record(not error)
+            if not error:
+                state.timeouts.observe(elapsed)
+            record(self.provider, elapsed * 1000, label, error)
+
+    async def aclose(self):
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+
+
+class AsyncScripture:
+    """BibleAPI's read-only methods as coroutines"""
+
+    def __init__(self, api, client: Optional[AsyncProviderClient] = None):
+        self.api = api
+        self.client = client or AsyncProviderClient('rkeplin')
+        self._inflight: Dict = {}
+
+    async def get_psalm(self, psalm_number: int, translation: str = 'NIV') -> Optional[Dict]:
+        """BibleAPI.get_psalm without blocking the event loop"""
+        api = self.api
+        if not (1 <= psalm_number <= 150):
+            logger.error(f"Invalid psalm number: {psalm_number}. Must be 1-150.")
+            return None
+        if translation not in api.AVAILABLE_TRANSLATIONS:
+            logger.warning(f"Unknown translation: {translation}. Using NIV as fallback.")
+            translation = 'NIV'
+
+        key = (psalm_number, translation)
+        # Stale psalms are refreshed by the cache's own worker threads
+        value, expired = api.cache.lookup(key, translation, partial(api._load_psalm, psalm_number, translation, refresh=True))
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(self._load_psalm(psalm_number, translation, expired))
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # A client that goes away does not cancel the fetch other requests wait on
+        return await asyncio.shield(task)
+
+    async def _load_psalm(self, psalm_number: int, translation: str, expired) -> Optional[Dict]:
+        api = self.api
+        if (httpx is None or translation in api.NOT_ON_RKEPLIN or os.environ.get('BIBLE_REPLAY')
+                or api.flight.shared is not None):
+            # The shared tier's cross-worker lock blocks, so it is taken on a thread
+            psalm_data = await asyncio.to_thread(api._load_psalm, psalm_number, translation)
+        else:
+            psalm_data = await self._get_rkeplin_psalm(psalm_number, translation)
+            if not psalm_data and 'api.bible' in api.psalm_sources(translation):
+                psalm_data = await asyncio.to_thread(api._get_api_bible_psalm, translation, psalm_number)
+            api._index_psalm(psalm_data)
+        return api.cache.fill((psalm_number, translation), psalm_data, expired)
+
+    async def _get_rkeplin_psalm(self, psalm_number: int, translation: str) -> Optional[Dict]:
+        api = self.api
+        url = f"{api.BASE_URL}/books/{api.PSALMS_BOOK_ID}/chapters/{psalm_number}"
+        started = time.perf_counter()
+        psalm_data = None
+        try:
+            logger.info(f"Fetching Psalm {psalm_number} ({translation}) from Bible API...")
+            response = await self.client.get(url, params={'translation': translation}, timeout=api.TIMEOUT)
+            response.raise_for_status()
+            psalm_data = api._format_rkeplin_psalm(psalm_number, translation, response.json())
+            return psalm_data
+        except Exception as e:
+            logger.error(f"Error fetching Psalm {psalm_number} ({translation}): {e}")
+            return None
+        finally:
+            # Keep the provider router's latency scores current
+            api.router.scores['rkeplin'].observe(time.perf_counter() - started, bool(psalm_data))
+
+    async def get_psalm_multiple_translations(self, psalm_number: int,
+                                              translations: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Translations fetched concurrently, in the order requested"""
+        if translations is None:
+            translations = ['ESV', 'NIV', 'NLT']
+        psalms = await asyncio.gather(*(self.get_psalm(psalm_number, translation) for translation in translations))
+        results = {}
+        for translation, psalm_data in zip(translations, psalms):
+            if psalm_data:
+                results[translation] = psalm_data
+            else:
+                logger.warning(f"Failed to fetch Psalm {psalm_number} in {translation}")
+        return results
+
+    async def search_psalms(self, query: str, limit: int = 10, translation: Optional[str] = None) -> List[Dict]:
+        """BibleAPI.search_psalms, with the upstream fallback awaited"""
+        from psalm_search import psalm_index
+
+        api = self.api
+        if psalm_index.is_complete(translation):
+            return psalm_index.search(query, translation=translation, limit=limit)
+        logger.info("Local psalm index is incomplete - falling back to upstream search")
+        if httpx is None or os.environ.get('BIBLE_REPLAY'):
+            return await asyncio.to_thread(api._search_psalms_upstream, query, limit, translation)
+        params = api._search_params(query, limit, translation)
+        if params is None:
+            return []
+        try:
+            response = await self.client.get(f"{api.BASE_URL}/search", timeout=api.TIMEOUT, params=params)
+            response.raise_for_status()
+            return api._psalm_search_results(response.json(), translation)
+        except Exception as e:
+            logger.error(f"Error searching Psalms: {e}")
+            return []
+
+
+def _arg(args: Dict[str, List[str]], name: str, default=None, type=None):
+    """First value of a query parameter, like request.args.get"""
+    values = args.get(name)
+    if not values:
+        return default
+    if type is None:
+        return values[0]
+    try:
+        return type(values[0])
+    except ValueError:
+        return default
+
+
+async def _read_body(receive) -> bytes:
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        body.extend(message.get('body', b''))
+        if not message.get('more_body'):
+            break
+    return bytes(body)
+
+
+def wsgi_environ(scope: Dict, body: bytes) -> Dict:
+    """WSGI environ for an ASGI HTTP scope"""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = scope['client'][0], str(scope['client'][1])
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else f"HTTP_{name}"
+        if key in environ:
+            value = f"{environ[key]}{'; ' if key == 'HTTP_COOKIE' else ','}{value}"
+        environ[key] = value
+    return environ
+
+
+_END = object()
+
+
+class WSGIBridge:
+    """Runs a WSGI app for ASGI requests on a thread pool, streaming its body"""
+
+    def __init__(self, wsgi_app, threads: Optional[int] = None):
+        self.wsgi_app = wsgi_app
+        self.threads = threads or int(os.environ.get('ASGI_WSGI_THREADS', '32'))
+        self._executor = None
+        self._executor_pid = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Worker threads do not survive a gunicorn fork
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='wsgi')
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        environ = wsgi_environ(scope, await _read_body(receive))
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        start = {}
+
+        def put(item):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        def start_response(status, headers, exc_info=None):
+            start['status'] = int(status.split(' ', 1)[0])
+            start['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+            return lambda data: put(data)
+
+        def run():
+            try:
+                result = self.wsgi_app(environ, start_response)
+                try:
+                    for chunk in result:
+                        if chunk:
+                            put(chunk)
+                finally:
+                    if hasattr(result, 'close'):
+                        result.close()
+            except BaseException as e:
+                put(e)
+            finally:
+                put(_END)
+
+        loop.run_in_executor(self._get_executor(), run)
+        started = False
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            if isinstance(item, BaseException):
+                logger.error("WSGI app failed for %s: %r", scope['path'], item)
+                if started:
+                    break
+                start = {'status': 500, 'headers': [(b'content-type', b'text/plain')]}
+                item = b'Internal Server Error'
+            if not started:
+                await send({'type': 'http.response.start', 'status': start['status'], 'headers': start['headers']})
+                started = True
+            await send({'type': 'http.response.body', 'body': item, 'more_body': True})
+        if not started:
+            await send({'type': 'http.response.start', 'status': start['status'], 'headers': start['headers']})
+        await send({'type': 'http.response.body', 'body': b''})
+
+
+class ScriptureASGI:
+    """ASGI app serving the read-only scripture endpoints, other requests by `fallback`"""
+
+    ROUTES = [
+        (re.compile(r'/api/psalms/(\d+)'), 'main.api_get_psalm', '_psalm'),
+        (re.compile(r'/api/psalms/(\d+)/multiple-translations'), 'main.api_get_psalm_multiple_translations',
+         '_psalm_multiple_translations'),
+        (re.compile(r'/api/translations'), 'main.api_get_translations', '_translations'),
+        (re.compile(r'/api/search/psalms'), 'main.api_search_psalms', '_search_psalms'),
+    ]
+
+    def __init__(self, fallback=None, scripture: Optional[AsyncScripture] = None, config=None):
+        from routes import SCRIPTURE_CACHE_MAX_AGE
+
+        if scripture is None:
+            from bible_api import bible_api
+            scripture = AsyncScripture(bible_api)
+        self.fallback = fallback
+        self.scripture = scripture
+        self.config = config if config is not None else {}
+        self.max_age = SCRIPTURE_CACHE_MAX_AGE
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD'):
+            for pattern, endpoint, handler in self.ROUTES:
+                match = pattern.fullmatch(scope['path'])
+                if match:
+                    return await self._serve(scope, send, endpoint, getattr(self, handler), match.groups())
+        if self.fallback is not None:
+            return await self.fallback(scope, receive, send)
+        if scope['type'] == 'http':
+            await self._send(scope, send, 404, b'Not Found', [(b'content-type', b'text/plain')])
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.scripture.client.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _serve(self, scope, send, endpoint: str, handler, groups):
+        args = parse_qs(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True)
+        with tracked_request() as stats:
+            try:
+                status, body, cacheable = await handler(args, *groups)
+            except Exception as e:
+                status, body, cacheable = 500, {'success': False, 'error': str(e)}, False
+
+            data = json.dumps(body, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8') + b'\n'
+            headers = [(b'content-type', b'application/json')]
+            if cacheable:
+                headers.append((b'cache-control', f'public, max-age={self.max_age}'.encode('latin-1')))
+            data = self._compress(scope, data, headers, cacheable)
+
+            total_ms = stats.elapsed_ms()
+            if self.config.get('SERVER_TIMING_ENABLED', True):
+                headers.append((b'server-timing', server_timing_header(stats, total_ms).encode('latin-1')))
+            await self._send(scope, send, status, data, headers)
+        self._log(scope, endpoint, status, stats, total_ms)
+
+    def _compress(self, scope, data: bytes, headers: List, cacheable: bool) -> bytes:
+        """Same negotiation as compression.Compress"""
+        if not self.config.get('COMPRESS_ENABLED', True):
+            return data
+        headers.append((b'vary', b'Accept-Encoding'))
+        accept = next((value for name, value in scope.get('headers', []) if name == b'accept-encoding'), b'')
+        encoding = parse_accept_header(accept.decode('latin-1')).best_match(compress.available_encodings())
+        if not encoding or len(data) < self.config.get('COMPRESS_MIN_SIZE', 500):
+            return data
+        level = self.config.get('COMPRESS_BR_LEVEL', 4) if encoding == 'br' else self.config.get('COMPRESS_LEVEL', 6)
+        if cacheable:
+            data = compress.variants.get_or_compress(data, encoding, level)
+        else:
+            data = compress_bytes(data, encoding, level)
+        headers.append((b'content-encoding', encoding.encode('latin-1')))
+        return data
+
+    async def _send(self, scope, send, status: int, data: bytes, headers: List):
+        headers.append((b'content-length', str(len(data)).encode('latin-1')))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else data})
+
+    def _log(self, scope, endpoint: str, status: int, stats, total_ms: float):
+        labels = {'endpoint': endpoint, 'method': scope['method']}
+        registry.observe('pray150_http_request_duration_seconds', total_ms / 1000, labels)
+        labels['status'] = f'{status // 100}xx'
+        registry.inc('pray150_http_requests_total', labels)
+
+        slow_ms = self.config.get('SLOW_REQUEST_MS', 0)
+        level = logging.WARNING if slow_ms and total_ms >= slow_ms else logging.INFO
+        if logger.isEnabledFor(level):
+            fields = {'event': 'request', 'endpoint': endpoint, 'status': status,
+                      'duration_ms': round(total_ms, 1), 'calls': stats.summary()}
+            logger.log(level, summary_line(scope['method'], scope['path'], endpoint, status, stats, total_ms),
+                       extra=fields)
+
+    async def _psalm(self, args, number):
+        number = int(number)
+        translation = _arg(args, 'translation', 'ESV').upper()
+        if not (1 <= number <= 150):
+            return 400, {'success': False, 'error': 'Invalid psalm number. Must be between 1 and 150.'}, False
+        psalm_data = await self.scripture.get_psalm(number, translation)
+        if psalm_data:
+            return 200, {'success': True, 'data': psalm_data}, True
+        return 404, {'success': False, 'error': 'Psalm not found or API error'}, False
+
+    async def _psalm_multiple_translations(self, args, number):
+        number = int(number)
+        if not (1 <= number <= 150):
+            return 400, {'success': False, 'error': 'Invalid psalm number. Must be between 1 and 150.'}, False
+        translations = [t.strip().upper() for t in _arg(args, 'translations', 'ESV,NIV,NLT').split(',')]
+        psalm_data = await self.scripture.get_psalm_multiple_translations(number, translations)
+        if psalm_data:
+            return 200, {'success': True, 'data': psalm_data, 'psalm_number': number,
+                         'translations_count': len(psalm_data)}, True
+        return 404, {'success': False, 'error': 'No psalm data found'}, False
+
+    async def _translations(self, args):
+        translations = self.scripture.api.get_available_translations()
+        return 200, {'success': True, 'data': translations, 'count': len(translations)}, True
+
+    async def _search_psalms(self, args):
+        query = _arg(args, 'q', '').strip()
+        limit = min(max(_arg(args, 'limit', 10, type=int), 1), 100)
+        translation = _arg(args, 'translation', '').strip().upper() or None
+        if not query:
+            return 400, {'success': False, 'error': 'Search query is required'}, False
+        if translation and translation not in self.scripture.api.AVAILABLE_TRANSLATIONS:
+            return 400, {'success': False, 'error': f'Unknown translation: {translation}'}, False
+        results = await self.scripture.search_psalms(query, limit, translation)
+        return 200, {'success': True, 'data': results, 'query': query, 'translation': translation,
+                     'count': len(results)}, False
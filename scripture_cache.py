@@ -0,0 +1,178 @@
+"""
+Stale-while-revalidate cache for scripture text
+Cached psalms carry the time they were fetched:
+  fresh   - younger than SCRIPTURE_FRESH_SECONDS (default 1 day): served
+  stale   - within the translation's max-stale beyond that: served at once
+            while a background worker refetches it from the provider
+  expired - older still: fetched synchronously, like a miss, though the
+            old text is still served if that fetch fails (for example while
+            the provider's circuit is open, see upstream.py)
+SCRIPTURE_MAX_STALE sets max-stale in seconds, either one value for every
+translation or per translation, e.g. "2592000,NIV=86400" (default 30 days).
+A failed refresh keeps serving the stale text, and failed fetches are never
+cached, so request threads only wait on the provider when nothing usable is
+cached.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FRESH_SECONDS = 24 * 3600
+DEFAULT_MAX_STALE_SECONDS = 30 * 24 * 3600
+
+
+def parse_max_stale(spec: Optional[str], default: float = DEFAULT_MAX_STALE_SECONDS):
+    """(default seconds, {translation: seconds}) from "2592000,NIV=86400" """
+    per_translation = {}
+    for item in (spec or '').split(','):
+        name, _, value = item.partition('=')
+        if not item.strip():
+            continue
+        if value.strip():
+            per_translation[name.strip().upper()] = float(value)
+        else:
+            default = float(name)
+    return default, per_translation
+
+
+class _Entry:
+    __slots__ = ('value', 'fetched_at')
+
+    def __init__(self, value, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+
+
+class ScriptureCache:
+    """LRU of fetched psalms, served stale while refreshed in the background"""
+
+    def __init__(self, maxsize: int = 1000, fresh_seconds: float = DEFAULT_FRESH_SECONDS,
+                 max_stale: float = DEFAULT_MAX_STALE_SECONDS, max_stale_by_translation: Optional[Dict] = None,
+                 workers: int = 2, clock: Callable[[], float] = time.time):
+        self.maxsize = maxsize
+        self.fresh_seconds = fresh_seconds
+        self.max_stale = max_stale
+        self.max_stale_by_translation = {key.upper(): value for key, value in (max_stale_by_translation or {}).items()}
+        self.workers = workers
+        self.clock = clock
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'refresh_failures': 0,
+                      'expired_fallbacks': 0}
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+
+    @classmethod
+    def from_env(cls, maxsize: int = 1000):
+        default, per_translation = parse_max_stale(os.environ.get('SCRIPTURE_MAX_STALE'))
+        return cls(maxsize, float(os.environ.get('SCRIPTURE_FRESH_SECONDS', DEFAULT_FRESH_SECONDS)),
+                   default, per_translation)
+
+    def max_stale_for(self, translation: str) -> float:
+        return self.max_stale_by_translation.get((translation or '').upper(), self.max_stale)
+
+    def get(self, key: Hashable, translation: str, fetch: Callable[[], Optional[Dict]],
+            refresh: Optional[Callable[[], Optional[Dict]]] = None):
+        """
+        Cached value for key, calling fetch() on a miss and refreshing stale
+        entries in the background with refresh() (fetch() when not given)
+        """
+        value, expired = self.lookup(key, translation, refresh or fetch)
+        if value is not None:
+            return value
+        return self.fill(key, fetch(), expired)
+
+    def lookup(self, key: Hashable, translation: str, refresh: Callable[[], Optional[Dict]]):
+        """
+        (value, None) for a fresh or stale entry - submitting refresh() for a
+        stale one - or (None, expired entry or None) when the caller must fetch
+        """
+        now = self.clock()
+        expired = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.fetched_at
+                if age <= self.fresh_seconds:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return entry.value, None
+                if age <= self.fresh_seconds + self.max_stale_for(translation):
+                    self._entries.move_to_end(key)
+                    self.stats['stale_hits'] += 1
+                    submit = key not in self._refreshing
+                    if submit:
+                        self._refreshing.add(key)
+                else:
+                    expired, entry = entry, None
+            if entry is None:
+                self.stats['misses'] += 1
+
+        if entry is not None:
+            if submit:
+                self._submit(key, refresh)
+            return entry.value, None
+        return None, expired
+
+    def fill(self, key: Hashable, value, expired: Optional[_Entry] = None):
+        """Cache a value fetched after lookup(), or fall back to the expired entry"""
+        if value is not None:
+            self.put(key, value)
+        elif expired is not None:
+            logger.warning("Serving expired %s - the provider fetch failed", key)
+            with self._lock:
+                self.stats['expired_fallbacks'] += 1
+            return expired.value
+        return value
+
+    def put(self, key: Hashable, value, fetched_at: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = _Entry(value, self.clock() if fetched_at is None else fetched_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def fetched_at(self, key: Hashable) -> Optional[float]:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.fetched_at if entry is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _submit(self, key: Hashable, fetch: Callable):
+        with self._lock:
+            # Worker threads do not survive a gunicorn fork
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scripture-refresh')
+                self._executor_pid = os.getpid()
+            executor = self._executor
+        executor.submit(self._refresh, key, fetch)
+
+    def _refresh(self, key: Hashable, fetch: Callable):
+        try:
+            value = fetch()
+        except Exception as e:
+            logger.warning("Background refresh of %s failed: %s", key, e)
+            value = None
+        with self._lock:
+            self._refreshing.discard(key)
+            self.stats['refreshes'] += 1
+            if value is None:
+                self.stats['refresh_failures'] += 1
+        if value is not None:
+            self.put(key, value)
+        else:
+            logger.info("Still serving stale %s after a failed refresh", key)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Seed the Supabase psalms table for Pray150
+Upserts all 150 psalm rows in batched requests keyed on psalm_number. Only
+columns with a value are written, so it is safe to run repeatedly (e.g. after
+deploys or when adding a data file) without blanking existing text or music.
+
+Usage:
+    python seed_psalms.py                      # sample text + music catalog
+    python seed_psalms.py --file psalms.json   # full corpus from a local file
+    python seed_psalms.py --dry-run            # show what would be written
+"""
+
+import sys
+
+from psalm_data import build_psalm_rows, initialize_psalms, TRANSLATION_COLUMNS
+
+
+def main():
+    data_file = None
+    if '--file' in sys.argv:
+        data_file = sys.argv[sys.argv.index('--file') + 1]
+
+    if '--dry-run' in sys.argv:
+        rows = build_psalm_rows(data_file)
+        with_text = sum(1 for row in rows if any(row.get(column) for column in TRANSLATION_COLUMNS))
+        with_music = sum(1 for row in rows if row.get('music_url'))
+        print(f"Would upsert {len(rows)} psalms ({with_text} with text, {with_music} with music)")
+        return
+
+    count = initialize_psalms(data_file)
+    if not count:
+        print("❌ No psalms were written - check SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY")
+        sys.exit(1)
+    print(f"✓ Seeded {count} psalms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+Single-flight coalescing for scripture fetches
+When many requests miss the scripture caches for the same psalm at once
+(today's psalm, Psalm 1 for new users), only one of them calls the upstream
+provider and the others share its result:
+  - within a process, concurrent callers with the same key wait for the one
+    call in flight instead of making their own
+  - across gunicorn workers, when SCRIPTURE_CACHE_DIR is set, results are
+    published to a file cache tier shared by the workers and the fetching
+    process holds an flock on the key, so other processes block on the lock
+    and then read the result instead of fetching it again
+Failed fetches (None or an exception) are handed to the callers already
+waiting but never stored in the shared tier. Background revalidations pass
+refresh=True, which always calls the provider and overwrites the shared copy
+instead of reading the old value back.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows - the shared tier then works without the lock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class SharedFileCache:
+    """JSON values in a directory shared by worker processes, with per-key locks"""
+
+    def __init__(self, directory: str, ttl: Optional[float] = None, lock_timeout: float = 35.0):
+        self.directory = directory
+        self.ttl = ttl
+        # Longer than a provider timeout, so a slow leader is normally waited out
+        self.lock_timeout = lock_timeout
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str, extension: str) -> str:
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.{extension}")
+
+    def get(self, key: str):
+        path = self._path(key, 'json')
+        try:
+            if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, value):
+        path = self._path(key, 'json')
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Could not store %s in the shared scripture cache: %s", key, e)
+
+    @contextmanager
+    def lock(self, key: str):
+        """Exclusive lock on one key across processes (yields whether it was acquired)"""
+        if fcntl is None:
+            yield False
+            return
+        with open(self._path(key, 'lock'), 'a') as lock_file:
+            deadline = time.monotonic() + self.lock_timeout
+            acquired = False
+            while not acquired:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    acquired = True
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        logger.warning("Timed out waiting for the shared scripture cache lock on %s", key)
+                        break
+                    time.sleep(0.01)
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs one call per key at a time; concurrent callers share its outcome"""
+
+    def __init__(self, shared: Optional[SharedFileCache] = None):
+        self.shared = shared
+        self.stats = {'calls': 0, 'coalesced': 0, 'shared_hits': 0}
+        self._calls: Dict[tuple, _Call] = {}   # (key, refresh) -> call in flight
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fetch: Callable, *args, refresh: bool = False, **kwargs):
+        """
+        fetch(*args, **kwargs) once for concurrent callers of key
+        With refresh=True the shared tier is not read, only written, and
+        callers only coalesce with other refreshes of the key.
+        """
+        call_key = (key, refresh)
+        with self._lock:
+            call = self._calls.get(call_key)
+            leader = call is None
+            if leader:
+                call = self._calls[call_key] = _Call()
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._fetch(key, fetch, args, kwargs, refresh)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[call_key]
+            call.done.set()
+
+    def _fetch(self, key: str, fetch: Callable, args, kwargs, refresh: bool = False):
+        if self.shared is None:
+            self._count('calls')
+            return fetch(*args, **kwargs)
+
+        value = None if refresh else self.shared.get(key)
+        if value is None:
+            with self.shared.lock(key):
+                # Another process may have published it while we waited
+                value = None if refresh else self.shared.get(key)
+                if value is None:
+                    self._count('calls')
+                    value = fetch(*args, **kwargs)
+                    if value is not None:
+                        self.shared.set(key, value)
+                    return value
+        self._count('shared_hits')
+        return value
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+
+def shared_cache_from_env() -> Optional[SharedFileCache]:
+    """Shared tier configured by SCRIPTURE_CACHE_DIR (and SCRIPTURE_CACHE_TTL seconds)"""
+    directory = os.environ.get('SCRIPTURE_CACHE_DIR')
+    if not directory:
+        return None
+    ttl = os.environ.get('SCRIPTURE_CACHE_TTL')
+    try:
+        return SharedFileCache(directory, float(ttl) if ttl else None)
+    except OSError as e:
+        logger.warning("Shared scripture cache disabled - cannot use %s: %s", directory, e)
+        return None
+
+
+# Global single-flight group for the scripture providers
+scripture_flight = SingleFlight(shared_cache_from_env())
@@ -0,0 +1,394 @@
+// Listen page JavaScript
+document.addEventListener('DOMContentLoaded', function() {
+    let psalmsWithMusic = [];
+    let currentIndex = 0;
+    let autoplay = true;
+    let ytPlayer = null;
+    let playerReady = false;
+    let progressSaveInterval = null;
+
+    // DOM elements
+    const currentPsalmTitle = document.getElementById('currentPsalmTitle');
+    const currentPsalmInfo = document.getElementById('currentPsalmInfo');
+    const youtubeContainer = document.getElementById('youtube-container');
+    const loadingMessage = document.getElementById('loading-message');
+    const prevBtn = document.getElementById('prevBtn');
+    const playPauseBtn = document.getElementById('playPauseBtn');
+    const nextBtn = document.getElementById('nextBtn');
+    const autoplayToggle = document.getElementById('autoplayToggle');
+    const psalmSelect = document.getElementById('psalmSelect');
+    const progressBar = document.getElementById('progressBar');
+    const currentIndexSpan = document.getElementById('currentIndex');
+
+    // Initialize the listen page
+    function init() {
+        loadPsalmsWithMusic();
+        setupEventListeners();
+    }
+
+    // Load saved listening progress from server
+    function loadListeningProgress() {
+        return fetch('/api/listening-progress')
+            .then(response => response.json())
+            .then(data => {
+                console.log('API Response:', data);
+                if (data.success && data.data) {
+                    const { psalm_number, position } = data.data;
+                    console.log('Loading saved progress:', psalm_number, position);
+                    
+                    // Find the index for this psalm
+                    const psalmIndex = psalmsWithMusic.findIndex(p => p.psalm_number === psalm_number);
+                    if (psalmIndex !== -1) {
+                        // Check if they were within 15 seconds of the end
+                        // We'll check this when the video loads by comparing position to duration
+                        return {
+                            psalmIndex: psalmIndex,
+                            position: position || 0,
+                            psalmNumber: psalm_number
+                        };
+                    }
+                }
+                
+                // Temporary fallback - check localStorage for session progress
+                const sessionProgress = localStorage.getItem('listenProgress');
+                if (sessionProgress) {
+                    try {
+                        const parsed = JSON.parse(sessionProgress);
+                        console.log('Using localStorage fallback:', parsed);
+                        const psalmIndex = psalmsWithMusic.findIndex(p => p.psalm_number === parsed.psalm_number);
+                        if (psalmIndex !== -1) {
+                            return {
+                                psalmIndex: psalmIndex,
+                                position: parsed.position || 0,
+                                psalmNumber: parsed.psalm_number
+                            };
+                        }
+                    } catch (e) {
+                        console.error('Error parsing localStorage progress:', e);
+                    }
+                }
+                
+                return { psalmIndex: 0, position: 0, psalmNumber: 1 };
+            })
+            .catch(error => {
+                console.error('Error loading listening progress:', error);
+                
+                // Temporary fallback - check localStorage for session progress
+                const sessionProgress = localStorage.getItem('listenProgress');
+                if (sessionProgress) {
+                    try {
+                        const parsed = JSON.parse(sessionProgress);
+                        console.log('Using localStorage fallback after error:', parsed);
+                        const psalmIndex = psalmsWithMusic.findIndex(p => p.psalm_number === parsed.psalm_number);
+                        if (psalmIndex !== -1) {
+                            return {
+                                psalmIndex: psalmIndex,
+                                position: parsed.position || 0,
+                                psalmNumber: parsed.psalm_number
+                            };
+                        }
+                    } catch (e) {
+                        console.error('Error parsing localStorage progress:', e);
+                    }
+                }
+                
+                return { psalmIndex: 0, position: 0, psalmNumber: 1 };
+            });
+    }
+
+    // Save listening progress to server
+    function saveListeningProgress(psalmNumber, position) {
+        const data = {
+            psalm_number: psalmNumber,
+            position: Math.floor(position)
+        };
+        
+        // Also save to localStorage as fallback
+        localStorage.setItem('listenProgress', JSON.stringify(data));
+        
+        fetch('/api/listening-progress', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(data)
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) {
+                console.error('Failed to save listening progress to server:', data.error);
+                console.log('Progress saved to localStorage instead');
+            } else {
+                console.log('Progress saved successfully');
+            }
+        })
+        .catch(error => {
+            console.error('Error saving listening progress to server:', error);
+            console.log('Progress saved to localStorage instead');
+        });
+    }
+
+    // Start saving progress periodically
+    function startProgressTracking() {
+        if (progressSaveInterval) {
+            clearInterval(progressSaveInterval);
+        }
+        
+        progressSaveInterval = setInterval(() => {
+            if (ytPlayer && playerReady && ytPlayer.getPlayerState() === YT.PlayerState.PLAYING) {
+                const currentTime = ytPlayer.getCurrentTime();
+                const currentPsalm = psalmsWithMusic[currentIndex];
+                if (currentPsalm) {
+                    saveListeningProgress(currentPsalm.psalm_number, currentTime);
+                }
+            }
+        }, 5000); // Save every 5 seconds
+    }
+
+    // Stop saving progress
+    function stopProgressTracking() {
+        if (progressSaveInterval) {
+            clearInterval(progressSaveInterval);
+            progressSaveInterval = null;
+        }
+    }
+
+    // Load list of psalms with music from server
+    function loadPsalmsWithMusic() {
+        fetch('/api/psalms-with-music')
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    psalmsWithMusic = data.psalms;
+                    populatePsalmSelect();
+                    if (psalmsWithMusic.length > 0) {
+                        // Load saved progress and start from there
+                        loadListeningProgress().then(progressData => {
+                            currentIndex = progressData.psalmIndex;
+                            loadCurrentPsalm(progressData.position);
+                        });
+                    } else {
+                        showNoMusicMessage();
+                    }
+                } else {
+                    console.error('Failed to load psalms with music:', data.error);
+                    showErrorMessage();
+                }
+            })
+            .catch(error => {
+                console.error('Error loading psalms with music:', error);
+                showErrorMessage();
+            });
+    }
+
+    // Populate psalm selector dropdown
+    function populatePsalmSelect() {
+        psalmSelect.innerHTML = '<option value="">Select psalm...</option>';
+        psalmsWithMusic.forEach((psalm, index) => {
+            const option = document.createElement('option');
+            option.value = index;
+            option.textContent = psalm.display_name || `Psalm ${psalm.psalm_number}`;
+            psalmSelect.appendChild(option);
+        });
+    }
+
+    // Setup event listeners
+    function setupEventListeners() {
+        prevBtn.addEventListener('click', () => navigateToPsalm(currentIndex - 1));
+        nextBtn.addEventListener('click', () => navigateToPsalm(currentIndex + 1));
+        
+        // Play/pause button functionality
+        playPauseBtn.addEventListener('click', () => {
+            if (ytPlayer && playerReady) {
+                const playerState = ytPlayer.getPlayerState();
+                if (playerState === YT.PlayerState.PLAYING) {
+                    ytPlayer.pauseVideo();
+                } else if (playerState === YT.PlayerState.PAUSED || playerState === YT.PlayerState.CUED) {
+                    ytPlayer.playVideo();
+                }
+            }
+        });
+        
+        autoplayToggle.addEventListener('change', (e) => {
+            autoplay = e.target.checked;
+            console.log('Auto-advance toggled:', autoplay);
+        });
+
+        psalmSelect.addEventListener('change', (e) => {
+            if (e.target.value !== '') {
+                navigateToPsalm(parseInt(e.target.value));
+            }
+        });
+    }
+
+    // Load and display current psalm
+    function loadCurrentPsalm(startPosition = 0) {
+        if (!psalmsWithMusic[currentIndex]) return;
+
+        const psalm = psalmsWithMusic[currentIndex];
+        updateUI(psalm);
+        loadYouTubePlayer(psalm.video_id, startPosition);
+        updateProgress();
+    }
+
+    // Update UI elements
+    function updateUI(psalm) {
+        const displayName = psalm.display_name || `Psalm ${psalm.psalm_number}`;
+        currentPsalmTitle.textContent = displayName;
+        currentPsalmInfo.textContent = `Worship music for ${displayName}`;
+        
+        // Update controls (never disable since we now loop)
+        prevBtn.disabled = false;
+        nextBtn.disabled = false;
+        playPauseBtn.disabled = false;
+        
+        // Update selector
+        psalmSelect.value = currentIndex;
+        
+        // Update progress
+        currentIndexSpan.textContent = currentIndex + 1;
+    }
+
+    // Load YouTube player with proper API integration
+    function loadYouTubePlayer(videoId, startPosition = 0) {
+        // Clear container
+        youtubeContainer.innerHTML = '';
+        
+        // Create player div
+        const playerDiv = document.createElement('div');
+        playerDiv.id = 'youtube-player';
+        playerDiv.style.width = '100%';
+        playerDiv.style.height = '100%';
+        youtubeContainer.appendChild(playerDiv);
+        
+        // Initialize YouTube player with API
+        if (window.YT && window.YT.Player) {
+            createYouTubePlayer(videoId, startPosition);
+        } else {
+            // Load YouTube API if not already loaded
+            loadYouTubeAPI(() => createYouTubePlayer(videoId, startPosition));
+        }
+    }
+
+    // Create YouTube player instance
+    function createYouTubePlayer(videoId, startPosition = 0) {
+        ytPlayer = new YT.Player('youtube-player', {
+            videoId: videoId,
+            playerVars: {
+                autoplay: 1,
+                rel: 0,
+                modestbranding: 1,
+                controls: 1,
+                disablekb: 0,
+                enablejsapi: 1,
+                iv_load_policy: 3,
+                cc_load_policy: 0,
+                fs: 1,
+                showinfo: 0
+            },
+            events: {
+                onReady: function(event) {
+                    playerReady = true;
+                    playPauseBtn.disabled = false;
+                    console.log('YouTube player ready');
+                    
+                    // Check if we should start from a saved position or advance to next psalm
+                    if (startPosition > 0) {
+                        const duration = event.target.getDuration();
+                        const remainingTime = duration - startPosition;
+                        
+                        // If within 15 seconds of end, advance to next psalm (with looping)
+                        if (remainingTime <= 15) {
+                            console.log('Advancing to next psalm (within 15 seconds of end)');
+                            navigateToPsalm(currentIndex + 1);
+                            return;
+                        }
+                        
+                        // Otherwise, start from saved position
+                        console.log('Resuming from position:', startPosition);
+                        event.target.seekTo(startPosition, true);
+                    }
+                },
+                onStateChange: function(event) {
+                    // YT.PlayerState.ENDED = 0
+                    if (event.data === YT.PlayerState.ENDED) {
+                        console.log('Video ended, auto-advance:', autoplay);
+                        stopProgressTracking();
+                        if (autoplay) {
+                            setTimeout(() => {
+                                navigateToPsalm(currentIndex + 1);
+                            }, 1000); // Small delay before advancing
+                        }
+                    }
+                    
+                    // Start/stop progress tracking based on play state
+                    if (event.data === YT.PlayerState.PLAYING) {
+                        playPauseBtn.innerHTML = '<i class="fas fa-pause"></i>';
+                        startProgressTracking();
+                    } else {
+                        if (event.data === YT.PlayerState.PAUSED) {
+                            playPauseBtn.innerHTML = '<i class="fas fa-play"></i>';
+                        }
+                        stopProgressTracking();
+                    }
+                }
+            }
+        });
+    }
+
+    // Load YouTube API
+    function loadYouTubeAPI(callback) {
+        if (window.YT) {
+            callback();
+            return;
+        }
+        
+        window.onYouTubeIframeAPIReady = callback;
+        
+        const script = document.createElement('script');
+        script.src = 'https://www.youtube.com/iframe_api';
+        document.head.appendChild(script);
+    }
+
+
+    // Navigate to specific psalm (with looping)
+    function navigateToPsalm(index) {
+        if (psalmsWithMusic.length === 0) return;
+        
+        // Handle looping: wrap around to beginning if past end, or to end if before beginning
+        if (index >= psalmsWithMusic.length) {
+            currentIndex = 0; // Loop back to first psalm
+        } else if (index < 0) {
+            currentIndex = psalmsWithMusic.length - 1; // Loop to last psalm
+        } else {
+            currentIndex = index;
+        }
+        
+        loadCurrentPsalm();
+    }
+
+    // Update progress bar
+    function updateProgress() {
+        const progress = ((currentIndex + 1) / psalmsWithMusic.length) * 100;
+        progressBar.style.width = `${progress}%`;
+    }
+
+    // Show error message
+    function showErrorMessage() {
+        loadingMessage.innerHTML = `
+            <i class="fas fa-exclamation-triangle fa-2x mb-3 d-block text-warning"></i>
+            Unable to load psalm music. Please try again later.
+        `;
+    }
+
+    // Show no music message
+    function showNoMusicMessage() {
+        loadingMessage.innerHTML = `
+            <i class="fas fa-music fa-2x mb-3 d-block text-muted"></i>
+            No psalm music is currently configured.
+        `;
+    }
+
+    // Initialize the page
+    init();
+});
@@ -0,0 +1,756 @@
+// Pray150 Psalm Page JavaScript
+// Page data is provided by psalm.html via window.psalmPageConfig
+
+// Bible text highlighting and note functionality
+document.addEventListener('DOMContentLoaded', function() {
+    const psalmText = document.getElementById('psalmText');
+    const highlightBtn = document.getElementById('highlightBtn');
+    const noteBtn = document.getElementById('noteBtn');
+    const toggleMarkupsBtn = document.getElementById('toggleMarkupsBtn');
+    let currentHighlightColor = 'yellow';
+    let markupsVisible = true;
+    let isHighlightMode = false;
+    let isNoteMode = false;
+
+    // Initialize markup tools
+    if (highlightBtn) {
+        highlightBtn.addEventListener('click', function() {
+            toggleHighlightMode();
+        });
+    }
+
+    // Color options
+    const colorOptions = document.querySelectorAll('.highlight-color-option');
+    colorOptions.forEach(option => {
+        option.addEventListener('click', function(e) {
+            e.preventDefault();
+            currentHighlightColor = this.getAttribute('data-color');
+            highlightBtn.setAttribute('data-color', currentHighlightColor);
+            toggleHighlightMode();
+        });
+    });
+
+    if (noteBtn) {
+        noteBtn.addEventListener('click', function() {
+            toggleNoteMode();
+        });
+    }
+
+    if (toggleMarkupsBtn) {
+        toggleMarkupsBtn.addEventListener('click', function() {
+            toggleMarkupsVisibility();
+        });
+    }
+
+    function toggleHighlightMode() {
+        isHighlightMode = !isHighlightMode;
+        isNoteMode = false;
+
+        if (isHighlightMode) {
+            highlightBtn.textContent = 'Click text to highlight';
+            highlightBtn.classList.add('active');
+            noteBtn.classList.remove('active');
+            psalmText.style.cursor = 'crosshair';
+        } else {
+            highlightBtn.innerHTML = '<i class="fas fa-highlighter me-1"></i>Highlight';
+            highlightBtn.classList.remove('active');
+            psalmText.style.cursor = 'default';
+        }
+    }
+
+    function toggleNoteMode() {
+        isNoteMode = !isNoteMode;
+        isHighlightMode = false;
+
+        if (isNoteMode) {
+            noteBtn.textContent = 'Click text to add note';
+            noteBtn.classList.add('active');
+            highlightBtn.classList.remove('active');
+            psalmText.style.cursor = 'crosshair';
+        } else {
+            noteBtn.innerHTML = '<i class="fas fa-sticky-note me-1"></i>Add Note';
+            noteBtn.classList.remove('active');
+            psalmText.style.cursor = 'default';
+        }
+    }
+
+    function toggleMarkupsVisibility() {
+        markupsVisible = !markupsVisible;
+        const markups = document.querySelectorAll('.markup-highlight, .markup-note');
+
+        markups.forEach(markup => {
+            if (markupsVisible) {
+                markup.style.backgroundColor = markup.getAttribute('data-original-color') || 'yellow';
+                markup.style.display = 'inline';
+            } else {
+                markup.style.backgroundColor = 'transparent';
+            }
+        });
+
+        toggleMarkupsBtn.innerHTML = markupsVisible 
+            ? '<i class="fas fa-eye-slash me-1"></i>Hide Markups'
+            : '<i class="fas fa-eye me-1"></i>Show Markups';
+    }
+
+    // Handle text selection for highlighting and notes
+    if (psalmText) {
+        psalmText.addEventListener('mouseup', function(e) {
+            const selection = window.getSelection();
+            if (selection.toString().length > 0) {
+                const selectedText = selection.toString().trim();
+
+                if (isHighlightMode && selectedText) {
+                    highlightSelectedText(selection, selectedText);
+                    clearSelection();
+                    toggleHighlightMode();
+                } else if (isNoteMode && selectedText) {
+                    addNoteToSelectedText(selection, selectedText);
+                    clearSelection();
+                    toggleNoteMode();
+                }
+            }
+        });
+    }
+
+    function highlightSelectedText(selection, text) {
+        try {
+            const range = selection.getRangeAt(0);
+            const span = document.createElement('span');
+            span.className = 'markup-highlight';
+            span.style.backgroundColor = currentHighlightColor;
+            span.setAttribute('data-original-color', currentHighlightColor);
+            span.title = `Highlighted in ${currentHighlightColor}`;
+
+            try {
+                range.surroundContents(span);
+                saveMarkup(text, 'highlight', currentHighlightColor);
+            } catch(e) {
+                // If surroundContents fails, extract and wrap content
+                const contents = range.extractContents();
+                span.appendChild(contents);
+                range.insertNode(span);
+                saveMarkup(text, 'highlight', currentHighlightColor);
+            }
+        } catch(error) {
+            console.error('Error highlighting text:', error);
+            window.Pray150?.showNotification('Error highlighting text. Please try again.', 'error');
+        }
+    }
+
+    function addNoteToSelectedText(selection, text) {
+        // Reset editing mode
+        currentEditingNote = null;
+
+        // Show the selected text in the modal
+        document.getElementById('selectedTextPreview').textContent = text;
+        document.getElementById('noteTextInput').value = '';
+        document.getElementById('noteModalLabel').textContent = 'Add Your Note';
+        document.getElementById('deleteNoteBtn').style.display = 'none';
+
+        // Show the modal
+        const noteModal = new bootstrap.Modal(document.getElementById('noteModal'));
+        noteModal.show();
+    }
+
+    // Set up modal event handlers once
+    function setupModalHandlers() {
+        const saveBtn = document.getElementById('saveNoteBtn');
+        const deleteBtn = document.getElementById('deleteNoteBtn');
+
+        if (saveBtn && !saveBtn.hasAttribute('data-handler-set')) {
+            saveBtn.setAttribute('data-handler-set', 'true');
+            saveBtn.onclick = function() {
+                const noteText = document.getElementById('noteTextInput').value.trim();
+
+                if (noteText) {
+                    if (currentEditingNote) {
+                        // Editing existing note
+                        updateExistingNote(currentEditingNote, noteText);
+                    } else {
+                        // Creating new note
+                        createNewNote(noteText);
+                    }
+
+                    const noteModal = bootstrap.Modal.getInstance(document.getElementById('noteModal'));
+                    noteModal.hide();
+                } else {
+                    window.Pray150?.showNotification('Please enter some text for your note.', 'warning');
+                }
+            };
+        }
+
+        if (deleteBtn && !deleteBtn.hasAttribute('data-handler-set')) {
+            deleteBtn.setAttribute('data-handler-set', 'true');
+            deleteBtn.onclick = function() {
+                if (currentEditingNote && confirm('Are you sure you want to delete this note?')) {
+                    deleteExistingNote(currentEditingNote);
+
+                    const noteModal = bootstrap.Modal.getInstance(document.getElementById('noteModal'));
+                    noteModal.hide();
+                }
+            };
+        }
+    }
+
+    // Call setup after DOM is ready
+    setTimeout(setupModalHandlers, 100);
+
+    function createNewNote(noteText) {
+        const selection = window.getSelection();
+        if (selection.rangeCount > 0) {
+            const text = selection.toString().trim();
+            try {
+                const range = selection.getRangeAt(0);
+                const span = document.createElement('span');
+                span.className = 'markup-note clickable-note';
+                span.style.backgroundColor = 'lightcyan';
+                span.style.borderBottom = '2px dotted #007bff';
+                span.style.cursor = 'pointer';
+                span.title = noteText;
+                span.setAttribute('data-note', noteText);
+                span.setAttribute('data-markup-text', text);
+
+                try {
+                    range.surroundContents(span);
+                    saveMarkup(text, 'note', null, noteText);
+                    addNoteClickListeners();
+                } catch(e) {
+                    const contents = range.extractContents();
+                    span.appendChild(contents);
+                    range.insertNode(span);
+                    saveMarkup(text, 'note', null, noteText);
+                    addNoteClickListeners();
+                }
+            } catch(error) {
+                console.error('Error adding note:', error);
+                window.Pray150?.showNotification('Error adding note. Please try again.', 'error');
+            }
+        }
+    }
+
+    function updateExistingNote(editingNote, newNoteText) {
+        // Update the DOM element
+        editingNote.element.setAttribute('data-note', newNoteText);
+        editingNote.element.title = newNoteText;
+
+        // Update in database
+        updateMarkupInDatabase(editingNote.originalText, newNoteText);
+    }
+
+    function deleteExistingNote(editingNote) {
+        // Remove markup from DOM
+        const parent = editingNote.element.parentNode;
+        parent.insertBefore(document.createTextNode(editingNote.element.textContent), editingNote.element);
+        parent.removeChild(editingNote.element);
+
+        // Delete from database
+        deleteMarkupFromDatabase(editingNote.originalText, 'note');
+    }
+
+    function saveMarkup(text, type, color, note) {
+        const psalmId = psalmText.getAttribute('data-psalm-id') || psalmText.getAttribute('data-psalm-number');
+        const markupData = {
+            psalm_id: parseInt(psalmId),
+            markup_type: type,
+            text: text,
+            color: color,
+            note_text: note,
+            translation: 'NIV'
+        };
+
+        fetch('/save_markup', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(markupData)
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                // Reload markups to show the new one
+                setTimeout(loadMarkups, 100);
+                window.Pray150?.showNotification(`${type === 'highlight' ? 'Highlight' : 'Note'} saved successfully!`, 'success');
+            } else {
+                console.error('Failed to save markup:', data.error);
+            }
+        })
+        .catch(error => {
+            console.error('Error saving markup:', error);
+        });
+    }
+
+    function updateMarkupInDatabase(originalText, newNoteText) {
+        const psalmId = psalmText.getAttribute('data-psalm-id') || psalmText.getAttribute('data-psalm-number');
+
+        fetch('/update_markup', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                psalm_id: psalmId,
+                original_text: originalText,
+                note_text: newNoteText,
+                translation: 'NIV'
+            })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                window.Pray150?.showNotification('Note updated successfully!', 'success');
+            } else {
+                console.error('Failed to update note:', data.error);
+                window.Pray150?.showNotification('Failed to update note. Please try again.', 'error');
+            }
+        })
+        .catch(error => {
+            console.error('Error updating note:', error);
+            window.Pray150?.showNotification('Error updating note. Please try again.', 'error');
+        });
+    }
+
+    function deleteMarkupFromDatabase(originalText, markupType) {
+        const psalmId = psalmText.getAttribute('data-psalm-id') || psalmText.getAttribute('data-psalm-number');
+
+        fetch('/delete_markup', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                psalm_id: psalmId,
+                text: originalText,
+                markup_type: markupType,
+                translation: 'NIV'
+            })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                window.Pray150?.showNotification('Note deleted successfully!', 'success');
+            } else {
+                console.error('Failed to delete note:', data.error);
+                window.Pray150?.showNotification('Failed to delete note. Please try again.', 'error');
+            }
+        })
+        .catch(error => {
+            console.error('Error deleting note:', error);
+            window.Pray150?.showNotification('Error deleting note. Please try again.', 'error');
+        });
+    }
+
+    function clearSelection() {
+        if (window.getSelection) {
+            window.getSelection().removeAllRanges();
+        }
+    }
+
+    // Load existing markups - wait for content to load
+    const waitForContent = () => {
+        const psalmTextContent = psalmText?.textContent || '';
+        if (psalmTextContent.trim().length > 0) {
+            loadMarkups();
+        } else {
+            setTimeout(waitForContent, 200);
+        }
+    };
+
+    setTimeout(waitForContent, 100);
+
+    function loadMarkups() {
+        const psalmId = psalmText?.getAttribute('data-psalm-id') || psalmText?.getAttribute('data-psalm-number');
+        if (!psalmId) return;
+
+        // Clear existing markups first
+        const existingMarkups = psalmText.querySelectorAll('.markup-highlight, .markup-note');
+        existingMarkups.forEach(markup => {
+            const parent = markup.parentNode;
+            parent.insertBefore(document.createTextNode(markup.textContent), markup);
+            parent.removeChild(markup);
+        });
+
+        fetch(`/get_markups/${psalmId}?translation=NIV`)
+            .then(response => response.json())
+            .then(data => {
+                if (data.markups && data.markups.length > 0) {
+                    applyMarkups(data.markups);
+                }
+            })
+            .catch(error => console.error('Error loading markups:', error));
+    }
+
+    function applyMarkups(markups) {
+        markups.forEach((markup, index) => {
+            const markupData = markup['markup-data'] || markup.markup_data || markup;
+            if (markupData && markupData.text) {
+                applyMarkupToText(markupData);
+            }
+        });
+    }
+
+    function applyMarkupToText(markupData) {
+        const textToFind = markupData.text;
+        const psalmTextElement = document.getElementById('psalmText');
+        if (!psalmTextElement) return;
+
+        let htmlContent = psalmTextElement.innerHTML;
+
+        // Only apply if the text hasn't already been marked up
+        if (htmlContent.includes(`data-markup-text="${textToFind}"`)) {
+            return;
+        }
+
+        // Find and replace the text with marked up version
+        const textPattern = textToFind.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'); // Escape regex chars
+        const regex = new RegExp(`(${textPattern})`, 'gi');
+
+        if (htmlContent.match(regex)) {
+            let replacementSpan;
+            if (markupData.markup_type === 'highlight') {
+                const color = markupData.color || 'yellow';
+                replacementSpan = `<span class="markup-highlight" style="background-color: ${color};" data-original-color="${color}" title="Highlighted in ${color}" data-markup-text="${textToFind}">$1</span>`;
+            } else if (markupData.markup_type === 'note') {
+                const noteText = (markupData.note_text && markupData.note_text.trim()) || 
+                               (markupData.note && markupData.note.trim()) || 
+                               'Personal note (click to edit)';
+                replacementSpan = `<span class="markup-note clickable-note" style="background-color: lightcyan; border-bottom: 2px dotted #007bff; cursor: pointer;" title="${noteText}" data-note="${noteText}" data-markup-text="${textToFind}">$1</span>`;
+            }
+
+            // Replace first occurrence only
+            const updatedContent = htmlContent.replace(regex, replacementSpan);
+            if (updatedContent !== htmlContent) {
+                psalmTextElement.innerHTML = updatedContent;
+
+                // Add click listeners for notes after they're added
+                if (markupData.markup_type === 'note') {
+                    addNoteClickListeners();
+                }
+            }
+        }
+    }
+
+    let currentEditingNote = null; // Track which note is being edited
+
+    function addNoteClickListeners() {
+        const noteElements = psalmText.querySelectorAll('.clickable-note');
+        noteElements.forEach(noteEl => {
+            noteEl.onclick = function(e) {
+                e.preventDefault();
+                e.stopPropagation();
+
+                // Get note data
+                const noteText = noteEl.getAttribute('data-note') || '';
+                const selectedText = noteEl.getAttribute('data-markup-text') || noteEl.textContent;
+
+                // Set editing mode
+                currentEditingNote = {
+                    element: noteEl,
+                    originalText: selectedText,
+                    originalNote: noteText
+                };
+
+                // Show modal with existing note
+                document.getElementById('selectedTextPreview').textContent = selectedText;
+                document.getElementById('noteTextInput').value = noteText;
+                document.getElementById('noteModalLabel').textContent = 'Edit Your Note';
+                document.getElementById('deleteNoteBtn').style.display = 'block';
+
+                const noteModal = new bootstrap.Modal(document.getElementById('noteModal'));
+                noteModal.show();
+            };
+        });
+    }
+});
+
+// Translation switching functionality
+function changeTranslation() {
+    const select = document.getElementById('translationSelect');
+    if (!select) return;
+
+    const newTranslation = select.value;
+    const psalmNumber = document.getElementById('psalmText').dataset.psalmNumber;
+
+    if (newTranslation && psalmNumber) {
+        // Show loading state
+        const psalmText = document.getElementById('psalmText');
+        psalmText.innerHTML = `
+            <div class="d-flex justify-content-center align-items-center" style="height: 100px;">
+                <div class="spinner-border" style="color: #E93C02;" role="status">
+                    <span class="visually-hidden">Loading ${newTranslation} translation...</span>
+                </div>
+            </div>
+        `;
+
+        // Fetch new translation
+        fetch(`/api/psalms/${psalmNumber}?translation=${newTranslation}`)
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    updatePsalmContent(data.data);
+                    updatePageTitle(data.data);
+                } else {
+                    console.error('Error fetching psalm:', data.error);
+                    psalmText.innerHTML = `
+                        <div class="alert alert-warning">
+                            <i class="fas fa-exclamation-triangle me-2"></i>
+                            Failed to load ${newTranslation} translation. Please try again.
+                        </div>
+                    `;
+                }
+            })
+            .catch(error => {
+                console.error('Network error:', error);
+                psalmText.innerHTML = `
+                    <div class="alert alert-danger">
+                        <i class="fas fa-times-circle me-2"></i>
+                        Network error loading translation. Please check your connection.
+                    </div>
+                `;
+            });
+    }
+}
+
+function updatePsalmContent(psalmData) {
+    const psalmText = document.getElementById('psalmText');
+    let html = '';
+
+    psalmData.verses.forEach(verse => {
+        // Style "Selah" in the verse text
+        const styledText = styleSelahText(verse.text);
+
+        // Determine styling for Hebrew, Greek, and English texts
+        const isHebrew = psalmData.translation === 'WLC';
+        const isGreek = psalmData.translation === 'LXX';
+        const isOriginalLanguage = isHebrew || isGreek;
+
+        const textDirection = isHebrew ? 'rtl' : 'ltr';
+        const textAlign = isHebrew ? 'text-align: right;' : 'text-align: left;';
+        const verseNumberPosition = isHebrew ? 'ms-2' : 'me-2';
+        const verseNumberFloat = isHebrew ? 'float: right; margin-left: 8px; margin-right: 0;' : '';
+
+        const fontFamily = isHebrew ? 'Frank Ruhl Libre, Noto Sans Hebrew, SBL Hebrew, serif' : 
+                          isGreek ? 'SBL Greek, Times, serif' : 
+                          'Georgia, serif';
+
+        // Get current font size from the psalm text container
+        const psalmContainer = document.getElementById('psalmText');
+        const currentFontSize = parseInt(psalmContainer.style.fontSize) || parseInt(psalmContainer.dataset.baseFontSize) || 16;
+        const baseFontSize = isOriginalLanguage ? Math.max(18, currentFontSize) : currentFontSize;
+        const verseNumberSize = Math.max(12, Math.round(baseFontSize * 0.875));
+
+        html += `
+            <div class="verse mb-3" data-verse="${verse.verse_number}" data-verse-id="${verse.verse_id}" style="direction: ${textDirection}; ${textAlign}">
+                <span class="verse-number ${verseNumberPosition}" style="color: #E93C02; font-weight: bold; font-size: ${verseNumberSize}px; vertical-align: super; ${verseNumberFloat}">
+                    ${verse.verse_number}
+                </span>
+                <span class="verse-text" style="color: #333E4D; font-family: ${fontFamily}; font-size: ${baseFontSize}px; line-height: ${isOriginalLanguage ? '1.8' : '1.6'};">${styledText}</span>
+            </div>
+        `;
+    });
+
+    psalmText.innerHTML = html;
+}
+
+function styleSelahText(text) {
+    // Replace "Selah" (case insensitive) with styled version
+    return text.replace(/\bSelah\b/gi, '<span class="selah">Selah</span>');
+}
+
+function updatePageTitle(psalmData) {
+    // Update the page title and header
+    document.title = `Psalm ${psalmData.psalm_number} - Pray150`;
+
+    // Update the translation badge if it exists
+    const translationBadge = document.querySelector('.badge');
+    if (translationBadge) {
+        translationBadge.textContent = psalmData.translation;
+    }
+
+    // Update verse count info
+    const verseInfo = document.querySelector('small.text-muted');
+    if (verseInfo) {
+        verseInfo.textContent = `${psalmData.translation_name} • ${psalmData.verse_count} verses`;
+    }
+
+    // Update or add superscript
+    let superscriptElement = document.querySelector('.psalm-superscript');
+    const superscriptContainer = document.querySelector('.d-flex.align-items-center.gap-2').parentElement;
+
+    if (psalmData.superscript) {
+        if (!superscriptElement) {
+            const superscriptDiv = document.createElement('div');
+            superscriptDiv.className = 'mt-2';
+            superscriptDiv.innerHTML = `<small class="psalm-superscript" style="font-style: italic; color: #766659; font-family: Georgia, serif;"></small>`;
+            superscriptContainer.appendChild(superscriptDiv);
+            superscriptElement = superscriptDiv.querySelector('.psalm-superscript');
+        }
+        superscriptElement.textContent = psalmData.superscript;
+    } else {
+        if (superscriptElement) {
+            superscriptElement.parentElement.remove();
+        }
+    }
+}
+
+// Font size adjustment functionality
+let currentFontSize = 16; // Default font size
+
+function adjustFontSize(change) {
+    const psalmText = document.getElementById('psalmText');
+    const fontSizeDisplay = document.getElementById('fontSizeDisplay');
+
+    if (!psalmText || !fontSizeDisplay) return;
+
+    // Get current font size or use default
+    if (currentFontSize === 16) {
+        const currentStyle = window.getComputedStyle(psalmText).fontSize;
+        currentFontSize = parseInt(currentStyle) || 16;
+    }
+
+    // Apply change within reasonable limits
+    const newSize = Math.max(12, Math.min(32, currentFontSize + change));
+    currentFontSize = newSize;
+
+    // Update display
+    fontSizeDisplay.textContent = newSize + 'px';
+    psalmText.style.fontSize = newSize + 'px';
+
+    // Update all verse text and numbers proportionally
+    const verses = psalmText.querySelectorAll('.verse');
+    verses.forEach(verse => {
+        const verseText = verse.querySelector('.verse-text');
+        const verseNumber = verse.querySelector('.verse-number');
+
+        if (verseText) {
+            // Check if this is Hebrew or Greek text for larger base size
+            const isOriginalLang = verseText.style.fontFamily.includes('Frank Ruhl Libre') || 
+                                 verseText.style.fontFamily.includes('SBL Greek');
+            const adjustedSize = isOriginalLang ? Math.max(18, newSize) : newSize;
+            verseText.style.fontSize = adjustedSize + 'px';
+        }
+
+        if (verseNumber) {
+            verseNumber.style.fontSize = Math.max(12, Math.round(newSize * 0.875)) + 'px';
+        }
+    });
+
+    // Save user preference to localStorage
+    localStorage.setItem('pray150_fontSize', newSize);
+}
+
+// Initialize font size display on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const psalmText = document.getElementById('psalmText');
+    const fontSizeDisplay = document.getElementById('fontSizeDisplay');
+
+    if (psalmText && fontSizeDisplay) {
+        // Get saved font size from user preference or use default
+        const savedSize = localStorage.getItem('pray150_fontSize');
+        if (savedSize) {
+            const size = parseInt(savedSize);
+            if (size >= 12 && size <= 32) {
+                currentFontSize = size;
+                psalmText.style.fontSize = size + 'px';
+                fontSizeDisplay.textContent = size + 'px';
+            }
+        } else {
+            const currentStyle = window.getComputedStyle(psalmText).fontSize;
+            currentFontSize = parseInt(currentStyle) || 16;
+            fontSizeDisplay.textContent = currentFontSize + 'px';
+        }
+    }
+});
+
+// Load YouTube video for worship music
+function loadYouTubeVideo() {
+    const psalmNumber = window.psalmPageConfig.psalmNumber;
+    const youtubeContainer = document.getElementById('youtube-container');
+    const placeholder = document.getElementById('youtube-placeholder');
+
+    if (!youtubeContainer || !placeholder) return;
+
+    // Load psalm music configuration from server
+    fetch(`/api/psalm-music/${psalmNumber}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.success && data.video_id) {
+                loadPsalmVideo(data.video_id, data.alternates || []);
+            } else {
+                showPlaylistFallback();
+            }
+        })
+        .catch(error => {
+            console.log('No specific music configured, showing playlist fallback');
+            showPlaylistFallback();
+        });
+}
+
+function loadPsalmVideo(primaryVideoId, alternateVideoIds = []) {
+    const youtubeContainer = document.getElementById('youtube-container');
+    const placeholder = document.getElementById('youtube-placeholder');
+
+    if (!youtubeContainer || !placeholder) return;
+
+    // Create iframe for primary video
+    const iframe = document.createElement('iframe');
+    iframe.src = `https://www.youtube.com/embed/${primaryVideoId}?rel=0&modestbranding=1&iv_load_policy=3&cc_load_policy=0&showinfo=0`;
+    iframe.allow = 'accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture';
+    iframe.allowFullscreen = true;
+    iframe.style.width = '100%';
+    iframe.style.height = '100%';
+    iframe.style.border = 'none';
+    iframe.style.borderRadius = '8px';
+
+    // Replace placeholder with iframe
+    youtubeContainer.removeChild(placeholder);
+    youtubeContainer.appendChild(iframe);
+
+    // If there are alternate videos, show them below
+    if (alternateVideoIds.length > 0) {
+        const alternatesContainer = document.createElement('div');
+        alternatesContainer.className = 'mt-3';
+        alternatesContainer.innerHTML = `
+            <div class="text-center">
+                <small class="text-muted">Additional worship songs for this psalm:</small>
+                <div class="mt-2">
+                    ${alternateVideoIds.map((videoId, index) => 
+                        `<a href="https://www.youtube.com/watch?v=${videoId}" target="_blank" class="btn btn-outline-secondary btn-sm me-2 mb-1">
+                            <i class="fab fa-youtube me-1"></i>Song ${index + 2}
+                        </a>`
+                    ).join('')}
+                </div>
+            </div>
+        `;
+        youtubeContainer.parentNode.appendChild(alternatesContainer);
+    }
+}
+
+function showPlaylistFallback() {
+    const placeholder = document.getElementById('youtube-placeholder');
+    if (!placeholder) return;
+
+    const psalmNumber = window.psalmPageConfig.psalmNumber;
+
+    // Show link to the full playlist when no specific video is configured
+    placeholder.innerHTML = `
+        <div class="text-center">
+            <i class="fas fa-music text-muted mb-3" style="font-size: 2rem;"></i>
+            <div class="text-muted mb-3">No specific worship music configured for Psalm ${psalmNumber}</div>
+            <a href="https://youtube.com/playlist?list=PLlAZONCUO1iQr2m19nFmRLyTWdey-iXuh" 
+               target="_blank" 
+               class="btn btn-outline-primary btn-sm">
+                <i class="fab fa-youtube me-2"></i>
+                Open Full Psalm Playlist
+            </a>
+            <div class="mt-2">
+                <small class="text-muted">Browse the complete collection and worship along!</small>
+            </div>
+        </div>
+    `;
+
+
+}
+
+// Call loadYouTubeVideo when page loads
+document.addEventListener('DOMContentLoaded', loadYouTubeVideo);
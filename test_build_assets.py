@@ -0,0 +1,89 @@
+"""
+Test script for the built-in JavaScript minifier in build_assets.py
+"""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import build_assets
+from build_assets import STATIC_DIR, minify_js
+
+
+@pytest.fixture(autouse=True)
+def builtin_minifier(monkeypatch):
+    # Exercise the fallback even where rjsmin is installed
+    monkeypatch.setattr(build_assets, 'rjsmin', None)
+
+
+def test_regex_literals_and_division():
+    source = ("var half = total / 2 / count;   // per item\n"
+              "var ratio = (a + b) / c, x = arr[0] / arr[1];\n"
+              "var re = /\\/\\/[a-z]+\\//g;\n"
+              "if (/^\\d+$/.test(v)) { return /[/]/.exec(s) }\n"
+              "var parts = line.split(/,\\s*/);")
+    assert minify_js(source) == ("var half = total / 2 / count;\n"
+                                 "var ratio = (a + b) / c, x = arr[0] / arr[1];\n"
+                                 "var re = /\\/\\/[a-z]+\\//g;\n"
+                                 "if (/^\\d+$/.test(v)) { return /[/]/.exec(s) }\n"
+                                 "var parts = line.split(/,\\s*/);")
+
+
+def test_template_literals_with_substitutions():
+    source = ("const html = `<p>  ${ items.map(i => { return `<b>${i}</b> // kept`; }).join('') }   </p>`;\n"
+              "const next = `a\n   b`;  // dropped")
+    assert minify_js(source) == ("const html = `<p>  ${ items.map(i => { return `<b>${i}</b> // kept`; }).join('') }   </p>`;\n"
+                                 "const next = `a\n   b`;")
+
+
+def test_strings_containing_comment_markers():
+    source = ("var url = \"https://example.com/a\"; // comment\n"
+              "var s = 'it\\'s // not a comment';\n"
+              "var t = \"/* nor this */\";")
+    assert minify_js(source) == ("var url = \"https://example.com/a\";\n"
+                                 "var s = 'it\\'s // not a comment';\n"
+                                 "var t = \"/* nor this */\";")
+
+
+def test_comments_keep_asi_sensitive_newlines():
+    source = ("let a = 1 /* block */\n"
+              "let b = 2\n"
+              "function f() {\n"
+              "  return // nothing\n"
+              "  a\n"
+              "}\n"
+              "var c = a\n"
+              "/* multi\n   line */\n"
+              "++b\n"
+              "var d = a/* inline */+ +b")
+    assert minify_js(source) == ("let a = 1\n"
+                                 "let b = 2\n"
+                                 "function f() {\n"
+                                 "return\n"
+                                 "a\n"
+                                 "}\n"
+                                 "var c = a\n"
+                                 "++b\n"
+                                 "var d = a + +b")
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+def test_shipped_scripts_still_parse(tmp_path):
+    for filename in sorted(os.listdir(os.path.join(STATIC_DIR, 'js'))):
+        with open(os.path.join(STATIC_DIR, 'js', filename), encoding='utf-8') as f:
+            minified = minify_js(f.read())
+        path = tmp_path / filename
+        path.write_text(minified, encoding='utf-8')
+        result = subprocess.run(['node', '--check', str(path)], capture_output=True, text=True)
+        assert result.returncode == 0, f"{filename}: {result.stderr}"
+
+
+if __name__ == '__main__':
+    build_assets.rjsmin = None
+    test_regex_literals_and_division()
+    test_template_literals_with_substitutions()
+    test_strings_containing_comment_markers()
+    test_comments_keep_asi_sensitive_newlines()
+    print("✓ Asset minifier tests passed")
@@ -0,0 +1,107 @@
+"""
+Test script for upstream circuit breakers and adaptive timeouts
+"""
+
+import pytest
+import requests
+
+from upstream import AdaptiveTimeout, CircuitBreaker, CircuitOpenError, ProviderSession, reset_providers
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FlakyAdapter(requests.adapters.BaseAdapter):
+    def __init__(self):
+        super().__init__()
+        self.status = 503
+        self.calls = 0
+        self.timeouts = []
+
+    def send(self, request, timeout=None, **kwargs):
+        self.calls += 1
+        self.timeouts.append(timeout)
+        response = requests.Response()
+        response.status_code = self.status
+        response._content = b'[]'
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fresh_providers():
+    reset_providers()
+    yield
+    reset_providers()
+
+
+def test_circuit_opens_on_failure_rate_and_probes_when_half_open():
+    clock = Clock()
+    breaker = CircuitBreaker('rkeplin', failure_rate=0.5, min_calls=4, window=10, open_seconds=30, clock=clock)
+    for success in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record(success)
+    assert breaker.state == breaker.OPEN and not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow()           # the probe
+    assert not breaker.allow()       # only one at a time
+    breaker.record(False)
+    assert breaker.state == breaker.OPEN
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == breaker.CLOSED and breaker.stats == {'opened': 2, 'rejected': 2}
+
+
+def test_open_circuit_fails_fast_without_calling_the_provider():
+    session = ProviderSession('flaky')
+    adapter = FlakyAdapter()
+    session.mount('https://', adapter)
+
+    for _ in range(5):
+        assert session.get('https://flaky.test/psalm', timeout=30).status_code == 503
+    with pytest.raises(CircuitOpenError) as excinfo:
+        session.get('https://flaky.test/psalm', timeout=30)
+    # Callers' existing network-error handling applies
+    assert isinstance(excinfo.value, requests.RequestException)
+    assert adapter.calls == 5
+
+    # Shared by every session of the provider
+    with pytest.raises(CircuitOpenError):
+        ProviderSession('flaky').get('https://flaky.test/psalm')
+
+
+def test_adaptive_timeout_follows_latency_percentile():
+    timeouts = AdaptiveTimeout(percentile=0.9, multiplier=3, minimum=0.5, min_samples=10)
+    assert timeouts.timeout(30) == 30            # not enough samples yet
+    for _ in range(20):
+        timeouts.observe(0.4)
+    assert timeouts.timeout(30) == pytest.approx(1.2)
+    assert timeouts.timeout(1) == 1              # never above the caller's timeout
+
+    fast = AdaptiveTimeout(minimum=0.5, min_samples=1)
+    fast.observe(0.01)
+    assert fast.timeout(30) == 0.5
+
+
+def test_sessions_use_the_adaptive_timeout(monkeypatch):
+    monkeypatch.setenv('UPSTREAM_TIMEOUT_MIN', '0.1')
+    session = ProviderSession('adaptive')
+    adapter = FlakyAdapter()
+    adapter.status = 200
+    session.mount('https://', adapter)
+    for _ in range(25):
+        session.get('https://adaptive.test/psalm', timeout=30)
+
+    assert adapter.timeouts[0] == 30
+    assert adapter.timeouts[-1] < 1
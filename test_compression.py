@@ -0,0 +1,88 @@
+"""
+Test script for the response compression layer
+"""
+
+import gzip
+from flask import Flask, Response, jsonify
+from compression import Compress
+
+
+def make_app():
+    app = Flask(__name__)
+    compress = Compress(app)
+
+    @app.route('/big')
+    def big():
+        return jsonify({'verses': ['Blessed is the one who does not walk in step with the wicked'] * 50})
+
+    @app.route('/small')
+    def small():
+        return jsonify({'ok': True})
+
+    @app.route('/cached')
+    def cached():
+        response = jsonify({'verses': ['The Lord is my shepherd, I lack nothing.'] * 50})
+        response.cache_control.public = True
+        return response
+
+    @app.route('/stream')
+    def stream():
+        def generate():
+            for i in range(100):
+                yield f"<p>Psalm {i}</p>\n"
+        return Response(generate(), mimetype='text/html')
+
+    return app, compress
+
+
+def test_gzip_negotiation():
+    app, _ = make_app()
+    client = app.test_client()
+
+    response = client.get('/big', headers={'Accept-Encoding': 'gzip'})
+    print(f"1. /big with gzip: {response.headers.get('Content-Encoding')} ({len(response.data)} bytes)")
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert b'Blessed is the one' in gzip.decompress(response.data)
+
+    response = client.get('/big')
+    print(f"2. /big without Accept-Encoding: {response.headers.get('Content-Encoding')}")
+    assert 'Content-Encoding' not in response.headers
+
+    response = client.get('/big', headers={'Accept-Encoding': 'gzip;q=0'})
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_size_threshold():
+    app, _ = make_app()
+    response = app.test_client().get('/small', headers={'Accept-Encoding': 'gzip'})
+    print(f"3. /small below threshold: {response.headers.get('Content-Encoding')}")
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_streaming():
+    app, _ = make_app()
+    response = app.test_client().get('/stream', headers={'Accept-Encoding': 'gzip'})
+    body = gzip.decompress(response.data).decode()
+    print(f"4. /stream: {response.headers.get('Content-Encoding')}, {body.count('<p>')} paragraphs")
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert body.count('<p>') == 100
+
+
+def test_precompressed_variants():
+    app, compress = make_app()
+    client = app.test_client()
+    first = client.get('/cached', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/cached', headers={'Accept-Encoding': 'gzip'})
+    print(f"5. Variant cache: hits={compress.variants.hits} misses={compress.variants.misses}")
+    assert first.data == second.data
+    assert compress.variants.hits == 1
+    assert compress.variants.misses == 1
+
+
+if __name__ == "__main__":
+    test_gzip_negotiation()
+    test_size_threshold()
+    test_streaming()
+    test_precompressed_variants()
+    print("\nCompression tests completed successfully!")
@@ -0,0 +1,106 @@
+"""
+Test script for Heart Tracker emotion analytics
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import database
+from emotion_analytics import EmotionAnalytics
+from fake_supabase import APP_TABLES, MemoryClient, MemoryDatabase
+from models import JournalEntry
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+class CountingClient(MemoryClient):
+    def __init__(self, db):
+        super().__init__(db)
+        self.tables = []
+
+    def table(self, name):
+        self.tables.append(name)
+        return super().table(name)
+
+
+@pytest.fixture
+def supabase(monkeypatch):
+    client = CountingClient(MemoryDatabase())
+    monkeypatch.setattr(database, 'get_supabase_client', lambda: client)
+    return client
+
+
+def add_entry(client, emotion, days_ago, user_id='u1', **responses):
+    created_at = (NOW - timedelta(days=days_ago)).isoformat()
+    client.table('journal_entries').insert({'user_id': user_id, 'psalm_id': 23, 'created_at': created_at,
+                                            'prompt_responses': dict(responses, emotion=emotion)}).execute()
+
+
+def test_trend_windows_come_from_one_query_of_emotions_only(supabase):
+    for emotion, days_ago in (('good', 40), ('bad', 20), ('great', 3), ('grateful', 2), ('okay', 1)):
+        add_entry(supabase, emotion, days_ago, **{'1': 'A long reflection'})
+    add_entry(supabase, 'terrible', 1, user_id='u2')
+
+    rows = supabase.table('journal_entries').select('created_at,emotion:prompt_responses->>emotion,'
+                                                    'prompt_responses->1').eq('user_id', 'u1').execute().data
+    assert set(rows[0]) == {'created_at', 'emotion', '1'}
+
+    supabase.tables.clear()
+    trends = EmotionAnalytics().trends('u1', windows=(7, 30), now=NOW)
+    assert supabase.tables == ['journal_entries']
+    assert [point['emotion'] for point in trends[30]] == ['bad', 'great', 'okay']
+    assert trends[7] == [{'date': '2026-10-16', 'emotion': 'great', 'value': 5},
+                         {'date': '2026-10-18', 'emotion': 'okay', 'value': 3}]
+
+
+def test_journal_saves_keep_daily_aggregates_current(supabase):
+    entry = JournalEntry(user_id='u1', psalm_id=23, prompt_responses={'emotion': 'good', '1': 'Draft'})
+    entry.save()
+    JournalEntry(user_id='u1', psalm_id=24, prompt_responses={'emotion': 'great'}).save()
+    day = datetime.utcnow().date().isoformat()
+    rows = supabase.table('emotion_daily').select('*').execute().data
+    assert len(rows) == 1
+    assert (rows[0]['day'], rows[0]['good'], rows[0]['great'], rows[0]['entries'], rows[0]['value_sum']) == \
+        (day, 1, 1, 2, 9)
+
+    # Autosaves that keep the emotion do not touch the aggregates
+    supabase.tables.clear()
+    entry.prompt_responses['2'] = 'More text'
+    entry.save()
+    assert supabase.tables == ['journal_entries']
+
+    entry.prompt_responses['emotion'] = 'bad'
+    entry.save()
+    row = supabase.table('emotion_daily').select('*').execute().data[0]
+    assert (row['bad'], row['good'], row['great'], row['value_sum']) == (1, 0, 1, 7)
+
+
+def test_daily_points_from_aggregates(supabase):
+    for emotion, days_ago in (('good', 300), ('great', 300), ('bad', 300), ('okay', 10), ('okay', 400)):
+        add_entry(supabase, emotion, days_ago)
+    analytics = EmotionAnalytics()
+    for days_ago in (300, 10, 400):
+        assert analytics.record_entry('u1', (NOW - timedelta(days=days_ago)).isoformat())
+
+    supabase.tables.clear()
+    points = analytics.daily('u1', days=365, now=NOW)
+    assert supabase.tables == ['emotion_daily']
+    assert points == [
+        {'date': (NOW - timedelta(days=300)).date().isoformat(), 'emotion': 'great', 'value': 3.67, 'entries': 3},
+        {'date': (NOW - timedelta(days=10)).date().isoformat(), 'emotion': 'okay', 'value': 3.0, 'entries': 1},
+    ]
+
+
+def test_daily_points_fall_back_to_entries_without_the_table(monkeypatch):
+    client = MemoryClient(MemoryDatabase(tables=[name for name in APP_TABLES if name != 'emotion_daily']))
+    monkeypatch.setattr(database, 'get_supabase_client', lambda: client)
+    for emotion, days_ago in (('good', 5), ('bad', 5), ('great', 2)):
+        add_entry(client, emotion, days_ago)
+
+    analytics = EmotionAnalytics()
+    assert not analytics.record_entry('u1', NOW)
+    assert analytics.daily('u1', days=30, now=NOW) == [
+        {'date': '2026-10-14', 'emotion': 'good', 'value': 3.0, 'entries': 2},
+        {'date': '2026-10-17', 'emotion': 'great', 'value': 5.0, 'entries': 1},
+    ]
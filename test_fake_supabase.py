@@ -0,0 +1,59 @@
+"""
+Test script for the local Supabase stand-in used by benchmark_load.py
+"""
+
+import pytest
+import requests
+from supabase import create_client
+
+from bible_fixtures import FIXTURE_ROUTES, RKEPLIN_PREFIX
+from fake_supabase import FAKE_ANON_KEY, FakeSupabaseServer
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = FakeSupabaseServer(extra_routes=FIXTURE_ROUTES).start()
+    yield server
+    server.stop()
+
+
+def test_sign_in_and_profile_lookup(server):
+    user_id = server.db.add_user('reader@example.com', 'secret', first_name='Reader')
+    client = create_client(server.url, FAKE_ANON_KEY)
+
+    assert client.auth.sign_in_with_password({'email': 'reader@example.com', 'password': 'secret'}).user.id == user_id
+    profile = client.table('user_profiles').select('first_name').eq('user_id', user_id).execute()
+    assert profile.data == [{'first_name': 'Reader'}]
+
+
+def test_query_builder_round_trip(server):
+    client = create_client(server.url, FAKE_ANON_KEY)
+    for psalm_id in (23, 23, 91):
+        client.table('journal_entries').insert({'user_id': 'u1', 'psalm_id': psalm_id,
+                                                'prompt_responses': {'completed': True}}).execute()
+
+    result = client.table('journal_entries').select('id, psalm_id', count='exact')\
+        .eq('user_id', 'u1').eq('psalm_id', 23).order('id', desc=True).limit(1).execute()
+    assert result.count == 2 and len(result.data) == 1 and result.data[0]['psalm_id'] == 23
+
+    client.table('journal_entries').update({'psalm_id': 24}).eq('id', result.data[0]['id']).execute()
+    client.table('journal_entries').delete().eq('psalm_id', 91).execute()
+    remaining = client.table('journal_entries').select('psalm_id').eq('user_id', 'u1').order('psalm_id').execute()
+    assert [row['psalm_id'] for row in remaining.data] == [23, 24]
+
+
+def test_upsert_and_missing_relations(server):
+    client = create_client(server.url, FAKE_ANON_KEY)
+    client.table('psalms').upsert([{'psalm_number': 1, 'music_url': 'a'}], on_conflict='psalm_number').execute()
+    client.table('psalms').upsert([{'psalm_number': 1, 'music_url': 'b'}], on_conflict='psalm_number').execute()
+    assert client.table('psalms').select('music_url').eq('psalm_number', 1).execute().data == [{'music_url': 'b'}]
+
+    with pytest.raises(Exception, match='does not exist'):
+        client.table('no_such_table').select('*').execute()
+
+
+def test_bible_fixtures_are_deterministic(server):
+    url = f"{server.url}{RKEPLIN_PREFIX}/books/19/chapters/23"
+    first = requests.get(url, params={'translation': 'ESV'}).json()
+    assert len(first) == 6 and first[0]['verseId'] == 1
+    assert requests.get(url, params={'translation': 'ESV'}).json() == first
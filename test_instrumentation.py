@@ -0,0 +1,96 @@
+"""
+Test script for per-request Supabase/upstream accounting
+"""
+
+import logging
+
+import requests
+from flask import Flask
+
+from instrumentation import RequestInstrumentation, instrument_supabase
+from upstream import ProviderSession
+
+
+class FakeResult:
+    data = [{'id': 1}]
+
+
+class FakeQuery:
+    def select(self, *args, **kwargs):
+        return self
+
+    def eq(self, *args):
+        return self
+
+    def execute(self):
+        return FakeResult()
+
+
+class FakeClient:
+    def table(self, name):
+        return FakeQuery()
+
+    def rpc(self, fn, params=None):
+        return FakeQuery()
+
+
+class FakeAdapter(requests.adapters.BaseAdapter):
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 503 if 'down' in request.url else 200
+        response._content = b'{}'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def make_app(**config):
+    app = Flask(__name__)
+    app.config.update(config)
+    RequestInstrumentation(app)
+
+    session = ProviderSession('rkeplin')
+    session.mount('https://', FakeAdapter())
+
+    @app.route('/psalm')
+    def psalm():
+        supabase = instrument_supabase(FakeClient())
+        supabase.table('psalms').select('*').eq('psalm_number', 23).execute()
+        supabase.rpc('save_listening_progress', {'rows': []}).execute()
+        session.get('https://bible.example/psalm/23')
+        session.get('https://bible.example/down')
+        return 'ok'
+
+    return app
+
+
+def test_server_timing_counts_every_call():
+    response = make_app().test_client().get('/psalm')
+    header = response.headers['Server-Timing']
+    assert 'supabase;desc="Supabase (2)"' in header
+    assert 'rkeplin;desc="Bible API (2)"' in header
+    assert 'total;dur=' in header
+
+
+def test_summary_line_is_logged(caplog):
+    with caplog.at_level(logging.INFO, logger='instrumentation'):
+        make_app().test_client().get('/psalm')
+    line = caplog.records[-1].getMessage()
+    assert line.startswith('request method=GET path=/psalm endpoint=psalm status=200')
+    assert 'supabase_calls=2' in line and 'rkeplin_calls=2' in line and 'rkeplin_errors=1' in line
+
+
+def test_slow_requests_are_warnings(caplog):
+    with caplog.at_level(logging.INFO, logger='instrumentation'):
+        make_app(SLOW_REQUEST_MS=0.001).test_client().get('/psalm')
+    record = caplog.records[-1]
+    assert record.levelno == logging.WARNING
+    assert 'slowest=[' in record.getMessage()
+
+
+def test_calls_outside_requests_are_not_accounted():
+    assert instrument_supabase(FakeClient()).table('psalms').select('*').execute().data == [{'id': 1}]
+    assert make_app(SERVER_TIMING_ENABLED=False).test_client().get('/psalm').headers.get('Server-Timing') is None
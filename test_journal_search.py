@@ -0,0 +1,75 @@
+"""
+Test script for journal search snippets and the in-app fallback
+"""
+
+import models
+from journal_search import HIGHLIGHT_START, HIGHLIGHT_STOP, entry_text, render_snippet, search_entries
+from models import JournalEntry
+
+
+def entry(id, created_at, **responses):
+    return JournalEntry(id=id, user_id='u1', psalm_id=id, created_at=created_at,
+                        prompt_responses=dict(responses, completed=True))
+
+
+ENTRIES = [
+    entry(1, '2025-08-01T10:00:00+00:00', **{'1': 'Feeling <b>anxious</b> about work', '2': 'God is my refuge'}),
+    entry(2, '2025-08-02T10:00:00+00:00', **{'1': 'Refuge, refuge, strength and refuge'}),
+    entry(3, '2025-08-03T10:00:00+00:00', **{'1': 'Grateful for rest'}),
+]
+
+
+def test_entry_text_strips_markup():
+    assert entry_text(ENTRIES[0].prompt_responses) == 'Feeling anxious about work God is my refuge'
+
+
+def test_render_snippet_escapes_user_text():
+    raw = f"<script>x</script> {HIGHLIGHT_START}refuge{HIGHLIGHT_STOP}"
+    assert str(render_snippet(raw)) == '&lt;script&gt;x&lt;/script&gt; <mark>refuge</mark>'
+
+
+def test_search_entries_ranks_by_matches():
+    matches = search_entries(ENTRIES, 'refuge')
+    assert [match[0].id for match in matches] == [2, 1]
+    assert f"{HIGHLIGHT_START}Refuge{HIGHLIGHT_STOP}" in matches[0][2]
+    assert search_entries(ENTRIES, 'refuge rest') == []
+
+
+def test_search_falls_back_without_index(monkeypatch):
+    def no_index():
+        raise RuntimeError('search_journal_entries is not installed')
+
+    monkeypatch.setattr(models, 'get_supabase_client', no_index)
+    monkeypatch.setattr(JournalEntry, 'get_all_by_user', staticmethod(lambda user_id: list(ENTRIES)))
+
+    entries, total = JournalEntry.search('u1', 'refuge', page=2, per_page=1)
+    assert total == 2
+    assert [e.id for e in entries] == [1]
+    assert '<mark>refuge</mark>' in str(entries[0].snippet)
+
+
+def test_indexed_search_attaches_psalms(monkeypatch):
+    row = {'id': 7, 'psalm_id': 23, 'prompt_responses': {'1': 'Still waters', 'completed': 'True'},
+           'created_at': '2025-08-04T10:00:00+00:00', 'rank': 0.5,
+           'snippet': f"{HIGHLIGHT_START}Still{HIGHLIGHT_STOP} waters", 'total_count': 1}
+
+    class Client:
+        def rpc(self, name, params):
+            self.call = (name, params)
+            return self
+
+        def execute(self):
+            return type('Result', (), {'data': [row]})
+
+    monkeypatch.setattr(models, 'get_supabase_client', Client)
+    entries, total = JournalEntry.search('u1', 'still', per_page=5)
+    assert total == 1
+    assert isinstance(entries[0].psalm, models.Psalm) and entries[0].psalm.number == 23
+    assert str(entries[0].snippet) == '<mark>Still</mark> waters'
+
+
+if __name__ == '__main__':
+    test_entry_text_strips_markup()
+    test_render_snippet_escapes_user_text()
+    test_search_entries_ranks_by_matches()
+    print("✓ Journal search tests passed")
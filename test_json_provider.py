@@ -0,0 +1,63 @@
+"""
+Test script for the orjson-backed JSON provider
+"""
+
+from datetime import date, datetime, timezone
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from json_provider import FastJSONProvider
+from models import Psalm
+
+
+def make_providers():
+    app = Flask(__name__)
+    return app, DefaultJSONProvider(app), FastJSONProvider(app)
+
+
+def test_output_matches_default_provider():
+    app, stdlib, fast = make_providers()
+    payload = {
+        'success': True,
+        'verses': [{'verse_number': 1, 'text': 'Blessed is the one'}],
+        'created_at': datetime(2025, 8, 1, 12, 30, tzinfo=timezone.utc),
+        'day': date(2025, 8, 1),
+        'zeta': None,
+        'alpha': 1.5,
+    }
+    with app.app_context():
+        assert fast.response(payload).get_data() == stdlib.response(payload).get_data()
+
+
+def test_non_ascii_is_utf8_encoded():
+    app, stdlib, fast = make_providers()
+    payload = {'text': 'Hallelujah — praise the Lord…'}
+    with app.app_context():
+        body = fast.response(payload).get_data()
+        assert '—'.encode('utf-8') in body
+        assert fast.loads(body) == stdlib.loads(stdlib.response(payload).get_data())
+
+
+def test_model_objects_use_to_dict():
+    app, _, fast = make_providers()
+    psalm = Psalm(id=23, psalm_number=23, music_url='https://youtu.be/example')
+    with app.app_context():
+        body = fast.loads(fast.response({'psalm': psalm}).get_data())
+    assert body['psalm']['psalm_number'] == 23
+    assert body['psalm']['music_url'] == 'https://youtu.be/example'
+
+
+def test_unencodable_values_fall_back_to_stdlib():
+    app, stdlib, fast = make_providers()
+    payload = {'big': 2 ** 70, 'verses': [1, 2, 3]}
+    with app.app_context():
+        assert fast.loads(fast.response(payload).get_data()) == stdlib.loads(stdlib.response(payload).get_data())
+
+
+if __name__ == '__main__':
+    test_output_matches_default_provider()
+    test_non_ascii_is_utf8_encoded()
+    test_model_objects_use_to_dict()
+    test_unencodable_values_fall_back_to_stdlib()
+    print("✓ JSON provider tests passed")
@@ -0,0 +1,79 @@
+"""
+Test script for the listening progress write-behind buffer
+"""
+
+import listening_buffer
+from listening_buffer import ListeningProgressBuffer
+from models import User
+
+
+def make_buffer(fail=()):
+    batches = []
+
+    def writer(rows):
+        batches.append(rows)
+        return [row['user_id'] for row in rows if row['user_id'] not in fail]
+
+    return ListeningProgressBuffer(flush_interval=3600, writer=writer), batches
+
+
+def test_heartbeats_are_coalesced_per_user():
+    buffer, batches = make_buffer()
+    for position in range(10):
+        buffer.record('u1', 23, position)
+    buffer.record('u2', 91, 5.5)
+
+    assert buffer.flush() == 2
+    assert len(batches) == 1
+    assert {row['user_id']: row['listen_current_position'] for row in batches[0]} == {'u1': 9, 'u2': 5.5}
+    assert buffer.flush() == 0
+
+
+def test_failed_rows_are_retried_with_latest_position():
+    buffer, batches = make_buffer(fail={'u1'})
+    buffer.record('u1', 23, 10)
+    buffer.flush()
+    buffer.record('u1', 23, 40)
+    assert buffer.pending_count() == 1
+    buffer.flush()
+    assert batches[-1][0]['listen_current_position'] == 40
+
+
+def test_flushed_rows_are_dropped_unless_newer():
+    buffer, batches = make_buffer(fail={'u2'})
+    buffer.record('u1', 23, 10)
+    buffer.record('u2', 91, 5)
+    buffer.flush()
+    assert buffer.get('u1') is None
+    assert buffer.get('u2')['listen_current_position'] == 5
+
+    # A heartbeat that lands while its predecessor is being written is kept
+    def writer(rows):
+        buffer.record('u3', 1, 99)
+        return [row['user_id'] for row in rows]
+
+    buffer._writer = writer
+    buffer.record('u3', 1, 50)
+    buffer.flush()
+    assert buffer.get('u3')['listen_current_position'] == 99
+    assert buffer.get('u2') is None
+    assert buffer.pending_count() == 1
+
+
+def test_resume_position_reads_buffer_first(monkeypatch):
+    buffer, _ = make_buffer()
+    monkeypatch.setattr(listening_buffer, 'listening_buffer', buffer)
+
+    user = User(id='u3', listen_current_psalm=1, listen_current_position=12,
+                listen_last_updated='2000-01-01T00:00:00')
+    assert user.get_listening_resume_position() == {'psalm_number': 1, 'position': 12}
+
+    User(id='u3').update_listening_progress(27, 61.5)
+    assert user.get_listening_resume_position() == {'psalm_number': 27, 'position': 61.5}
+
+
+if __name__ == '__main__':
+    test_heartbeats_are_coalesced_per_user()
+    test_failed_rows_are_retried_with_latest_position()
+    test_flushed_rows_are_dropped_unless_newer()
+    print("✓ Listening buffer tests passed")
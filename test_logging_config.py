@@ -0,0 +1,67 @@
+"""
+Test script for the leveled/JSON logging setup
+"""
+
+import io
+import json
+import logging
+
+import pytest
+
+from logging_config import configure_logging, parse_levels
+
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    logging.getLogger('models').setLevel(logging.NOTSET)
+
+
+def test_parse_levels():
+    assert parse_levels('models=debug, routes=WARNING,bad,=x') == {'models': 'DEBUG', 'routes': 'WARNING'}
+
+
+def test_json_output_includes_extra_fields(restore_logging):
+    stream = io.StringIO()
+    configure_logging(level='INFO', levels='', fmt='json', stream=stream)
+    logging.getLogger('routes').info("Saved %s entries", 2, extra={'user_id': 'u1'})
+
+    entry = json.loads(stream.getvalue())
+    assert entry['level'] == 'INFO' and entry['logger'] == 'routes'
+    assert entry['message'] == 'Saved 2 entries'
+    assert entry['user_id'] == 'u1'
+
+
+def test_disabled_debug_is_never_formatted(restore_logging):
+    class Expensive:
+        formatted = 0
+
+        def __str__(self):
+            Expensive.formatted += 1
+            return 'big object'
+
+    stream = io.StringIO()
+    configure_logging(level='INFO', levels='models=DEBUG', stream=stream)
+    logging.getLogger('routes').debug("Query result: %s", Expensive())
+    assert Expensive.formatted == 0 and stream.getvalue() == ''
+
+    logging.getLogger('models').debug("Query result: %s", Expensive())
+    assert Expensive.formatted == 1 and 'big object' in stream.getvalue()
+
+
+def test_sampled_events_keep_one_in_n(restore_logging, monkeypatch):
+    monkeypatch.setenv('LOG_SAMPLE_EVERY', '5')
+    stream = io.StringIO()
+    configure_logging(level='DEBUG', levels='', stream=stream)
+    logger = logging.getLogger('routes')
+    for number in range(12):
+        logger.debug("Autosaved %s", number, extra={'sample': 'journal.autosave'})
+    logger.debug("Not sampled")
+
+    assert stream.getvalue().splitlines() == [
+        'DEBUG:routes:Autosaved 0', 'DEBUG:routes:Autosaved 5', 'DEBUG:routes:Autosaved 10',
+        'DEBUG:routes:Not sampled']
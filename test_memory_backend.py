@@ -0,0 +1,69 @@
+"""
+Test script for the in-process Supabase backend (SUPABASE_BACKEND=memory)
+"""
+
+import pytest
+
+from fake_supabase import MemoryClient, MemoryDatabase, QueryError, seed_synthetic_data
+
+
+@pytest.fixture
+def client():
+    return MemoryClient(MemoryDatabase())
+
+
+def test_get_supabase_client_selects_memory_backend(monkeypatch):
+    import fake_supabase
+    from database import get_supabase_client
+
+    monkeypatch.setenv('SUPABASE_BACKEND', 'memory')
+    monkeypatch.setenv('SUPABASE_MEMORY_SEED', 'users=3,entries=30')
+    monkeypatch.setattr(fake_supabase, '_memory_database', None)
+
+    supabase = get_supabase_client()
+    assert isinstance(supabase.client, MemoryClient)
+    result = supabase.table('journal_entries').select('id', count='exact').execute()
+    assert result.count == 30
+    assert supabase.table('psalms').select('*').eq('psalm_number', 150).execute().data
+
+
+def test_query_builder_subset(client):
+    for psalm_id in (23, 23, 91):
+        client.table('journal_entries').insert({'user_id': 'u1', 'psalm_id': psalm_id,
+                                                'prompt_responses': {'completed': True}}).execute()
+
+    result = client.table('journal_entries').select('id, psalm_id', count='exact')\
+        .eq('user_id', 'u1').gte('psalm_id', 23).order('id', desc=True).limit(1).execute()
+    assert result.count == 3 and result.data[0]['id'] == 3
+
+    client.table('journal_entries').update({'psalm_id': 24}).eq('id', 1).execute()
+    client.table('journal_entries').delete().eq('psalm_id', 91).execute()
+    rows = client.table('journal_entries').select('psalm_id').in_('psalm_id', [23, 24]).order('id').execute()
+    assert rows.data == [{'psalm_id': 24}, {'psalm_id': 23}]
+
+    client.table('psalms').upsert([{'psalm_number': 1, 'music_url': 'a'}], on_conflict='psalm_number').execute()
+    client.table('psalms').upsert([{'psalm_number': 1, 'music_url': 'b'}], on_conflict='psalm_number').execute()
+    assert client.table('psalms').select('music_url').execute().data == [{'music_url': 'b'}]
+
+
+def test_returned_rows_are_copies(client):
+    client.table('journal_entries').insert({'user_id': 'u1', 'prompt_responses': {'1': 'first'}}).execute()
+
+    row = client.table('journal_entries').select('*').eq('user_id', 'u1').execute().data[0]
+    row['prompt_responses']['1'] = 'changed in the app'
+    stored = client.table('journal_entries').select('prompt_responses').eq('id', row['id']).execute()
+    assert stored.data[0]['prompt_responses'] == {'1': 'first'}
+
+
+def test_auth_and_synthetic_seed():
+    db = MemoryDatabase()
+    seed_synthetic_data(db, users=10, entries=200, password='secret')
+    client = MemoryClient(db)
+
+    with pytest.raises(QueryError):
+        client.auth.sign_in_with_password({'email': 'user3@synthetic.pray150.local', 'password': 'wrong'})
+    user = client.auth.sign_in_with_password({'email': 'user3@synthetic.pray150.local', 'password': 'secret'}).user
+    assert client.auth.get_user().user.email == 'user3@synthetic.pray150.local'
+
+    entries = client.table('journal_entries').select('user_id', count='exact').eq('user_id', user.id).execute()
+    assert entries.count == 20 and len(db.tables['psalms'].rows) == 150
@@ -0,0 +1,66 @@
+"""
+Test script for the Prometheus metrics registry and /metrics endpoint
+"""
+
+import json
+
+from flask import Flask
+
+from instrumentation import record
+from metrics import MetricsRegistry, PrometheusMetrics, registry
+
+
+def test_histogram_and_counter_rendering():
+    metrics = MetricsRegistry(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 3.0):
+        metrics.observe('pray150_http_request_duration_seconds', seconds, {'endpoint': 'main.psalm'})
+    metrics.inc('pray150_journal_saves_total', {'action': 'update', 'result': 'ok'}, 2)
+
+    text = metrics.render(directory='')
+    assert '# TYPE pray150_http_request_duration_seconds histogram' in text
+    assert 'pray150_http_request_duration_seconds_bucket{endpoint="main.psalm",le="0.1"} 1' in text
+    assert 'pray150_http_request_duration_seconds_bucket{endpoint="main.psalm",le="1"} 2' in text
+    assert 'pray150_http_request_duration_seconds_bucket{endpoint="main.psalm",le="+Inf"} 3' in text
+    assert 'pray150_http_request_duration_seconds_count{endpoint="main.psalm"} 3' in text
+    assert 'pray150_journal_saves_total{action="update",result="ok"} 2' in text
+
+
+def test_worker_files_are_summed(tmp_path):
+    worker = MetricsRegistry(buckets=(0.1, 1.0))
+    worker.inc('pray150_supabase_queries_total', value=5)
+    worker.observe('pray150_upstream_request_duration_seconds', 0.2, {'provider': 'bolls'})
+    # Another worker's file, as written by MetricsRegistry.dump in that process
+    (tmp_path / 'metrics_999999.json').write_text(json.dumps(worker.snapshot()))
+
+    live = MetricsRegistry(buckets=(0.1, 1.0))
+    live.inc('pray150_supabase_queries_total', value=2)
+    live.dump(str(tmp_path))
+
+    text = live.render(str(tmp_path))
+    assert 'pray150_supabase_queries_total 7' in text
+    assert 'pray150_upstream_request_duration_seconds_count{provider="bolls"} 1' in text
+
+
+def test_instrumented_calls_feed_provider_metrics():
+    record('api.bible', 40.0, error=True)
+    text = registry.render(directory='')
+    assert 'pray150_upstream_errors_total{provider="api.bible"}' in text
+    assert 'pray150_upstream_request_duration_seconds_count{provider="api.bible"}' in text
+
+
+def test_metrics_endpoint_records_routes_and_checks_token():
+    app = Flask(__name__)
+    app.config['METRICS_TOKEN'] = 'secret'
+    PrometheusMetrics(MetricsRegistry(), app)
+
+    @app.route('/dashboard')
+    def dashboard():
+        return 'ok'
+
+    client = app.test_client()
+    client.get('/dashboard')
+    assert client.get('/metrics').status_code == 401
+
+    response = client.get('/metrics', headers={'Authorization': 'Bearer secret'})
+    assert response.status_code == 200
+    assert 'pray150_http_requests_total{endpoint="dashboard",method="GET",status="2xx"} 1' in response.get_data(as_text=True)
@@ -0,0 +1,90 @@
+"""
+Test script for the precompiled music catalog endpoints
+"""
+
+from flask import Flask, jsonify
+
+from psalm_music_config import get_all_psalm_videos, get_psalm_alternate_videos, get_psalm_video_id, has_psalm_music
+from routes import main_bp
+
+
+def make_app():
+    app = Flask(__name__)
+    app.register_blueprint(main_bp)
+    return app
+
+
+def legacy_playlist():
+    # The payload /api/psalms-with-music built per request before precompilation
+    psalms = []
+    for psalm_num in range(1, 151):
+        if has_psalm_music(psalm_num):
+            for i, video_id in enumerate(get_all_psalm_videos(psalm_num)):
+                if video_id:
+                    suffix = chr(ord('b') + i - 1) if i > 0 else ''
+                    psalms.append({
+                        'psalm_number': psalm_num,
+                        'video_id': video_id,
+                        'display_name': f"Psalm {psalm_num}{suffix}",
+                        'is_alternate': i > 0,
+                        'alternate_index': i
+                    })
+    return {'success': True, 'psalms': psalms, 'total': len(psalms)}
+
+
+def legacy_psalm_music(psalm_number):
+    video_id = get_psalm_video_id(psalm_number)
+    alternates = get_psalm_alternate_videos(psalm_number)
+    if video_id or alternates:
+        return {'success': True, 'psalm_number': psalm_number, 'video_id': video_id,
+                'alternates': alternates, 'has_music': True}
+    return {'success': False, 'psalm_number': psalm_number, 'has_music': False,
+            'message': 'No music configured for this psalm'}
+
+
+def test_playlist_body_matches_jsonify():
+    app = make_app()
+    response = app.test_client().get('/api/psalms-with-music')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    with app.app_context():
+        assert response.get_data() == jsonify(legacy_playlist()).get_data()
+
+
+def test_psalm_music_bodies_match_jsonify():
+    app = make_app()
+    client = app.test_client()
+    with app.app_context():
+        for psalm_number in range(1, 151):
+            response = client.get(f'/api/psalm-music/{psalm_number}')
+            assert response.status_code == 200
+            assert response.get_data() == jsonify(legacy_psalm_music(psalm_number)).get_data()
+
+
+def test_if_none_match_returns_304():
+    client = make_app().test_client()
+    for path in ('/api/psalms-with-music', '/api/psalm-music/23'):
+        first = client.get(path)
+        etag = first.headers['ETag']
+        assert 'max-age=3600' in first.headers['Cache-Control']
+
+        revalidated = client.get(path, headers={'If-None-Match': etag})
+        assert revalidated.status_code == 304
+        assert revalidated.get_data() == b''
+
+        stale = client.get(path, headers={'If-None-Match': '"outdated"'})
+        assert stale.status_code == 200
+
+
+def test_invalid_psalm_number_is_rejected():
+    response = make_app().test_client().get('/api/psalm-music/151')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+if __name__ == '__main__':
+    test_playlist_body_matches_jsonify()
+    test_psalm_music_bodies_match_jsonify()
+    test_if_none_match_returns_304()
+    test_invalid_psalm_number_is_rejected()
+    print("✓ Music catalog tests passed")
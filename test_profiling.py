@@ -0,0 +1,64 @@
+"""
+Test script for the admin request profiler
+"""
+
+import pstats
+import time
+
+from flask import Flask
+
+from profiling import RequestProfiler
+
+
+def make_app(tmp_path, allowed=True):
+    app = Flask(__name__)
+    app.config['PROFILE_DIR'] = str(tmp_path)
+    app.config['PROFILE_SAMPLE_INTERVAL'] = 0.001
+    profiler = RequestProfiler(app, is_allowed=lambda: allowed)
+
+    @app.route('/dashboard')
+    def dashboard():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            sum(range(100))
+        return 'ok'
+
+    return app, profiler
+
+
+def test_unflagged_requests_are_not_profiled(tmp_path):
+    app, profiler = make_app(tmp_path)
+    response = app.test_client().get('/dashboard')
+    assert 'X-Profile-Id' not in response.headers
+    assert profiler.store.list() == []
+
+
+def test_non_admins_cannot_profile(tmp_path):
+    app, profiler = make_app(tmp_path, allowed=False)
+    response = app.test_client().get('/dashboard', headers={'X-Profile': '1'})
+    assert 'X-Profile-Id' not in response.headers
+    assert profiler.store.list() == []
+
+
+def test_sampled_profile_exports_collapsed_stacks(tmp_path):
+    app, profiler = make_app(tmp_path)
+    response = app.test_client().get('/dashboard?_profile=1')
+    profile_id = response.headers['X-Profile-Id']
+
+    meta = profiler.store.list()[0]
+    assert meta['id'] == profile_id and meta['mode'] == 'sample' and meta['path'] == '/dashboard?_profile=1'
+    with open(profiler.store.path(profile_id, 'folded')) as f:
+        lines = f.read().splitlines()
+    assert lines and any('dashboard (test_profiling.py' in line for line in lines)
+    stack, count = lines[0].rsplit(' ', 1)
+    assert int(count) > 0 and ';' in stack
+
+
+def test_cprofile_export_loads_with_pstats(tmp_path):
+    app, profiler = make_app(tmp_path)
+    profile_id = app.test_client().get('/dashboard', headers={'X-Profile': 'cprofile'}).headers['X-Profile-Id']
+
+    stats = pstats.Stats(profiler.store.path(profile_id, 'prof'))
+    assert any(name == 'dashboard' for _, _, name in stats.stats)
+    assert profiler.store.path(profile_id, 'folded') is None
+    assert profiler.store.path('../../etc/passwd', 'text') is None
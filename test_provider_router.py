@@ -0,0 +1,111 @@
+"""
+Test script for hedged multi-provider scripture routing
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from provider_router import ProviderRouter
+
+PSALM = {'verses': [{'verse_number': 1, 'text': 'Blessed is the one'}]}
+
+
+def router_for(fetchers, **kwargs):
+    kwargs.setdefault('hedge_default', 0.05)
+    return ProviderRouter(fetchers, lambda translation: list(fetchers), is_good=bool, **kwargs)
+
+
+def test_slow_primary_is_hedged_and_first_good_response_wins():
+    release = threading.Event()
+
+    def slow(psalm_number, translation):
+        release.wait(2)
+        return dict(PSALM, source='slow')
+
+    router = router_for({'slow': slow, 'fast': lambda n, t: dict(PSALM, source='fast')})
+    started = time.perf_counter()
+    assert router.fetch(1, 'ESV')['source'] == 'fast'
+    assert time.perf_counter() - started < 1
+    assert router.stats['hedged'] == 1 and router.stats['wins'] == {'slow': 0, 'fast': 1}
+    release.set()
+
+
+def test_failed_primary_falls_back_without_waiting():
+    def broken(psalm_number, translation):
+        raise ConnectionError('provider down')
+
+    router = router_for({'broken': broken, 'backup': lambda n, t: PSALM}, hedge_default=5)
+    started = time.perf_counter()
+    assert router.fetch(1, 'ESV') == PSALM
+    assert time.perf_counter() - started < 1
+    assert router.stats['fallbacks'] == 1 and router.stats['hedged'] == 0
+
+
+def test_slow_primary_does_not_starve_concurrent_hedges():
+    release = threading.Event()
+
+    def slow(psalm_number, translation):
+        release.wait(2)
+        return dict(PSALM, source='slow')
+
+    router = router_for({'slow': slow, 'fast': lambda n, t: dict(PSALM, source='fast')})
+    calls = []
+    router.fetchers['slow'] = lambda n, t: calls.append(n) or slow(n, t)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(lambda n: router.fetch(n, 'ESV'), range(16)))
+    elapsed = time.perf_counter() - started
+    release.set()
+
+    assert all(result['source'] == 'fast' for result in results)
+    assert elapsed < 1
+    # At most a pool's worth of calls is ever outstanding on the slow provider
+    assert len(calls) <= router.workers
+
+
+def test_fallback_only_provider_is_never_hedged_to():
+    calls = []
+
+    def costly(psalm_number, translation):
+        calls.append(psalm_number)
+        return PSALM
+
+    def slow(psalm_number, translation):
+        time.sleep(0.2)
+        return dict(PSALM, source='slow')
+
+    router = router_for({'costly': costly, 'slow': slow}, fallback_only=('costly',))
+    assert router.ranked('ESV') == ['slow', 'costly']
+    assert router.fetch(1, 'ESV')['source'] == 'slow'
+    assert calls == [] and router.stats['hedged'] == 0
+
+    router.fetchers['slow'] = lambda n, t: None
+    assert router.fetch(2, 'ESV') == PSALM
+    assert calls == [2] and router.stats['fallbacks'] == 1
+
+
+def test_primary_is_chosen_by_latency_score():
+    router = router_for({'a': lambda n, t: PSALM, 'b': lambda n, t: PSALM}, min_samples=3)
+    assert router.ranked('ESV') == ['a', 'b']     # configured order until measured
+    for _ in range(5):
+        router.scores['a'].observe(0.4, True)
+        router.scores['b'].observe(0.2, True)
+    assert router.ranked('ESV') == ['b', 'a']
+    assert router.hedge_delay('b') == 0.2
+
+    for _ in range(10):
+        router.scores['b'].observe(0.2, False)    # fast but failing
+    assert router.ranked('ESV') == ['a', 'b']
+
+
+def test_bible_api_routes_shared_translations_to_both_providers(monkeypatch):
+    from bible_api import BibleAPI
+
+    api = BibleAPI()
+    monkeypatch.delenv('API_BIBLE_KEY', raising=False)
+    assert api.psalm_sources('ESV') == ['rkeplin']
+    monkeypatch.setenv('API_BIBLE_KEY', 'key')
+    assert api.psalm_sources('ESV') == ['rkeplin', 'api.bible']
+    assert api.psalm_sources('NIV') == ['rkeplin']
+    assert api.psalm_sources('CSB') == ['api.bible']
@@ -0,0 +1,47 @@
+"""
+Test script for the psalm metadata facet index
+"""
+
+from psalm_facets import PSALM_FACETS, VERSE_COUNTS, bitset, psalm_numbers
+from psalm_music_config import has_psalm_music
+from psalm_superscripts import ASAPH_PSALMS, DAVID_PSALMS, SONGS_OF_ASCENTS
+
+
+def test_bitset_round_trip():
+    assert psalm_numbers(bitset([150, 1, 23])) == [1, 23, 150]
+    assert psalm_numbers(0) == []
+
+
+def test_facets_match_source_data():
+    assert psalm_numbers(PSALM_FACETS.authors['david']) == DAVID_PSALMS
+    assert psalm_numbers(PSALM_FACETS.terms['song-of-ascents']) == SONGS_OF_ASCENTS
+    assert PSALM_FACETS.terms['selah'].bit_count() == 39
+    assert sum(VERSE_COUNTS) == 2461
+
+
+def test_combined_filter_matches_linear_scan():
+    result = psalm_numbers(PSALM_FACETS.filter(authors=['asaph'], has_music=True, max_verses=19))
+    expected = [n for n in ASAPH_PSALMS if has_psalm_music(n) and VERSE_COUNTS[n - 1] <= 19]
+    assert result == expected
+
+
+def test_verse_range_and_negated_filters():
+    assert psalm_numbers(PSALM_FACETS.filter(min_verses=72)) == [78, 119]
+    assert psalm_numbers(PSALM_FACETS.filter(max_verses=2)) == [117]
+    no_superscript = PSALM_FACETS.filter(has_superscript=False)
+    assert no_superscript & PSALM_FACETS.has_superscript == 0
+    assert 1 in psalm_numbers(no_superscript)
+
+
+def test_multiple_authors_match_any():
+    both = PSALM_FACETS.filter(authors=['asaph', 'sons-of-korah'])
+    assert both == PSALM_FACETS.authors['asaph'] | PSALM_FACETS.authors['sons-of-korah']
+
+
+if __name__ == '__main__':
+    test_bitset_round_trip()
+    test_facets_match_source_data()
+    test_combined_filter_matches_linear_scan()
+    test_verse_range_and_negated_filters()
+    test_multiple_authors_match_any()
+    print("✓ Psalm facet tests passed")
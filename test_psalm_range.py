@@ -0,0 +1,126 @@
+"""
+Test script for concurrent, rate-limited psalm range fetches
+"""
+
+import threading
+import time
+
+import pytest
+
+from bible_api import BibleAPI
+import requests
+
+from upstream import ProviderSession, TokenBucket, parse_rate_limits, provider_state, rate_limited, reset_providers
+
+
+class OkAdapter(requests.adapters.BaseAdapter):
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'[]'
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture(autouse=True)
+def fresh_providers():
+    reset_providers()
+    yield
+    reset_providers()
+
+
+def test_token_bucket_allows_burst_then_paces_calls():
+    clock = Clock()
+    bucket = TokenBucket(rate=10, burst=3, clock=clock, sleep=clock.sleep)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(0.1)
+    assert bucket.acquire() == pytest.approx(0.1)
+
+    # Idle time refills the bucket, up to the burst
+    clock.now += 60
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() > 0
+    assert TokenBucket(rate=0).acquire() == 0.0
+
+
+def test_rate_limits_are_configured_per_provider(monkeypatch):
+    assert parse_rate_limits('rkeplin=20, bolls=0')['rkeplin'] == 20
+    assert parse_rate_limits('rkeplin=20, bolls=0')['bolls'] == 0
+    assert 'api.bible' not in parse_rate_limits(None)
+
+    monkeypatch.setenv('UPSTREAM_RATE_LIMITS', 'limited=5')
+    reset_providers()
+    assert provider_state('limited').limiter.rate == 5
+    assert provider_state('unlisted').limiter.rate == 0
+    assert ProviderSession('limited').limiter is provider_state('limited').limiter
+
+
+def test_only_bulk_fetches_wait_for_the_rate_limiter():
+    clock = Clock()
+    session = ProviderSession('limited')
+    session.mount('https://', OkAdapter())
+    session.limiter = TokenBucket(rate=1, burst=1, clock=clock, sleep=clock.sleep)
+
+    # User-facing calls never wait on (or spend) the bucket
+    for _ in range(5):
+        session.get('https://limited.test/psalm')
+    assert clock.slept == []
+
+    for _ in range(3):
+        rate_limited(session.get, 'https://limited.test/psalm')
+    assert clock.slept == [pytest.approx(1.0), pytest.approx(1.0)]
+
+
+def test_psalm_range_streams_results_as_they_complete():
+    api = BibleAPI()
+    release = threading.Event()
+
+    def fetch(psalm_number, translation):
+        if psalm_number == 1:
+            release.wait(5)
+        return {'psalm_number': psalm_number, 'translation': translation}
+
+    api._load_psalm = fetch
+    results = api.get_psalm_range(1, 4, 'NIV', workers=4)
+    # Psalm 1 is still in flight while the others are yielded
+    first = [next(results)[0] for _ in range(3)]
+    assert sorted(first) == [2, 3, 4]
+    release.set()
+    assert next(results) == (1, {'psalm_number': 1, 'translation': 'NIV'})
+    assert list(api.get_psalm_range(5, 3)) == []
+
+
+def test_psalm_range_bounds_concurrency_and_skips_failures():
+    api = BibleAPI()
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fetch(psalm_number, translation):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return None if psalm_number % 5 == 0 else {'psalm_number': psalm_number}
+
+    api._load_psalm = fetch
+    psalms = dict(api.get_psalm_range(1, 20, 'ESV', workers=3))
+    assert peak[0] <= 3
+    assert sorted(psalms) == [n for n in range(1, 21) if n % 5]
@@ -0,0 +1,140 @@
+"""
+Test script for the local psalm search index
+"""
+
+from psalm_search import PsalmSearchIndex, parse_query, stem, tokenize
+
+
+def psalm(number, translation, *verses):
+    return {
+        'psalm_number': number,
+        'translation': translation,
+        'verses': [{'verse_number': i, 'text': text, 'verse_id': number * 1000 + i}
+                   for i, text in enumerate(verses, 1)]
+    }
+
+
+def make_index():
+    index = PsalmSearchIndex(corpus_file='/nonexistent/psalm_corpus.json')
+    index.add_psalm(psalm(23, 'ESV',
+                          'The LORD is my shepherd; I shall not want.',
+                          'He makes me lie down in green pastures. He leads me beside still waters.'))
+    index.add_psalm(psalm(23, 'KJV',
+                          'The LORD is my shepherd; I shall not want.',
+                          'He maketh me to lie down in green pastures: he leadeth me beside the still waters.'))
+    index.add_psalm(psalm(80, 'ESV', 'Give ear, O Shepherd of Israel, you who lead Joseph like a flock.'))
+    index.add_psalm(psalm(46, 'ESV', 'Be still, and know that I am God.'))
+    return index
+
+
+def test_stemming_folds_archaic_and_plural_forms():
+    assert stem('leadeth') == stem('leads') == stem('lead')
+    assert stem('maketh') == stem('makes')
+    assert stem('mercies') == stem('mercy')
+    assert stem('blessed') == stem('blessing') == 'bless'
+    assert tokenize("The LORD's waters") == ['the', 'lord', 'water']
+
+
+def test_parse_query_clauses():
+    clauses = parse_query('"still waters" shep* lord')
+    assert [c['type'] for c in clauses] == ['phrase', 'prefix', 'term']
+
+
+def test_phrase_query_requires_adjacent_terms():
+    index = make_index()
+    results = index.search('"still waters"')
+    assert {(r['psalm_number'], r['translation']) for r in results} == {(23, 'ESV'), (23, 'KJV')}
+    assert index.search('"waters still"') == []
+
+
+def test_prefix_and_stemmed_terms_match_across_translations():
+    index = make_index()
+    assert {r['psalm_number'] for r in index.search('shep*')} == {23, 80}
+    kjv = index.search('leads green', translation='KJV')
+    assert [(r['psalm_number'], r['verse_number']) for r in kjv] == [(23, 2)]
+
+
+def test_bm25_prefers_shorter_verses():
+    index = make_index()
+    results = index.search('shepherd', translation='ESV')
+    assert [r['psalm_number'] for r in results] == [23, 80]
+    assert results[0]['score'] > results[1]['score']
+
+
+def test_reindexing_a_psalm_replaces_its_verses():
+    index = make_index()
+    index.add_psalm(psalm(46, 'ESV', 'God is our refuge and strength.'))
+    assert index.search('still', translation='ESV')[0]['psalm_number'] == 23
+    assert index.search('refuge')[0]['psalm_number'] == 46
+    assert index.psalm_count('ESV') == 3
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / 'corpus.json')
+    make_index().save(path)
+    restored = PsalmSearchIndex(corpus_file=path)
+    assert restored.search('"still waters"', translation='KJV')[0]['verse_id'] == 23002
+
+
+class SearchSession:
+    def __init__(self):
+        self.params = []
+
+    def get(self, url, params=None, timeout=None):
+        self.params.append(params)
+        return self
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return [{'id': 23001, 'book': {'id': 19}, 'chapterId': 23, 'verseId': 1, 'verse': 'The LORD is my shepherd '},
+                {'id': 43010, 'book': {'id': 43}, 'chapterId': 10, 'verseId': 11, 'verse': 'I am the good shepherd'}]
+
+
+def test_upstream_fallback_respects_translation(monkeypatch):
+    import psalm_search
+    from bible_api import BibleAPI
+
+    monkeypatch.setattr(psalm_search, 'psalm_index', PsalmSearchIndex(corpus_file='/nonexistent/psalm_corpus.json'))
+    api = BibleAPI()
+    api._session = SearchSession()
+
+    results = api.search_psalms('shepherd', translation='KJV')
+    assert api._session.params[-1]['translation'] == 'KJV'
+    assert [(r['psalm_number'], r['translation'], r['text']) for r in results] == [(23, 'KJV', 'The LORD is my shepherd')]
+
+    # Translations rkeplin does not serve have no upstream search
+    assert api.search_psalms('shepherd', translation='CSB') == []
+    assert len(api._session.params) == 1
+
+
+def test_partial_corpus_falls_back_upstream(monkeypatch):
+    import psalm_search
+    from bible_api import BibleAPI
+
+    index = make_index()
+    monkeypatch.setattr(psalm_search, 'psalm_index', index)
+    api = BibleAPI()
+    api._session = SearchSession()
+
+    # Three ESV psalms indexed: a local search would miss most of the Psalter
+    assert not index.is_complete('ESV')
+    assert api.search_psalms('shepherd', translation='ESV')[0]['verse_id'] == 23001
+    assert len(api._session.params) == 1
+
+    for number in range(1, 151):
+        index.add_psalm(psalm(number, 'ESV', f'Psalm {number} shepherd verse'))
+    assert index.is_complete('ESV') and not index.is_complete() and not index.is_complete('NIV')
+    assert all('score' in result for result in api.search_psalms('shepherd', translation='ESV'))
+    assert len(api._session.params) == 1
+
+
+if __name__ == '__main__':
+    test_stemming_folds_archaic_and_plural_forms()
+    test_parse_query_clauses()
+    test_phrase_query_requires_adjacent_terms()
+    test_prefix_and_stemmed_terms_match_across_translations()
+    test_bm25_prefers_shorter_verses()
+    test_reindexing_a_psalm_replaces_its_verses()
+    print("✓ Psalm search tests passed")
@@ -0,0 +1,217 @@
+"""
+Test script for the async (ASGI) scripture API
+"""
+
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+
+import psalm_search
+from bible_api import BibleAPI
+from psalm_search import PsalmSearchIndex
+from scripture_asgi import AsyncProviderClient, AsyncScripture, ScriptureASGI, WSGIBridge
+from singleflight import SharedFileCache, SingleFlight
+from upstream import reset_providers
+
+
+def verses(psalm_number, translation):
+    return [{'id': psalm_number * 1000 + n, 'verseId': n, 'verse': f' {translation} {psalm_number}:{n} '}
+            for n in range(1, 4)]
+
+
+class Upstream:
+    """Mock rkeplin that counts calls and how many are in flight"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, request):
+        self.calls.append(str(request.url))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        psalm_number = int(request.url.path.rsplit('/', 1)[1])
+        return httpx.Response(200, json=verses(psalm_number, request.url.params['translation']))
+
+
+def make_app(upstream, fallback=None):
+    client = AsyncProviderClient('rkeplin-asgi-test', transport=httpx.MockTransport(upstream))
+    return ScriptureASGI(fallback=fallback, scripture=AsyncScripture(BibleAPI(), client))
+
+
+async def call(app, path, query='', method='GET', headers=()):
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query.encode(),
+             'headers': [(name.lower().encode(), value.encode()) for name, value in headers],
+             'http_version': '1.1', 'scheme': 'http', 'server': ('testserver', 80), 'root_path': ''}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = messages[0]
+    body = b''.join(message.get('body', b'') for message in messages[1:])
+    return start['status'], {name.decode(): value.decode() for name, value in start['headers']}, body
+
+
+@pytest.fixture(autouse=True)
+def fresh_providers():
+    reset_providers()
+    yield
+    reset_providers()
+
+
+def test_psalm_is_fetched_once_for_concurrent_requests_and_then_cached():
+    upstream = Upstream(delay=0.05)
+    app = make_app(upstream)
+
+    async def scenario():
+        responses = await asyncio.gather(*(call(app, '/api/psalms/23', 'translation=niv') for _ in range(50)))
+        cached = await call(app, '/api/psalms/23', 'translation=NIV')
+        return responses, cached
+
+    responses, cached = asyncio.run(scenario())
+    assert len(upstream.calls) == 1
+    for status, headers, body in responses + [cached]:
+        assert status == 200
+        assert headers['cache-control'] == 'public, max-age=86400'
+        assert 'server-timing' in headers
+        data = json.loads(body)['data']
+        assert data['translation'] == 'NIV'
+        assert data['verses'][0] == {'verse_number': 1, 'text': 'NIV 23:1', 'verse_id': 23001}
+
+
+def test_multiple_translations_are_fetched_concurrently():
+    upstream = Upstream(delay=0.05)
+    app = make_app(upstream)
+    status, headers, body = asyncio.run(call(app, '/api/psalms/1/multiple-translations', 'translations=KJV,esv,NLT',
+                                             headers=[('Accept-Encoding', 'gzip')]))
+    assert status == 200
+    assert upstream.peak == 3
+    assert headers['content-encoding'] == 'gzip'
+    payload = json.loads(gzip.decompress(body))
+    # Keys are sorted, as by Flask's JSON provider
+    assert list(payload['data']) == ['ESV', 'KJV', 'NLT']
+    assert payload['translations_count'] == 3
+
+
+def test_validation_errors_match_the_flask_views():
+    app = make_app(Upstream())
+
+    async def scenario():
+        return (await call(app, '/api/psalms/151'),
+                await call(app, '/api/search/psalms', 'q='),
+                await call(app, '/api/search/psalms', 'q=shepherd&translation=XYZ'),
+                await call(app, '/api/translations'),
+                await call(app, '/not-scripture'))
+
+    psalm, search, translation, translations, missing = asyncio.run(scenario())
+    assert psalm[0] == 400 and 'Invalid psalm number' in json.loads(psalm[2])['error']
+    assert search[0] == 400 and json.loads(search[2])['error'] == 'Search query is required'
+    assert translation[0] == 400 and json.loads(translation[2])['error'] == 'Unknown translation: XYZ'
+    assert translations[0] == 200 and json.loads(translations[2])['count'] == len(BibleAPI.AVAILABLE_TRANSLATIONS)
+    assert missing[0] == 404
+
+
+def test_search_falls_back_upstream_in_the_requested_translation(monkeypatch):
+    # Nothing indexed locally, so every search goes upstream
+    monkeypatch.setattr(psalm_search, 'psalm_index', PsalmSearchIndex())
+    searches = []
+
+    async def upstream(request):
+        searches.append(dict(request.url.params))
+        return httpx.Response(200, json=[
+            {'id': 23001, 'book': {'id': 19}, 'chapterId': 23, 'verseId': 1, 'verse': ' The LORD is my shepherd '},
+            {'id': 10001, 'book': {'id': 43}, 'chapterId': 10, 'verseId': 11, 'verse': 'I am the good shepherd'}])
+
+    app = make_app(upstream)
+
+    async def scenario():
+        return (await call(app, '/api/search/psalms', 'q=shepherd&translation=kjv'),
+                await call(app, '/api/search/psalms', 'q=shepherd&translation=CSB'))
+
+    kjv, csb = asyncio.run(scenario())
+    assert searches == [{'query': 'psalms shepherd', 'limit': '10', 'translation': 'KJV'}]
+    assert json.loads(kjv[2])['data'] == [{'psalm_number': 23, 'verse_number': 1, 'text': 'The LORD is my shepherd',
+                                           'verse_id': 23001, 'translation': 'KJV'}]
+    # rkeplin does not carry CSB, so its search is not asked
+    assert csb[0] == 200 and json.loads(csb[2])['data'] == []
+
+
+def test_misses_go_through_the_shared_scripture_cache(tmp_path):
+    upstream = Upstream(delay=0.05)
+    app = make_app(upstream)
+    api = app.scripture.api
+    api.flight = SingleFlight(SharedFileCache(str(tmp_path)))
+    # Psalm 23 was already fetched by another worker
+    api.flight.shared.set('psalm:NIV:23', {'psalm_number': 23, 'translation': 'NIV',
+                                           'verses': [{'verse_number': 1, 'text': 'shared', 'verse_id': 23001}]})
+    fetched = []
+
+    def fetch_psalm(psalm_number, translation):
+        fetched.append((psalm_number, translation))
+        return {'psalm_number': psalm_number, 'translation': translation,
+                'verses': [{'verse_number': 1, 'text': 'fetched', 'verse_id': psalm_number * 1000 + 1}]}
+
+    api._fetch_psalm = fetch_psalm
+
+    async def scenario():
+        shared = await call(app, '/api/psalms/23', 'translation=NIV')
+        misses = await asyncio.gather(*(call(app, '/api/psalms/1', 'translation=NIV') for _ in range(10)))
+        return shared, misses
+
+    shared, misses = asyncio.run(scenario())
+    assert json.loads(shared[2])['data']['verses'][0]['text'] == 'shared'
+    assert all(json.loads(body)['data']['verses'][0]['text'] == 'fetched' for _, _, body in misses)
+    assert fetched == [(1, 'NIV')] and upstream.calls == []
+    # Published for the other workers
+    assert api.flight.shared.get('psalm:NIV:1')['verses'][0]['text'] == 'fetched'
+
+
+def test_other_requests_are_served_by_the_wsgi_app():
+    seen = []
+
+    def wsgi_app(environ, start_response):
+        seen.append(environ)
+        start_response('201 Created', [('Content-Type', 'text/plain'), ('X-Served-By', 'flask')])
+        return iter([b'hello ', b'', b'world'])
+
+    app = make_app(Upstream(), fallback=WSGIBridge(wsgi_app, threads=2))
+
+    async def scenario():
+        return (await call(app, '/journal', 'page=2', headers=[('Cookie', 'a=1'), ('Cookie', 'b=2')]),
+                await call(app, '/api/psalms/1', method='POST'))
+
+    (status, headers, body), (post_status, _, _) = asyncio.run(scenario())
+    assert (status, headers['x-served-by'], body) == (201, 'flask', b'hello world')
+    assert (seen[0]['PATH_INFO'], seen[0]['QUERY_STRING'], seen[0]['HTTP_COOKIE']) == ('/journal', 'page=2', 'a=1; b=2')
+    # Only reads of the scripture API are served async
+    assert post_status == 201
+    assert (seen[1]['REQUEST_METHOD'], seen[1]['PATH_INFO']) == ('POST', '/api/psalms/1')
+
+
+def test_asgi_entry_point_serves_the_flask_app():
+    import asgi
+
+    assert isinstance(asgi.app, ScriptureASGI)
+    status, headers, body = asyncio.run(call(asgi.app, '/api/translations'))
+    assert status == 200 and 'ESV' in json.loads(body)['data']
+    # Other paths are handed to the Flask app
+    assert asyncio.run(call(asgi.app, '/no-such-page'))[0] == 404
+
+
+def test_uvicorn_loads_the_entry_point():
+    importer = pytest.importorskip('uvicorn.importer')
+    import asgi
+
+    assert importer.import_from_string('asgi:app') is asgi.app
@@ -0,0 +1,130 @@
+"""
+Test script for the stale-while-revalidate scripture cache
+"""
+
+import threading
+import time
+
+from functools import partial
+
+from scripture_cache import ScriptureCache, parse_max_stale
+from singleflight import SharedFileCache, SingleFlight
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def wait_for_refresh(cache, count=1):
+    for _ in range(200):
+        if cache.stats['refreshes'] >= count:
+            return
+        time.sleep(0.01)
+    raise AssertionError('background refresh did not run')
+
+
+def test_fresh_hits_and_misses():
+    clock = Clock()
+    cache = ScriptureCache(fresh_seconds=60, clock=clock)
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return {'text': 'v1'}
+
+    assert cache.get((23, 'NIV'), 'NIV', fetch) == {'text': 'v1'}
+    clock.now += 59
+    assert cache.get((23, 'NIV'), 'NIV', fetch) == {'text': 'v1'}
+    assert len(fetches) == 1 and cache.stats['hits'] == 1 and cache.stats['misses'] == 1
+
+    # Failed fetches are not cached
+    assert cache.get((24, 'NIV'), 'NIV', lambda: None) is None
+    assert cache.get((24, 'NIV'), 'NIV', fetch) == {'text': 'v1'}
+
+
+def test_stale_entry_served_while_refreshed_in_background():
+    clock = Clock()
+    cache = ScriptureCache(fresh_seconds=60, max_stale=3600, clock=clock)
+    cache.put((23, 'ESV'), {'text': 'old'})
+    clock.now += 120
+
+    release = threading.Event()
+    refreshes = []
+
+    def slow_fetch():
+        refreshes.append(1)
+        release.wait(5)
+        return {'text': 'new'}
+
+    # Both return the stale text without waiting; only one refresh runs
+    assert cache.get((23, 'ESV'), 'ESV', slow_fetch) == {'text': 'old'}
+    assert cache.get((23, 'ESV'), 'ESV', slow_fetch) == {'text': 'old'}
+    release.set()
+    wait_for_refresh(cache)
+
+    assert refreshes == [1] and cache.stats['stale_hits'] == 2
+    assert cache.get((23, 'ESV'), 'ESV', slow_fetch) == {'text': 'new'}
+    assert cache.fetched_at((23, 'ESV')) == clock.now
+
+
+def test_failed_refresh_keeps_serving_stale_text():
+    clock = Clock()
+    cache = ScriptureCache(fresh_seconds=60, clock=clock)
+    cache.put((1, 'KJV'), {'text': 'stale'})
+    clock.now += 120
+
+    def broken():
+        raise ConnectionError('provider down')
+
+    assert cache.get((1, 'KJV'), 'KJV', broken) == {'text': 'stale'}
+    wait_for_refresh(cache)
+    assert cache.stats['refresh_failures'] == 1
+    assert cache.get((1, 'KJV'), 'KJV', broken) == {'text': 'stale'}
+
+
+def test_background_refresh_bypasses_the_shared_tier(tmp_path):
+    clock = Clock()
+    cache = ScriptureCache(fresh_seconds=60, clock=clock)
+    shared = SharedFileCache(str(tmp_path))
+    flight = SingleFlight(shared)
+    shared.set('psalm:ESV:23', {'text': 'old'})
+    fetches = []
+
+    def provider():
+        fetches.append(1)
+        return {'text': 'new'}
+
+    fetch = partial(flight.do, 'psalm:ESV:23', provider)
+    # A miss is served from the shared tier without calling the provider
+    assert cache.get((23, 'ESV'), 'ESV', fetch, partial(fetch, refresh=True)) == {'text': 'old'}
+    assert fetches == []
+
+    # Revalidation calls the provider and overwrites the shared copy
+    clock.now += 120
+    assert cache.get((23, 'ESV'), 'ESV', fetch, partial(fetch, refresh=True)) == {'text': 'old'}
+    wait_for_refresh(cache)
+    assert fetches == [1]
+    assert cache.get((23, 'ESV'), 'ESV', fetch) == {'text': 'new'}
+    assert shared.get('psalm:ESV:23') == {'text': 'new'}
+
+
+def test_max_stale_per_translation():
+    default, per_translation = parse_max_stale('7200,niv=0')
+    assert default == 7200 and per_translation == {'NIV': 0}
+
+    clock = Clock()
+    cache = ScriptureCache(fresh_seconds=60, max_stale=default, max_stale_by_translation=per_translation,
+                           clock=clock)
+    cache.put((1, 'NIV'), {'text': 'old NIV'})
+    cache.put((1, 'ESV'), {'text': 'old ESV'})
+    clock.now += 120
+
+    # Past NIV's max-stale the entry is refetched synchronously, and only
+    # served once more if that fails
+    assert cache.get((1, 'NIV'), 'NIV', lambda: None) == {'text': 'old NIV'}
+    assert cache.get((1, 'NIV'), 'NIV', lambda: {'text': 'new NIV'}) == {'text': 'new NIV'}
+    assert cache.get((1, 'ESV'), 'ESV', lambda: {'text': 'new ESV'}) == {'text': 'old ESV'}
@@ -0,0 +1,107 @@
+"""
+Test script for single-flight coalescing of scripture fetches
+"""
+
+import json
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from bible_fixtures import rkeplin_chapter
+from singleflight import SharedFileCache, SingleFlight
+from upstream import ProviderSession, reset_providers
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch(number):
+        calls.append(number)
+        time.sleep(0.1)
+        return {'psalm_number': number}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: flight.do('psalm:23', fetch, 23), range(8)))
+
+    assert calls == [23]
+    assert all(result is results[0] for result in results)
+    assert flight.stats['calls'] == 1 and flight.stats['coalesced'] == 7
+
+
+def test_errors_reach_waiters_and_are_not_cached():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.05)
+        raise requests.Timeout('upstream timed out')
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, 'psalm:1', failing)
+        started.wait()
+        follower = executor.submit(flight.do, 'psalm:1', failing)
+        for future in (leader, follower):
+            with pytest.raises(requests.Timeout):
+                future.result()
+
+    assert flight.do('psalm:1', lambda: 'fetched again') == 'fetched again'
+
+
+def _fetch_in_worker(directory, log_path):
+    def fetch():
+        with open(log_path, 'a') as f:
+            f.write('fetch\n')
+        time.sleep(0.3)
+        return {'psalm_number': 1, 'verses': []}
+
+    return SingleFlight(SharedFileCache(directory)).do('rkeplin:NIV:1', fetch)
+
+
+def test_processes_share_one_fetch_through_the_shared_tier(tmp_path):
+    log_path = str(tmp_path / 'fetches.log')
+    context = multiprocessing.get_context('fork')
+    with context.Pool(4) as pool:
+        results = pool.starmap(_fetch_in_worker, [(str(tmp_path / 'cache'), log_path)] * 4)
+
+    assert open(log_path).read() == 'fetch\n'
+    assert results == [{'psalm_number': 1, 'verses': []}] * 4
+
+
+class SlowChapterAdapter(requests.adapters.BaseAdapter):
+    def __init__(self):
+        super().__init__()
+        self.requests = 0
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        time.sleep(0.1)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(rkeplin_chapter(23, 'ESV')).encode()
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def test_bible_api_cache_misses_make_one_upstream_call():
+    from bible_api import BibleAPI
+
+    reset_providers()
+    api = BibleAPI()
+    adapter = SlowChapterAdapter()
+    api._session = ProviderSession('rkeplin')
+    api._session.mount('https://', adapter)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(lambda _: api.get_psalm(23, 'ESV'), range(6)))
+
+    assert adapter.requests == 1
+    assert all(result['verse_count'] == len(rkeplin_chapter(23, 'ESV')) for result in results)
@@ -0,0 +1,296 @@
+"""
+HTTP sessions for upstream Bible providers
+ProviderSession is a requests.Session that records every call it makes under
+its provider name (see instrumentation.py). Imported lazily by the Bible API
+clients, together with requests itself. With BIBLE_REPLAY set, responses are
+recorded to or replayed from a local archive instead (see replay.py).
+
+Every provider has a circuit breaker and an adaptive timeout, shared by all
+of its sessions in the process, so a degraded provider cannot tie up the
+worker threads:
+  - once at least UPSTREAM_MIN_CALLS of the last UPSTREAM_WINDOW calls were
+    made and UPSTREAM_FAILURE_RATE of them failed (exception or 5xx), the
+    circuit opens and calls fail fast with CircuitOpenError (a
+    requests.ConnectionError, so callers fall back as for any network error)
+  - after UPSTREAM_OPEN_SECONDS one probe call is let through (half-open);
+    its outcome closes or re-opens the circuit
+  - timeouts are the UPSTREAM_TIMEOUT_PERCENTILE of recent latencies times
+    UPSTREAM_TIMEOUT_MULTIPLIER, at least UPSTREAM_TIMEOUT_MIN seconds and at
+    most the timeout the caller asked for (UPSTREAM_ADAPTIVE_TIMEOUTS=0 keeps
+    the callers' timeouts)
+  - bulk fetches (psalm ranges, replay recording) run under rate_limited()
+    and wait for a token from the provider's rate limiter, a token bucket
+    refilled at DEFAULT_RATE_LIMITS requests per second, overridden by
+    UPSTREAM_RATE_LIMITS (e.g. "rkeplin=20,bolls=5"; 0 disables a limit);
+    user-facing calls never wait on the limiter
+"""
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import requests
+
+from instrumentation import record
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Pray150-DevotionalApp/1.0'
+
+# Used when the caller passes no timeout
+DEFAULT_TIMEOUT = 30.0
+
+# Requests per second for bulk fetches, per process; providers not listed are
+# not limited (an API.Bible psalm is one call per verse, so a per-call limit
+# would mostly add delay - set one with UPSTREAM_RATE_LIMITS if needed)
+DEFAULT_RATE_LIMITS = {
+    'rkeplin': 10.0,
+    'bolls': 10.0,
+}
+
+# Set while a bulk fetch runs (see rate_limited)
+_rate_limited = contextvars.ContextVar('upstream_rate_limited', default=False)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of calling a provider whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker with half-open probing"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, provider: str, failure_rate: float = 0.5, min_calls: int = 5, window: int = 20,
+                 open_seconds: float = 30.0, clock=time.monotonic):
+        self.provider = provider
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.clock = clock
+        self.state = self.CLOSED
+        self.stats = {'opened': 0, 'rejected': 0}
+        self._outcomes = deque(maxlen=window)   # True for a failed call
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go to the provider now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self._opened_at >= self.open_seconds:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.stats['rejected'] += 1
+            return False
+
+    def record(self, success: bool):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+                if success:
+                    logger.info("Circuit for %s closed after a successful probe", self.provider)
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+            if self.state == self.OPEN:
+                return   # a call started before the circuit opened
+            self._outcomes.append(not success)
+            failures = sum(self._outcomes)
+            if len(self._outcomes) >= self.min_calls and failures >= self.failure_rate * len(self._outcomes):
+                self._open()
+
+    def _open(self):
+        logger.warning("Circuit for %s opened: failing fast for %.0fs", self.provider, self.open_seconds)
+        self.state = self.OPEN
+        self._opened_at = self.clock()
+        self.stats['opened'] += 1
+
+
+class AdaptiveTimeout:
+    """Request timeout derived from a provider's recent latency percentile"""
+
+    def __init__(self, percentile: float = 0.99, multiplier: float = 3.0, minimum: float = 1.0,
+                 samples: int = 200, min_samples: int = 20, enabled: bool = True):
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.minimum = minimum
+        self.min_samples = min_samples
+        self.enabled = enabled
+        self._latencies = deque(maxlen=samples)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def timeout(self, requested: Optional[float] = None) -> float:
+        """Timeout for the next call, never longer than the one requested"""
+        limit = requested if requested is not None else DEFAULT_TIMEOUT
+        with self._lock:
+            if not self.enabled or len(self._latencies) < self.min_samples:
+                return limit
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return min(limit, max(self.minimum, ordered[index] * self.multiplier))
+
+
+class TokenBucket:
+    """Rate limiter: `rate` calls per second with bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token without waiting; returns the seconds until it is due"""
+        if not self.rate or self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now, so waiting callers are served in order
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self) -> float:
+        """Take a token, waiting for one if needed; returns the seconds waited"""
+        wait = self.reserve()
+        if wait:
+            self.sleep(wait)
+        return wait
+
+
+def rate_limited(fetch, *args, **kwargs):
+    """Call fetch(*args, **kwargs) with its provider calls paced by the rate limiters"""
+    token = _rate_limited.set(True)
+    try:
+        return fetch(*args, **kwargs)
+    finally:
+        _rate_limited.reset(token)
+
+
+def parse_rate_limits(spec: Optional[str]) -> Dict[str, float]:
+    """{provider: requests per second} from "rkeplin=20,bolls=5" """
+    limits = dict(DEFAULT_RATE_LIMITS)
+    for item in (spec or '').split(','):
+        provider, _, rate = item.partition('=')
+        if provider.strip() and rate.strip():
+            limits[provider.strip()] = float(rate)
+    return limits
+
+
+class _Provider:
+    """State shared by every session of one provider in the process"""
+
+    def __init__(self, breaker: 'CircuitBreaker', timeouts: AdaptiveTimeout, limiter: TokenBucket):
+        self.breaker = breaker
+        self.timeouts = timeouts
+        self.limiter = limiter
+
+
+_providers: Dict[str, _Provider] = {}
+_providers_lock = threading.Lock()
+
+
+def provider_state(provider: str) -> _Provider:
+    """Circuit breaker, adaptive timeout and rate limiter of a provider"""
+    with _providers_lock:
+        if provider not in _providers:
+            env = os.environ.get
+            _providers[provider] = _Provider(
+                CircuitBreaker(
+                    provider,
+                    failure_rate=float(env('UPSTREAM_FAILURE_RATE', '0.5')),
+                    min_calls=int(env('UPSTREAM_MIN_CALLS', '5')),
+                    window=int(env('UPSTREAM_WINDOW', '20')),
+                    open_seconds=float(env('UPSTREAM_OPEN_SECONDS', '30')),
+                ),
+                AdaptiveTimeout(
+                    percentile=float(env('UPSTREAM_TIMEOUT_PERCENTILE', '0.99')),
+                    multiplier=float(env('UPSTREAM_TIMEOUT_MULTIPLIER', '3')),
+                    minimum=float(env('UPSTREAM_TIMEOUT_MIN', '1')),
+                    enabled=env('UPSTREAM_ADAPTIVE_TIMEOUTS', '1').lower() not in ('0', 'false', 'no'),
+                ),
+                TokenBucket(parse_rate_limits(env('UPSTREAM_RATE_LIMITS')).get(provider, 0)),
+            )
+        return _providers[provider]
+
+
+def reset_providers():
+    """Forget breaker and latency state (tests, configuration changes)"""
+    with _providers_lock:
+        _providers.clear()
+
+
+def breakers() -> Dict[str, CircuitBreaker]:
+    """Circuit breaker of every provider used so far"""
+    with _providers_lock:
+        return {provider: state.breaker for provider, state in _providers.items()}
+
+
+class ProviderSession(requests.Session):
+    """requests.Session that times each call for per-request accounting"""
+
+    def __init__(self, provider: str):
+        super().__init__()
+        self.provider = provider
+        state = provider_state(provider)
+        self.breaker, self.timeouts, self.limiter = state.breaker, state.timeouts, state.limiter
+        self.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'application/json'
+        })
+        if os.environ.get('BIBLE_REPLAY'):
+            from replay import install_replay
+            install_replay(self, provider)
+
+    def request(self, method, url, *args, **kwargs):
+        label = f"{method} {url.split('?', 1)[0]}"
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit for {self.provider} is open - not calling {label}")
+        if _rate_limited.get():
+            waited = self.limiter.acquire()
+            if waited:
+                logger.debug("Rate limit for %s delayed %s by %.0fms", self.provider, label, waited * 1000)
+
+        timeout = kwargs.get('timeout')
+        if not isinstance(timeout, tuple):
+            timeout = kwargs['timeout'] = self.timeouts.timeout(timeout)
+
+        started = time.perf_counter()
+        error = True
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            error = response.status_code >= 500
+            return response
+        except requests.Timeout:
+            # Count the timeout as a (censored) latency so a too-tight
+            # timeout widens again
+            if not isinstance(timeout, tuple):
+                self.timeouts.observe(timeout)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.breaker.record(not error)
+            if not error:
+                self.timeouts.observe(elapsed)
+            record(self.provider, elapsed * 1000, label, error)